@@ -46,6 +46,14 @@ To get metrics saved in YAML-format, run:
 
 ./scene_eval.py file_list.txt -o results.yaml
 
+To cache parsed annotation files between runs, run:
+
+./scene_eval.py file_list.txt --cache cache_directory
+
+File pairs are loaded on background threads, by default 4 file pairs ahead. To change it, run:
+
+./scene_eval.py file_list.txt --prefetch 16
+
 """
 from __future__ import print_function, absolute_import
 import sys
@@ -78,6 +86,20 @@ def process_arguments(argv):
                         action='store',
                         help='Store results in yaml format')
 
+    parser.add_argument('--cache',
+                        dest='cache_dir',
+                        default=None,
+                        type=str,
+                        action='store',
+                        help='Directory for caching parsed annotation files between runs')
+
+    parser.add_argument('--prefetch',
+                        dest='prefetch',
+                        default=4,
+                        type=int,
+                        action='store',
+                        help='Number of file pairs loaded ahead on background threads')
+
     parser.add_argument('file_list',
                         action='store',
                         help='path to the file list in csv format having two fields: reference annotation file[tab]estimated annotation file')
@@ -95,9 +117,14 @@ def main(argv):
 
     data = []
     all_data = dcase_util.containers.MetaDataContainer()
-    for file_pair in file_list:
-        reference_scene_list = sed_eval.io.load_scene_list(os.path.abspath(os.path.join(path, file_pair['reference_file'])))
-        estimated_scene_list = sed_eval.io.load_scene_list(os.path.abspath(os.path.join(path, file_pair['estimated_file'])))
+    file_pairs = sed_eval.io.prefetch_file_pairs(
+        file_list,
+        load=sed_eval.io.load_scene_list,
+        path=path,
+        queue_depth=parameters['prefetch'],
+        cache_dir=parameters['cache_dir']
+    )
+    for file_pair, reference_scene_list, estimated_scene_list in file_pairs:
         data.append({'reference_scene_list': reference_scene_list, 'estimated_scene_list': estimated_scene_list})
         all_data += reference_scene_list
     scene_labels = all_data.unique_scene_labels
@@ -52,6 +52,31 @@ To get segment-based and event-based metrics saved in YAML-format, run:
 
 ./sound_event_eval.py file_list.txt -o results.yaml
 
+To evaluate file pairs in 4 parallel processes, run:
+
+./sound_event_eval.py file_list.txt -j 4
+
+To evaluate in streaming mode, keeping only the file pair being evaluated and the prefetched file pairs (see
+``--prefetch``, by default 4) in memory in each process instead of the whole dataset, run:
+
+./sound_event_eval.py file_list.txt --stream
+
+In streaming mode event labels are collected in a first pass over the reference files, loading one reference file
+at a time, or read from a text file (one label per row) given with ``--labels labels.txt``.
+
+To cache parsed annotation files between runs (e.g. when evaluating several systems against the same references), run:
+
+./sound_event_eval.py file_list.txt --cache cache_directory
+
+With ``--cache``, annotation files are parsed into columnar event tables (see ``sed_eval.io.load_event_table``), which
+are loaded from the cache without rebuilding the event items. In this mode all rows of a file need to follow the same
+layout.
+
+File pairs are loaded on background threads ahead of their evaluation, by default 4 file pairs. To change the number
+of file pairs loaded ahead (e.g. on slow network filesystems), run:
+
+./sound_event_eval.py file_list.txt --prefetch 16
+
 """
 
 from __future__ import print_function, absolute_import
@@ -59,6 +84,7 @@ import sys
 import os
 import argparse
 import textwrap
+import multiprocessing
 import sed_eval
 import dcase_util
 
@@ -83,6 +109,40 @@ def process_arguments(argv):
                         action='store',
                         help='Store results in yaml format')
 
+    parser.add_argument('-j', '--jobs',
+                        dest='jobs',
+                        default=1,
+                        type=int,
+                        action='store',
+                        help='Number of parallel processes used to load and evaluate file pairs (implies streaming mode)')
+
+    parser.add_argument('--stream',
+                        dest='stream',
+                        default=False,
+                        action='store_true',
+                        help='Keep only the evaluated and prefetched file pairs in memory instead of the whole dataset')
+
+    parser.add_argument('--labels',
+                        dest='labels_file',
+                        default=None,
+                        type=str,
+                        action='store',
+                        help='Text file with event labels one per row, used instead of collecting labels from the reference files (implies streaming mode)')
+
+    parser.add_argument('--cache',
+                        dest='cache_dir',
+                        default=None,
+                        type=str,
+                        action='store',
+                        help='Directory for caching parsed annotation files between runs')
+
+    parser.add_argument('--prefetch',
+                        dest='prefetch',
+                        default=4,
+                        type=int,
+                        action='store',
+                        help='Number of file pairs loaded ahead on background threads')
+
     parser.add_argument('file_list',
                         action='store',
                         help='path to the file list in csv format having two fields: reference annotation file[tab]estimated annotation file')
@@ -91,6 +151,60 @@ def process_arguments(argv):
     return vars(parser.parse_args(argv[1:]))
 
 
+def load_event_labels(filename):
+    """Load event labels from text file, one label per row
+    """
+
+    with open(filename, 'rt') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_event_file(filename, cache_dir=None):
+    """Load event list, into columnar event table when cache is used
+    """
+
+    if cache_dir is not None:
+        return sed_eval.io.load_event_table(filename, cache_dir=cache_dir)
+
+    return sed_eval.io.load_event_list(filename)
+
+
+def collect_event_labels(file_list, path, cache_dir=None):
+    """Collect event labels from reference files, loading one file at a time
+    """
+
+    event_labels = set()
+    for file_pair in file_list:
+        reference_event_list = load_event_file(
+            os.path.abspath(os.path.join(path, file_pair['reference_file'])),
+            cache_dir=cache_dir
+        )
+        event_labels.update(reference_event_list.unique_event_labels)
+
+    return sorted(event_labels)
+
+
+def evaluate_file_pairs(file_list, path, event_labels, cache_dir=None, prefetch=4):
+    """Evaluate file pairs, keeping only the prefetched file pairs in memory
+    """
+
+    segment_based_metrics = sed_eval.sound_event.SegmentBasedMetrics(event_labels)
+    event_based_metrics = sed_eval.sound_event.EventBasedMetrics(event_labels)
+
+    file_pairs = sed_eval.io.prefetch_file_pairs(
+        file_list, load=load_event_file, path=path, queue_depth=prefetch, cache_dir=cache_dir
+    )
+    for file_pair, reference_event_list, estimated_event_list in file_pairs:
+        segment_based_metrics.evaluate(reference_event_list, estimated_event_list)
+        event_based_metrics.evaluate(reference_event_list, estimated_event_list)
+
+    return segment_based_metrics, event_based_metrics
+
+
+def _evaluate_file_pairs(args):
+    return evaluate_file_pairs(*args)
+
+
 def main(argv):
     """Main
     """
@@ -99,39 +213,69 @@ def main(argv):
     file_list = sed_eval.io.load_file_pair_list(parameters['file_list'])
     path = os.path.dirname(parameters['file_list'])
 
-    data = []
-    all_data = dcase_util.containers.MetaDataContainer()
-    for file_pair in file_list:
-        reference_event_list = sed_eval.io.load_event_list(
-            os.path.abspath(os.path.join(path, file_pair['reference_file']))
-        )
+    if parameters['jobs'] > 1 or parameters['stream'] or parameters['labels_file']:
+        if parameters['labels_file']:
+            event_labels = load_event_labels(parameters['labels_file'])
 
-        estimated_event_list = sed_eval.io.load_event_list(
-            os.path.abspath(os.path.join(path, file_pair['estimated_file']))
-        )
+        else:
+            event_labels = collect_event_labels(file_list, path, parameters['cache_dir'])
 
-        data.append({
-            'reference_event_list': reference_event_list,
-            'estimated_event_list': estimated_event_list
-        })
+        if parameters['jobs'] > 1:
+            jobs = max(1, min(parameters['jobs'], len(file_list)))
+            shards = [
+                (file_list[job_id::jobs], path, event_labels, parameters['cache_dir'], parameters['prefetch'])
+                for job_id in range(jobs)
+            ]
 
-        all_data += reference_event_list
+            pool = multiprocessing.Pool(processes=jobs)
+            try:
+                shard_metrics = pool.map(_evaluate_file_pairs, shards)
 
-    event_labels = all_data.unique_event_labels
+            finally:
+                pool.close()
+                pool.join()
 
-    segment_based_metrics = sed_eval.sound_event.SegmentBasedMetrics(event_labels)
-    event_based_metrics = sed_eval.sound_event.EventBasedMetrics(event_labels)
+            segment_based_metrics = sum(metrics[0] for metrics in shard_metrics)
+            event_based_metrics = sum(metrics[1] for metrics in shard_metrics)
 
-    for file_pair in data:
-        segment_based_metrics.evaluate(
-            file_pair['reference_event_list'],
-            file_pair['estimated_event_list']
-        )
+        else:
+            segment_based_metrics, event_based_metrics = evaluate_file_pairs(
+                file_list, path, event_labels, parameters['cache_dir'], parameters['prefetch']
+            )
 
-        event_based_metrics.evaluate(
-            file_pair['reference_event_list'],
-            file_pair['estimated_event_list']
+    else:
+        data = []
+        event_labels = set()
+        file_pairs = sed_eval.io.prefetch_file_pairs(
+            file_list,
+            load=load_event_file,
+            path=path,
+            queue_depth=parameters['prefetch'],
+            cache_dir=parameters['cache_dir']
         )
+        for file_pair, reference_event_list, estimated_event_list in file_pairs:
+            data.append({
+                'reference_event_list': reference_event_list,
+                'estimated_event_list': estimated_event_list
+            })
+
+            event_labels.update(reference_event_list.unique_event_labels)
+
+        event_labels = sorted(event_labels)
+
+        segment_based_metrics = sed_eval.sound_event.SegmentBasedMetrics(event_labels)
+        event_based_metrics = sed_eval.sound_event.EventBasedMetrics(event_labels)
+
+        for file_pair in data:
+            segment_based_metrics.evaluate(
+                file_pair['reference_event_list'],
+                file_pair['estimated_event_list']
+            )
+
+            event_based_metrics.evaluate(
+                file_pair['reference_event_list'],
+                file_pair['estimated_event_list']
+            )
 
     if parameters['output_file']:
         results = dcase_util.containers.DictContainer({
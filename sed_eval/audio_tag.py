@@ -247,18 +247,50 @@ Usage example:
     AudioTaggingMetrics.result_report_class_wise
     AudioTaggingMetrics.result_report_class_wise_average
     AudioTaggingMetrics.reset
+    AudioTaggingMetrics.merge
 
 """
 
 from __future__ import absolute_import
 import numpy
+import numbers
 from . import metric
+from . import util
 import dcase_util
 
 
-class AudioTaggingMetrics:
-    def __init__(self, tags=None):
+class AudioTaggingMetrics(metric.MergeableMetrics):
+    def __init__(self, tags=None, score_histogram_bins=None):
+        """Constructor
+
+        Parameters
+        ----------
+        tags : list
+            List of unique tags
+
+        score_histogram_bins : int > 0
+            Streaming mode, amount of histogram bins used for tag probabilities in [0, 1]. Instead of retaining
+            tag activities and probabilities of all evaluated files, only per tag histograms of the probabilities
+            for positive and negative files are accumulated, and EER is approximated from them with
+            :func:`sed_eval.metric.equal_error_rate_histogram`. Memory usage is bounded by bins x tags, and
+            the approximation error of EER decreases with the amount of bins. Use None to retain everything
+            and calculate exact EER.
+            Default value None
+
+        """
+
+        if score_histogram_bins is not None:
+            if (not isinstance(score_histogram_bins, numbers.Integral) or isinstance(score_histogram_bins, bool) or
+                    score_histogram_bins <= 0):
+                raise ValueError(
+                    "score_histogram_bins needs to be None or int > 0"
+                )
+
+            score_histogram_bins = int(score_histogram_bins)
+
         self.tag_label_list = tags
+        self.score_histogram_bins = score_histogram_bins
+        self._tag_vocabulary = util.LabelVocabulary(self.tag_label_list)
 
         self.overall = {
             'Ncorr': 0.0,
@@ -271,10 +303,6 @@ class AudioTaggingMetrics:
         }
 
         self.tag_wise = {}
-        self.y_true = {}
-        self.y_pred = {}
-        self.y_pred_score = {}
-
         for label in self.tag_label_list:
             self.tag_wise[label] = {
                 'Nref': 0.0,
@@ -284,12 +312,83 @@ class AudioTaggingMetrics:
                 'Nfp': 0.0,
                 'Nfn': 0.0,
             }
-            self.y_true[label] = []
-            self.y_pred[label] = []
-            self.y_pred_score[label] = []
+
+        self._reset_label_matrices()
 
         self.ui = dcase_util.ui.FancyStringifier()
 
+    @property
+    def y_true(self):
+        """Reference tag activity of the evaluated files
+
+        Returns
+        -------
+        numpy.ndarray, shape=(files, tags), dtype=bool
+
+        """
+
+        return self._label_matrices['y_true'][:self._label_matrix_lengths['y_true']]
+
+    @property
+    def y_pred(self):
+        """Estimated tag activity of the evaluated files
+
+        Returns
+        -------
+        numpy.ndarray, shape=(files, tags), dtype=bool
+
+        """
+
+        return self._label_matrices['y_pred'][:self._label_matrix_lengths['y_pred']]
+
+    @property
+    def y_pred_score(self):
+        """Estimated tag probabilities of the evaluated files
+
+        Returns
+        -------
+        numpy.ndarray, shape=(files, tags), dtype=float32
+
+        """
+
+        return self._label_matrices['y_pred_score'][:self._label_matrix_lengths['y_pred_score']]
+
+    def _reset_label_matrices(self):
+        """Reset label matrices and score histograms accumulated over the evaluated files"""
+
+        if self.score_histogram_bins:
+            # Histograms of positive and negative files per tag
+            self._score_histograms = {
+                'positive': numpy.zeros((len(self.tag_label_list), self.score_histogram_bins), dtype=numpy.int64),
+                'negative': numpy.zeros((len(self.tag_label_list), self.score_histogram_bins), dtype=numpy.int64),
+            }
+
+        self._label_matrices = {
+            'y_true': numpy.zeros((0, len(self.tag_label_list)), dtype=bool),
+            'y_pred': numpy.zeros((0, len(self.tag_label_list)), dtype=bool),
+            'y_pred_score': numpy.zeros((0, len(self.tag_label_list)), dtype=numpy.float32),
+        }
+        self._label_matrix_lengths = {
+            'y_true': 0,
+            'y_pred': 0,
+            'y_pred_score': 0,
+        }
+
+    def _append_label_matrix(self, field, rows):
+        """Append rows into label matrix, capacity of the matrix is doubled when full"""
+
+        matrix = self._label_matrices[field]
+        length = self._label_matrix_lengths[field]
+        new_length = length + rows.shape[0]
+
+        if new_length > matrix.shape[0]:
+            grown_matrix = numpy.zeros((max(new_length, 2 * matrix.shape[0], 16), matrix.shape[1]), dtype=matrix.dtype)
+            grown_matrix[:length] = matrix[:length]
+            self._label_matrices[field] = matrix = grown_matrix
+
+        matrix[length:new_length] = rows
+        self._label_matrix_lengths[field] = new_length
+
     def __str__(self):
         """Print result reports"""
 
@@ -339,86 +438,121 @@ class AudioTaggingMetrics:
             if not isinstance(estimated_tag_probabilities, dcase_util.containers.ProbabilityContainer):
                 estimated_tag_probabilities = dcase_util.containers.ProbabilityContainer(estimated_tag_probabilities)
 
-        y_true = []
-        y_pred = []
+        files = reference_tag_list.unique_files
 
-        # Go though reference and estimated list label by label, and file by file
-        for label in self.tag_label_list:
-            for filename in reference_tag_list.unique_files:
-                reference_item = reference_tag_list.filter(filename=filename)[0]
-
-                # Populate y_true based on reference_item
-                if label in reference_item.tags:
-                    self.y_true[label].append(1)
-                    y_true.append(1)
+        # Index items by filename, first item is used in case of duplicates
+        reference_items = {}
+        for item in reference_tag_list:
+            reference_items.setdefault(str(item.filename), item)
 
-                else:
-                    self.y_true[label].append(0)
-                    y_true.append(0)
+        # Tag activity matrix, shape=(files, tags)
+        y_true = numpy.zeros((len(files), len(self.tag_label_list)), dtype=bool)
+        for file_id, filename in enumerate(files):
+            y_true[file_id, :] = self._tag_activity(reference_items[filename].tags)
 
-                if estimated_tag_list is not None:
-                    # Evaluate based on estimated tags
+        if estimated_tag_list is not None:
+            # Evaluate based on estimated tags
+            estimated_items = {}
+            for item in estimated_tag_list:
+                estimated_items.setdefault(str(item.filename), item)
+
+            y_pred = numpy.zeros((len(files), len(self.tag_label_list)), dtype=bool)
+            for file_id, filename in enumerate(files):
+                if filename not in estimated_items:
+                    raise ValueError(
+                        "Not all reference files estimated, please check [{file}]".format(
+                            file=filename
+                        )
+                    )
 
-                    estimated_item = estimated_tag_list.filter(filename=filename)[0]
+                y_pred[file_id, :] = self._tag_activity(estimated_items[filename].tags)
 
-                    if not estimated_item:
-                        raise ValueError(
-                            "Not all reference files estimated, please check [{file}]".format(
-                                file=filename
-                            )
-                        )
-                    # Store nref
-                    if label in reference_item.tags:
-                        self.tag_wise[label]['Nref'] += 1
+        if estimated_tag_probabilities is not None:
+            # Evaluate based on per tag probabilities
+            file_index = dict((filename, file_id) for file_id, filename in enumerate(files))
+
+            probability_items = list(estimated_tag_probabilities)
+            item_file = numpy.array([file_index.get(item.filename, -1) for item in probability_items], dtype=int)
+            item_tag = self._tag_vocabulary.encode([item.label for item in probability_items], default=-1)
+
+            # First item of each (file, tag) pair is used
+            valid = numpy.flatnonzero(numpy.logical_and(item_file >= 0, item_tag >= 0))
+            position, first = numpy.unique(
+                item_file[valid] * len(self.tag_label_list) + item_tag[valid],
+                return_index=True
+            )
 
-                    # Populate y_pred based estimated_item
-                    if label in estimated_item.tags:
-                        self.y_pred[label].append(1)
-                        y_pred.append(1)
-                        self.tag_wise[label]['Nsys'] += 1
+            y_pred_score = numpy.zeros((len(files), len(self.tag_label_list)), dtype=float)
+            y_pred_score_present = numpy.zeros((len(files), len(self.tag_label_list)), dtype=bool)
 
-                    else:
-                        self.y_pred[label].append(0)
-                        y_pred.append(0)
+            y_pred_score.reshape(-1)[position] = [
+                float(probability_items[item_id]['probability']) for item_id in valid[first]
+            ]
+            y_pred_score_present.reshape(-1)[position] = True
 
-                    # Accumulate intermediate values
-                    # True positives (TP)
-                    if label in reference_item.tags and label in estimated_item.tags:
-                        self.tag_wise[label]['Ntp'] += 1
+            if not numpy.all(y_pred_score_present):
+                raise ValueError(
+                    "Not all reference files estimated, please check [{file}]".format(
+                        file=files[numpy.flatnonzero(numpy.logical_not(numpy.all(y_pred_score_present, axis=1)))[0]]
+                    )
+                )
 
-                    # True negatives (TN)
-                    if label not in reference_item.tags and label not in estimated_item.tags:
-                        self.tag_wise[label]['Ntn'] += 1
+        if self.score_histogram_bins:
+            if estimated_tag_probabilities is not None:
+                self._accumulate_score_histograms(y_true, y_pred_score)
 
-                    # False positives (FP)
-                    if label not in reference_item.tags and label in estimated_item.tags:
-                        self.tag_wise[label]['Nfp'] += 1
+        else:
+            self._append_label_matrix('y_true', y_true)
 
-                    # False negatives (FN)
-                    if label in reference_item.tags and label not in estimated_item.tags:
-                        self.tag_wise[label]['Nfn'] += 1
+            if estimated_tag_list is not None:
+                self._append_label_matrix('y_pred', y_pred)
 
-                if estimated_tag_probabilities is not None:
-                    # Evaluate based on per tag probabilities
+            if estimated_tag_probabilities is not None:
+                self._append_label_matrix('y_pred_score', y_pred_score)
 
-                    estimated_item = estimated_tag_probabilities.filter(filename=filename, label=label)[0]
-                    self.y_pred_score[label].append(float(estimated_item['probability']))
+        # Accumulate intermediate values tag by tag
+        for tag_id, label in enumerate(self.tag_label_list):
+            if estimated_tag_list is not None:
+                self.tag_wise[label]['Nref'] += int(numpy.sum(y_true[:, tag_id]))
+                self.tag_wise[label]['Nsys'] += int(numpy.sum(y_pred[:, tag_id]))
+                self.tag_wise[label]['Ntp'] += int(numpy.sum(y_true[:, tag_id] & y_pred[:, tag_id]))
+                self.tag_wise[label]['Ntn'] += int(numpy.sum(~y_true[:, tag_id] & ~y_pred[:, tag_id]))
+                self.tag_wise[label]['Nfp'] += int(numpy.sum(~y_true[:, tag_id] & y_pred[:, tag_id]))
+                self.tag_wise[label]['Nfn'] += int(numpy.sum(y_true[:, tag_id] & ~y_pred[:, tag_id]))
 
         if estimated_tag_list is not None:
             # Evaluate based on estimated tags
+            self.overall['Nref'] += int(numpy.sum(y_true))
+            self.overall['Nsys'] += int(numpy.sum(y_pred))
+            self.overall['Ntp'] += int(numpy.sum(y_true & y_pred))
+            self.overall['Ntn'] += int(numpy.sum(~y_true & ~y_pred))
+            self.overall['Nfp'] += int(numpy.sum(~y_true & y_pred))
+            self.overall['Nfn'] += int(numpy.sum(y_true & ~y_pred))
 
-            self.overall['Nref'] += sum(y_true)
-            self.overall['Nsys'] += sum(y_pred)
+        return self
 
-            y_true = numpy.array(y_true)
-            y_pred = numpy.array(y_pred)
+    def _accumulate_score_histograms(self, y_true, y_pred_score):
+        """Accumulate tag probabilities into histograms of positive and negative files"""
 
-            self.overall['Ntp'] += sum(y_pred + y_true > 1)
-            self.overall['Ntn'] += sum(y_pred + y_true == 0)
-            self.overall['Nfp'] += sum(y_pred - y_true > 0)
-            self.overall['Nfn'] += sum(y_true - y_pred > 0)
+        bins = self.score_histogram_bins
+        bin_index = numpy.clip((y_pred_score * bins).astype(int), 0, bins - 1)
+        bin_index += numpy.arange(len(self.tag_label_list)) * bins
 
-        return self
+        for histogram, mask in [('positive', y_true), ('negative', ~y_true)]:
+            self._score_histograms[histogram] += numpy.bincount(
+                bin_index[mask],
+                minlength=len(self.tag_label_list) * bins
+            ).reshape(len(self.tag_label_list), bins)
+
+    def _tag_activity(self, tags):
+        """Tag activity vector of an item, tags in the order of tag_label_list"""
+
+        codes = self._tag_vocabulary.encode(tags or [], default=-1)
+
+        activity = numpy.zeros(len(self.tag_label_list), dtype=bool)
+        activity[codes[codes >= 0]] = True
+
+        return activity
 
     def reset(self):
         """Reset internal state
@@ -443,6 +577,52 @@ class AudioTaggingMetrics:
                 'Nfn': 0.0,
             }
 
+        self._reset_label_matrices()
+
+        return self
+
+    def merge(self, other):
+        """Merge intermediate values accumulated in another metric object into this one
+
+        Parameters
+        ----------
+        other : AudioTaggingMetrics
+            Metric object to be merged, created with the same tags
+
+        Raises
+        ------
+        ValueError:
+            Metric objects are not compatible
+
+        Returns
+        -------
+        self
+
+        """
+
+        if (not isinstance(other, AudioTaggingMetrics) or
+                list(other.tag_label_list) != list(self.tag_label_list) or
+                other.score_histogram_bins != self.score_histogram_bins):
+            raise ValueError(
+                "Only AudioTaggingMetrics with same tags and score_histogram_bins can be merged"
+            )
+
+        for field in other.overall:
+            self.overall[field] = self.overall.get(field, 0.0) + other.overall[field]
+
+        for tag_label in self.tag_label_list:
+            for field in self.tag_wise[tag_label]:
+                self.tag_wise[tag_label][field] += other.tag_wise[tag_label][field]
+
+        if self.score_histogram_bins:
+            for histogram in self._score_histograms:
+                self._score_histograms[histogram] += other._score_histograms[histogram]
+
+        else:
+            self._append_label_matrix('y_true', other.y_true)
+            self._append_label_matrix('y_pred', other.y_pred)
+            self._append_label_matrix('y_pred_score', other.y_pred_score)
+
         return self
 
     # Results
@@ -496,16 +676,23 @@ class AudioTaggingMetrics:
             recall = None
             f_measure = None
 
-        y_true = []
-        y_score = []
-        for tag_id, tag_label in enumerate(self.tag_label_list):
-            y_true += self.y_true[tag_label]
-            y_score += self.y_pred_score[tag_label]
+        if self.score_histogram_bins:
+            if numpy.any(self._score_histograms['positive']) or numpy.any(self._score_histograms['negative']):
+                # Pool tags
+                eer = metric.equal_error_rate_histogram(
+                    positive_histogram=numpy.sum(self._score_histograms['positive'], axis=0),
+                    negative_histogram=numpy.sum(self._score_histograms['negative'], axis=0)
+                )
+
+            else:
+                eer = None
 
-        if y_score:
-            eer = metric.equal_error_rate(
-                y_true=y_true,
-                y_score=y_score
+        elif self.y_pred_score.size:
+            # Pool tags
+            _, eer = metric.equal_error_rate_batch(
+                y_true=self.y_true,
+                y_score=self.y_pred_score,
+                pooled=True
             )
 
         else:
@@ -537,6 +724,29 @@ class AudioTaggingMetrics:
 
         """
 
+        if self.score_histogram_bins:
+            if numpy.any(self._score_histograms['positive']) or numpy.any(self._score_histograms['negative']):
+                class_wise_eer = [
+                    metric.equal_error_rate_histogram(
+                        positive_histogram=self._score_histograms['positive'][tag_id],
+                        negative_histogram=self._score_histograms['negative'][tag_id]
+                    ) for tag_id in range(len(self.tag_label_list))
+                ]
+
+            else:
+                class_wise_eer = None
+
+        elif self.y_pred_score.shape[0]:
+            # Equal error rates for all tags at once
+            class_wise_eer, _ = metric.equal_error_rate_batch(
+                y_true=self.y_true,
+                y_score=self.y_pred_score,
+                pooled=False
+            )
+
+        else:
+            class_wise_eer = None
+
         results = {}
         for tag_id, tag_label in enumerate(self.tag_label_list):
             if tag_label not in results:
@@ -553,12 +763,9 @@ class AudioTaggingMetrics:
             }
 
             # Equal error rate
-            if self.y_pred_score[tag_label]:
+            if class_wise_eer is not None:
                 results[tag_label]['eer'] = {
-                    'eer': metric.equal_error_rate(
-                        y_true=self.y_true[tag_label],
-                        y_score=self.y_pred_score[tag_label]
-                    )
+                    'eer': class_wise_eer[tag_id]
                 }
 
             else:
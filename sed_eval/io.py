@@ -5,21 +5,38 @@ I/O
 ==================
 Functions for loading annotations from files in various formats.
 
+Parsed annotations can be cached on disk by giving ``cache_dir`` to the loading functions. Cache entries are
+stored as ``.npz`` files keyed by the file path, size, and modification time, so repeated evaluations of the same
+annotation files skip the text parsing, and modified files are parsed again. Cache directory can be shared
+between processes and cleared at any time.
+
 .. autosummary::
     :toctree: generated/
 
     load_event_list
+    load_event_table
     load_scene_list
     load_file_pair_list
+    prefetch_file_pairs
+    build_event_store
+    load_event_store
 
 """
 
 from __future__ import absolute_import
+import os
 import csv
+import hashlib
+import tempfile
+import itertools
+import collections
+import multiprocessing.pool
+import numpy
 import dcase_util
+from . import util
 
 
-def load_event_list(filename, **kwargs):
+def load_event_list(filename, cache_dir=None, **kwargs):
     """Load event list from csv formatted text-file
 
     Supported formats (see more `dcase_util.containers.MetaDataContainer.load()` method):
@@ -60,6 +77,11 @@ def load_event_list(filename, **kwargs):
     filename : str
         Path to the csv-file
 
+    cache_dir : str, optional
+        Directory for cached parsed files. If none given, cache is not used. Items are rebuilt from the cached
+        columns when loading, use :func:`load_event_table` for faster loading of large amounts of files.
+        Default value None
+
     Returns
     -------
     list of dict
@@ -67,10 +89,159 @@ def load_event_list(filename, **kwargs):
 
     """
 
-    return dcase_util.containers.MetaDataContainer().load(filename=filename, **kwargs)
+    return _load_cached(
+        filename=filename,
+        cache_dir=cache_dir,
+        loader='event_list',
+        parameters=kwargs,
+        load=lambda: dcase_util.containers.MetaDataContainer().load(filename=filename, **kwargs),
+        to_arrays=_container_to_arrays,
+        from_arrays=_container_from_arrays
+    )
+
+
+def load_event_table(filename, fields=None, delimiter=None, label_vocabulary=None, file_vocabulary=None,
+                     cache_dir=None):
+    """Load event list from csv formatted text-file directly into columnar event table
+
+    Fast alternative to :func:`load_event_list` for large amounts of files. File is parsed with a fixed
+    layout instead of validating the format of every row, and the columns are converted into arrays at once.
+    Supports the same formats as :func:`load_event_list`, rows without event onset, offset and label
+    (e.g. filename only rows) are skipped since they are not used in the evaluation.
+
+    Layout is detected from the longest row of the file unless given with fields. When both fields and delimiter
+    are given, no format detection is done. Rows not matching the layout raise ValueError, except shorter rows
+    ending before the event onset column (e.g. filename only rows).
+
+    Parameters
+    ----------
+    filename : str
+        Path to the csv-file
+
+    fields : list of str, optional
+        Column names, use 'filename', 'onset', 'offset' and 'event_label' for the used columns, other columns
+        are ignored. E.g. ['filename', 'scene_label', 'onset', 'offset', 'event_label'].
+        Default value None
+
+    delimiter : str, optional
+        Column delimiter, one of ``,``, ``;``, ``tab``. If none given, delimiter is detected from the file content.
+        Default value None
+
+    label_vocabulary : sed_eval.util.LabelVocabulary, optional
+        Vocabulary used for event labels, labels not yet present are added to it.
+        Default value None
+
+    file_vocabulary : sed_eval.util.LabelVocabulary, optional
+        Vocabulary used for filenames, filenames not yet present are added to it.
+        Default value None
+
+    cache_dir : str, optional
+        Directory for cached parsed files. If none given, cache is not used.
+        Default value None
+
+    Raises
+    ------
+    ValueError:
+        Unknown file format, row not matching the layout, or fields without event onset, offset and label
+
+    Returns
+    -------
+    sed_eval.util.EventTable
+        Event table
+
+    """
+
+    if cache_dir is not None:
+        event_table = _load_cached(
+            filename=filename,
+            cache_dir=cache_dir,
+            loader='event_table',
+            parameters={'fields': fields, 'delimiter': delimiter},
+            load=lambda: load_event_table(filename=filename, fields=fields, delimiter=delimiter),
+            to_arrays=_event_table_to_arrays,
+            from_arrays=_event_table_from_arrays
+        )
+
+        return event_table.with_vocabularies(
+            label_vocabulary=label_vocabulary,
+            file_vocabulary=file_vocabulary
+        )
+
+    if label_vocabulary is None:
+        label_vocabulary = util.LabelVocabulary()
+
+    if file_vocabulary is None:
+        file_vocabulary = util.LabelVocabulary()
+
+    with open(filename, 'rt') as input_file:
+        content = input_file.read()
+
+    if delimiter is None:
+        delimiter = _detect_delimiter(content)
+
+    rows = [
+        (line_id + 1, row) for line_id, row in enumerate(csv.reader(content.splitlines(), delimiter=delimiter)) if row
+    ]
+
+    if fields is None:
+        fields = _detect_event_fields([row for line, row in rows])
+
+        if fields is None:
+            raise ValueError('Unknown event list format in file [{file}].'.format(file=filename))
+
+    elif not ('onset' in fields and 'offset' in fields and 'event_label' in fields):
+        raise ValueError("fields need to contain 'onset', 'offset' and 'event_label'.")
+
+    fields = list(fields)
+
+    if 'onset' in fields and 'offset' in fields and 'event_label' in fields:
+        # Rows ending before the event columns are files without events
+        event_rows = []
+        for line, row in rows:
+            if len(row) == len(fields):
+                event_rows.append(row)
+
+            elif len(row) > fields.index('onset'):
+                raise ValueError(
+                    'Unknown event list format in file [{file}], row [{line}].'.format(file=filename, line=line)
+                )
+
+        rows = event_rows
+
+    else:
+        # Events without label are not evaluated
+        rows = []
+
+    columns = dict((field, []) for field in fields)
+    if rows:
+        columns = dict(zip(fields, zip(*rows)))
+
+    try:
+        onset = numpy.array(columns.get('onset', []), dtype=float)
+        offset = numpy.array(columns.get('offset', []), dtype=float)
+
+    except ValueError:
+        raise ValueError('Unknown event list format in file [{file}].'.format(file=filename))
+
+    label = label_vocabulary.intern([_event_label_field(item) for item in columns.get('event_label', [])])
+
+    if 'filename' in columns:
+        file = file_vocabulary.intern([item.strip() for item in columns['filename']])
+
+    else:
+        file = numpy.full(onset.shape[0], file_vocabulary.code(None), dtype=int)
+
+    return util.EventTable(
+        onset=onset,
+        offset=offset,
+        label=label,
+        file=file,
+        label_vocabulary=label_vocabulary,
+        file_vocabulary=file_vocabulary
+    )
 
 
-def load_scene_list(filename, **kwargs):
+def load_scene_list(filename, cache_dir=None, **kwargs):
     """Load scene list from csv formatted text-file
 
     Supported formats (see more `dcase_util.containers.MetaDataContainer.load()` method):
@@ -97,6 +268,10 @@ def load_scene_list(filename, **kwargs):
     filename : str
         Path to the csv-file
 
+    cache_dir : str, optional
+        Directory for cached parsed files. If none given, cache is not used.
+        Default value None
+
     Returns
     -------
     list of dict
@@ -104,7 +279,15 @@ def load_scene_list(filename, **kwargs):
 
     """
 
-    return dcase_util.containers.MetaDataContainer().load(filename=filename, **kwargs)
+    return _load_cached(
+        filename=filename,
+        cache_dir=cache_dir,
+        loader='scene_list',
+        parameters=kwargs,
+        load=lambda: dcase_util.containers.MetaDataContainer().load(filename=filename, **kwargs),
+        to_arrays=_container_to_arrays,
+        from_arrays=_container_from_arrays
+    )
 
 
 def load_file_pair_list(filename):
@@ -159,3 +342,441 @@ def load_file_pair_list(filename):
 
     return data
 
+
+def prefetch_file_pairs(file_pair_list, load=load_event_list, path=None, queue_depth=4, threads=None, **kwargs):
+    """Load file pairs ahead of their use on a thread pool
+
+    Upcoming file pairs are loaded in background threads while the current one is being evaluated, which keeps
+    the evaluation busy when reading files is slow (e.g. network filesystems). At most queue_depth loaded or
+    loading file pairs are kept in addition to the one returned last, so memory use stays bounded. File pairs
+    are returned in the order of the file pair list, and errors raised while loading a file pair are raised
+    when it is reached.
+
+    Parameters
+    ----------
+    file_pair_list : str or list of dict
+        Path to the file pair list (see :func:`load_file_pair_list`), or file pairs as loaded by it.
+
+    load : function, optional
+        Function used to load a file, e.g. :func:`load_event_list` or :func:`load_scene_list`.
+        Default value load_event_list
+
+    path : str, optional
+        Directory the filenames in the file pairs are relative to. If none given and file_pair_list is a path,
+        directory of the file pair list is used, otherwise filenames are used as given.
+        Default value None
+
+    queue_depth : int, optional
+        Number of file pairs loaded ahead.
+        Default value 4
+
+    threads : int, optional
+        Number of loading threads. If none given, queue_depth is used.
+        Default value None
+
+    kwargs
+        Passed to load, e.g. cache_dir.
+
+    Raises
+    ------
+    ValueError:
+        Invalid queue_depth or threads
+
+    Returns
+    -------
+    generator of tuple (dict, object, object)
+        File pair, loaded reference, and loaded estimated
+
+    Examples
+    --------
+
+    .. code-block:: python
+        :linenos:
+
+        for file_pair, reference_event_list, estimated_event_list in sed_eval.io.prefetch_file_pairs('file_list.txt'):
+            segment_based_metrics.evaluate(reference_event_list, estimated_event_list)
+
+    """
+
+    if threads is None:
+        threads = queue_depth
+
+    if queue_depth < 1 or threads < 1:
+        raise ValueError(
+            "queue_depth and threads need to be at least 1."
+        )
+
+    if isinstance(file_pair_list, _STRING_TYPES):
+        if path is None:
+            path = os.path.dirname(file_pair_list)
+
+        file_pair_list = load_file_pair_list(file_pair_list)
+
+    def filename(file):
+        if path is None:
+            return file
+
+        return os.path.abspath(os.path.join(path, file))
+
+    def load_file_pair(file_pair):
+        return (
+            load(filename(file_pair['reference_file']), **kwargs),
+            load(filename(file_pair['estimated_file']), **kwargs)
+        )
+
+    return _prefetch(file_pair_list, load_file_pair, queue_depth, threads)
+
+
+def _prefetch(file_pair_list, load_file_pair, queue_depth, threads):
+    pool = multiprocessing.pool.ThreadPool(processes=threads)
+    try:
+        file_pairs = iter(file_pair_list)
+        pending = collections.deque(
+            (file_pair, pool.apply_async(load_file_pair, (file_pair,)))
+            for file_pair in itertools.islice(file_pairs, queue_depth)
+        )
+
+        while pending:
+            file_pair, result = pending.popleft()
+            reference, estimated = result.get()
+
+            # Start loading next file pair before handing over the current one
+            for next_file_pair in itertools.islice(file_pairs, 1):
+                pending.append((next_file_pair, pool.apply_async(load_file_pair, (next_file_pair,))))
+
+            yield file_pair, reference, estimated
+
+    finally:
+        pool.close()
+        pool.join()
+
+
+def build_event_store(path, filenames, fields=None, delimiter=None, cache_dir=None):
+    """Build consolidated event store from csv formatted text-files
+
+    Files are parsed with :func:`load_event_table`. Events of files having a filename column are stored under
+    those filenames, events of files without it are stored under the path of the annotation file as given.
+
+    Parameters
+    ----------
+    path : str
+        Store directory
+
+    filenames : list of str
+        Paths to the csv-files
+
+    fields : list of str, optional
+        Column names, see :func:`load_event_table`. If none given, layout is detected per file.
+        Default value None
+
+    delimiter : str, optional
+        Column delimiter. If none given, delimiter is detected per file.
+        Default value None
+
+    cache_dir : str, optional
+        Directory for cached parsed files. If none given, cache is not used.
+        Default value None
+
+    Returns
+    -------
+    sed_eval.util.EventStore
+        Opened store
+
+    """
+
+    def event_tables():
+        for filename in filenames:
+            event_table = load_event_table(
+                filename=filename,
+                fields=fields,
+                delimiter=delimiter,
+                file_vocabulary=util.LabelVocabulary(),
+                cache_dir=cache_dir
+            )
+
+            if None in event_table.file_vocabulary:
+                event_table = util.EventTable(
+                    onset=event_table.onset,
+                    offset=event_table.offset,
+                    label=event_table.label,
+                    file=event_table.file,
+                    label_vocabulary=event_table.label_vocabulary,
+                    file_vocabulary=[
+                        filename if file is None else file for file in event_table.file_vocabulary.labels
+                    ]
+                )
+
+            yield event_table
+
+    return util.EventStore.create(path=path, event_lists=event_tables())
+
+
+def load_event_store(path, mmap_mode='r'):
+    """Open consolidated event store
+
+    Parameters
+    ----------
+    path : str
+        Store directory
+
+    mmap_mode : str, optional
+        Memory-mapping mode for the arrays, see numpy.load. Use None to read arrays fully into memory.
+        Default value 'r'
+
+    Returns
+    -------
+    sed_eval.util.EventStore
+        Event store
+
+    """
+
+    return util.EventStore(path=path, mmap_mode=mmap_mode)
+
+
+def _detect_delimiter(content):
+    # Tab delimited files may contain commas inside labels, hence tabs are preferred
+    sample = content[0:4096]
+    for delimiter in ['\t', ';', ',']:
+        if delimiter in sample:
+            return delimiter
+
+    return '\t'
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+
+    except ValueError:
+        return False
+
+
+def _detect_event_fields(rows):
+    # Layouts supported by dcase_util.containers.MetaDataContainer.load() having event onset and offset,
+    # detected from the longest row.
+    if not rows:
+        return ['onset', 'offset', 'event_label']
+
+    row = max(rows, key=len)
+    numeric = [_is_number(item) for item in row]
+
+    if len(row) == 1:
+        return ['filename']
+
+    elif len(row) == 2 and numeric == [True, True]:
+        return ['onset', 'offset']
+
+    elif len(row) == 2:
+        return ['filename', 'scene_label']
+
+    elif len(row) == 3 and numeric[0:2] == [True, True]:
+        return ['onset', 'offset', 'event_label']
+
+    elif len(row) == 3 and numeric[1:3] == [True, True]:
+        return ['filename', 'onset', 'offset']
+
+    elif len(row) == 3:
+        return ['filename', 'scene_label', 'identifier']
+
+    elif len(row) == 4 and numeric[1:3] == [True, True]:
+        return ['filename', 'onset', 'offset', 'event_label']
+
+    elif len(row) == 4 and numeric[2:4] == [True, True]:
+        return ['filename', 'scene_label', 'onset', 'offset']
+
+    elif len(row) == 5 and numeric[1:3] == [True, True]:
+        return ['filename', 'onset', 'offset', 'event_label', 'identifier']
+
+    elif len(row) == 5 and numeric[2:4] == [True, True]:
+        return ['filename', 'scene_label', 'onset', 'offset', 'event_label']
+
+    elif len(row) == 6 and numeric[2:4] == [True, True]:
+        return ['filename', 'scene_label', 'onset', 'offset', 'event_label', 'source_label']
+
+    return None
+
+
+def _event_label_field(value):
+    # Same normalization as in dcase_util.containers.MetaDataItem
+    value = value.strip()
+    if value.lower() == 'none' or value == '':
+        return None
+
+    return value
+
+
+# Path types, also unicode in Python 2
+_STRING_TYPES = (type(b''), type(u''))
+
+
+# Cache format version, stored entries of other versions are not used
+_CACHE_VERSION = 1
+
+
+def _load_cached(filename, cache_dir, loader, parameters, load, to_arrays, from_arrays):
+    # Load parsed file from cache or parse it and store into cache
+    if cache_dir is None:
+        return load()
+
+    stat = os.stat(filename)
+    key = hashlib.sha1(repr((
+        _CACHE_VERSION,
+        loader,
+        os.path.abspath(filename),
+        stat.st_size,
+        _modification_time_ns(stat),
+        sorted((name, repr(value)) for name, value in parameters.items())
+    )).encode('utf-8')).hexdigest()
+    cache_filename = os.path.join(cache_dir, key + '.npz')
+
+    if os.path.isfile(cache_filename):
+        try:
+            with numpy.load(cache_filename, allow_pickle=False) as arrays:
+                return from_arrays(arrays)
+
+        except (IOError, OSError, ValueError, KeyError):
+            # Broken cache entry, parse file again
+            pass
+
+    data = load()
+    arrays = to_arrays(data)
+
+    if arrays is not None:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        # Write into temporary file first, so that concurrent readers never see partial entries
+        handle, temporary_filename = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+        try:
+            with os.fdopen(handle, 'wb') as cache_file:
+                numpy.savez(cache_file, **arrays)
+
+            _replace_file(temporary_filename, cache_filename)
+
+        except Exception:
+            if os.path.exists(temporary_filename):
+                os.remove(temporary_filename)
+            raise
+
+    return data
+
+
+def _modification_time_ns(stat):
+    # Modification time in nanoseconds, st_mtime_ns is not available in Python 2
+    if hasattr(stat, 'st_mtime_ns'):
+        return stat.st_mtime_ns
+
+    return int(stat.st_mtime * 1e9)
+
+
+def _replace_file(source, destination):
+    # os.replace is not available in Python 2, where os.rename does not overwrite existing files on Windows
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+
+    else:
+        if os.path.exists(destination):
+            os.remove(destination)
+
+        os.rename(source, destination)
+
+
+def _string_column(values):
+    # Strings as unicode array and presence mask, None values are marked missing
+    present = numpy.array([value is not None for value in values], dtype=bool)
+    strings = numpy.array([value if value is not None else '' for value in values], dtype=str)
+    if strings.shape[0] == 0:
+        strings = numpy.zeros(0, dtype='U1')
+
+    return strings, present
+
+
+def _container_to_arrays(container):
+    # Fields of the items as columns, only string and float fields are supported
+    fields = []
+    for item in container:
+        for field in item:
+            if field not in fields:
+                fields.append(field)
+
+    arrays = {
+        'item_count': numpy.array(len(container)),
+        'fields': numpy.array(fields, dtype=str) if fields else numpy.zeros(0, dtype='U1')
+    }
+    missing = object()
+
+    for field_id, field in enumerate(fields):
+        values = [item.get(field, missing) for item in container]
+
+        present = numpy.array([value is not missing for value in values], dtype=bool)
+        values = [None if value is missing else value for value in values]
+
+        if all(value is None or isinstance(value, float) for value in values):
+            arrays['float_{id}'.format(id=field_id)] = numpy.array(
+                [value if value is not None else numpy.nan for value in values], dtype=float
+            )
+            not_none = numpy.array([value is not None for value in values], dtype=bool)
+
+        elif all(value is None or isinstance(value, str) for value in values):
+            arrays['string_{id}'.format(id=field_id)], not_none = _string_column(values)
+
+        else:
+            return None
+
+        arrays['present_{id}'.format(id=field_id)] = present
+        arrays['not_none_{id}'.format(id=field_id)] = not_none
+
+    return arrays
+
+
+def _container_from_arrays(arrays):
+    items = [{} for item_id in range(int(arrays['item_count']))]
+
+    for field_id, field in enumerate(arrays['fields'].tolist()):
+        if 'float_{id}'.format(id=field_id) in arrays:
+            values = arrays['float_{id}'.format(id=field_id)].tolist()
+
+        else:
+            values = arrays['string_{id}'.format(id=field_id)].tolist()
+
+        present = arrays['present_{id}'.format(id=field_id)].tolist()
+        not_none = arrays['not_none_{id}'.format(id=field_id)].tolist()
+
+        for item, value, item_present, item_not_none in zip(items, values, present, not_none):
+            if item_present:
+                item[field] = value if item_not_none else None
+
+    return dcase_util.containers.MetaDataContainer(items)
+
+
+def _event_table_to_arrays(event_table):
+    label_strings, label_present = _string_column(event_table.label_vocabulary.labels)
+    file_strings, file_present = _string_column(event_table.file_vocabulary.labels)
+
+    return {
+        'onset': event_table.onset,
+        'offset': event_table.offset,
+        'label_code': event_table.label,
+        'file_code': event_table.file,
+        'label_vocabulary': label_strings,
+        'label_vocabulary_present': label_present,
+        'file_vocabulary': file_strings,
+        'file_vocabulary_present': file_present
+    }
+
+
+def _event_table_from_arrays(arrays):
+    def vocabulary(strings, present):
+        return util.LabelVocabulary([
+            value if value_present else None for value, value_present in zip(strings.tolist(), present.tolist())
+        ])
+
+    return util.EventTable(
+        onset=arrays['onset'],
+        offset=arrays['offset'],
+        label=arrays['label_code'],
+        file=arrays['file_code'],
+        label_vocabulary=vocabulary(arrays['label_vocabulary'], arrays['label_vocabulary_present']),
+        file_vocabulary=vocabulary(arrays['file_vocabulary'], arrays['file_vocabulary_present'])
+    )
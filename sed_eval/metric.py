@@ -20,10 +20,16 @@
     deletion_rate
     insertion_rate
 
+    roc_curve
     equal_error_rate
+    equal_error_rate_batch
+    equal_error_rate_histogram
+
+    MergeableMetrics
 
 """
 
+import copy
 import numpy
 
 
@@ -393,6 +399,92 @@ def error_rate(substitution_rate_value=0.0, deletion_rate_value=0.0, insertion_r
     return float(substitution_rate_value + deletion_rate_value + insertion_rate_value)
 
 
+def roc_curve(y_true, y_score, drop_intermediate=True):
+    """Receiver operating characteristic (ROC) curve
+
+    Curve points are computed by sorting the scores once, and accumulating true and false positives at each
+    distinct score. Output equals to sklearn.metrics.roc_curve.
+
+    Parameters
+    ----------
+    y_true : numpy.array or list
+        True binary labels in range {0, 1} or {-1, 1}.
+
+    y_score : numpy.array or list
+        Target scores, can either be probability estimates of the positive
+        class or confidence values.
+
+    drop_intermediate : bool
+        Drop thresholds not affecting the shape of the curve.
+        Default value True
+
+    Returns
+    -------
+    false_positive_rate : numpy.ndarray
+
+    true_positive_rate : numpy.ndarray
+
+    thresholds : numpy.ndarray
+
+    """
+
+    y_true = numpy.ravel(y_true) == 1
+    y_score = numpy.ravel(y_score)
+
+    # Sort scores in descending order
+    order = numpy.argsort(y_score, kind='mergesort')[::-1]
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    # Last index of each distinct score
+    threshold_index = numpy.r_[numpy.where(numpy.diff(y_score))[0], y_true.size - 1]
+
+    true_positives = numpy.cumsum(y_true, dtype=numpy.float64)[threshold_index]
+    false_positives = 1 + threshold_index - true_positives
+
+    return _roc_curve_from_counts(
+        true_positives=true_positives,
+        false_positives=false_positives,
+        thresholds=y_score[threshold_index],
+        drop_intermediate=drop_intermediate
+    )
+
+
+def _roc_curve_from_counts(true_positives, false_positives, thresholds, drop_intermediate=True):
+    """ROC curve from accumulated true and false positives at descending thresholds"""
+
+    if drop_intermediate and len(false_positives) > 2:
+        # Keep only corners of the curve
+        corner_index = numpy.where(numpy.r_[
+            True,
+            numpy.logical_or(numpy.diff(false_positives, 2), numpy.diff(true_positives, 2)),
+            True
+        ])[0]
+
+        false_positives = false_positives[corner_index]
+        true_positives = true_positives[corner_index]
+        thresholds = thresholds[corner_index]
+
+    # Start curve from (0, 0)
+    true_positives = numpy.r_[0, true_positives]
+    false_positives = numpy.r_[0, false_positives]
+    thresholds = numpy.r_[numpy.inf, thresholds]
+
+    if false_positives[-1] <= 0:
+        false_positive_rate = numpy.repeat(numpy.nan, false_positives.shape)
+
+    else:
+        false_positive_rate = false_positives / false_positives[-1]
+
+    if true_positives[-1] <= 0:
+        true_positive_rate = numpy.repeat(numpy.nan, true_positives.shape)
+
+    else:
+        true_positive_rate = true_positives / true_positives[-1]
+
+    return false_positive_rate, true_positive_rate, thresholds
+
+
 def equal_error_rate(y_true, y_score, eps=numpy.spacing(1)):
     """Equal error rate (EER)
 
@@ -418,33 +510,293 @@ def equal_error_rate(y_true, y_score, eps=numpy.spacing(1)):
 
     """
 
-    from sklearn import metrics
-
     if numpy.any(y_true):
-        false_positive_rate, true_positive_rate, thresholds = metrics.roc_curve(
+        false_positive_rate, true_positive_rate, thresholds = roc_curve(
             y_true=y_true,
             y_score=y_score,
             drop_intermediate=True
         )
 
-        points = [(0, 0)] + list(zip(false_positive_rate, true_positive_rate))
-        for i, point in enumerate(points):
-            if point[0] + eps >= 1 - point[1]:
-                break
+        eer = _equal_error_rate_from_roc_curve(
+            false_positive_rate=false_positive_rate,
+            true_positive_rate=true_positive_rate,
+            eps=eps
+        )
+
+    else:
+        eer = numpy.nan
+
+    return eer
 
-        point1 = points[i - 1]
-        point2 = points[i]
 
-        # Interpolate between point1 and point2
-        if abs(point2[0] - point1[0]) < eps:
-            eer = point1[0]
+def equal_error_rate_histogram(positive_histogram, negative_histogram, eps=numpy.spacing(1)):
+    """Equal error rate (EER) from score histograms
 
-        else:
-            m = (point2[1] - point1[1]) / (point2[0] - point1[0])
-            o = point1[1] - m * point1[0]
-            eer = (1 - o) / (1 + m)
+    Histograms count the scores of the positive and negative items in bins of ascending score ranges, and can be
+    accumulated with bounded memory regardless of the amount of items. Scores within a bin are considered equal,
+    hence the result equals to :func:`equal_error_rate` calculated with the scores quantized to the bins. The error
+    compared to the exact EER is bounded by the fraction of positive and negative items in the bin where the false
+    positive rate reaches the false negative rate.
+
+    Parameters
+    ----------
+    positive_histogram : numpy.array or list
+        Score histogram of the positive items.
+
+    negative_histogram : numpy.array or list
+        Score histogram of the negative items, using the same bins.
+
+    eps : float
+        Minimum difference considered equal.
+        Default value numpy.spacing(1)
+
+    Returns
+    -------
+    float
+
+    """
+
+    positive_histogram = numpy.asarray(positive_histogram, dtype=numpy.float64)
+    negative_histogram = numpy.asarray(negative_histogram, dtype=numpy.float64)
+
+    if numpy.any(positive_histogram):
+        # Bins in descending order of scores, non-empty bins are the distinct thresholds
+        threshold_index = numpy.nonzero((positive_histogram + negative_histogram)[::-1])[0]
+
+        false_positive_rate, true_positive_rate, thresholds = _roc_curve_from_counts(
+            true_positives=numpy.cumsum(positive_histogram[::-1])[threshold_index],
+            false_positives=numpy.cumsum(negative_histogram[::-1])[threshold_index],
+            thresholds=len(positive_histogram) - 1 - threshold_index,
+            drop_intermediate=True
+        )
+
+        eer = _equal_error_rate_from_roc_curve(
+            false_positive_rate=false_positive_rate,
+            true_positive_rate=true_positive_rate,
+            eps=eps
+        )
 
     else:
         eer = numpy.nan
 
     return eer
+
+
+def _equal_error_rate_from_roc_curve(false_positive_rate, true_positive_rate, eps=numpy.spacing(1)):
+    """Equal error rate (EER) from ROC curve points"""
+
+    points_x = numpy.r_[0, false_positive_rate]
+    points_y = numpy.r_[0, true_positive_rate]
+
+    # First point where false positive rate reaches false negative rate, last point if none
+    crossing = points_x + eps >= 1 - points_y
+    if numpy.any(crossing):
+        i = int(numpy.argmax(crossing))
+
+    else:
+        i = len(points_x) - 1
+
+    point1 = (points_x[i - 1], points_y[i - 1])
+    point2 = (points_x[i], points_y[i])
+
+    # Interpolate between point1 and point2
+    if abs(point2[0] - point1[0]) < eps:
+        return point1[0]
+
+    else:
+        m = (point2[1] - point1[1]) / (point2[0] - point1[0])
+        o = point1[1] - m * point1[0]
+        return (1 - o) / (1 + m)
+
+
+def equal_error_rate_batch(y_true, y_score, pooled=True, eps=numpy.spacing(1)):
+    """Equal error rate (EER) for multiple classes
+
+    Class-wise EERs are calculated in one pass with a single sort over the items of all classes, results are equal
+    to calling :func:`equal_error_rate` for each column. Pooled EER is derived from the class-wise curve points, hence
+    only the distinct scores of each class are sorted again instead of all pooled items.
+
+    Parameters
+    ----------
+    y_true : numpy.ndarray, shape=(items, classes)
+        True binary labels in range {0, 1} or {-1, 1}.
+
+    y_score : numpy.ndarray, shape=(items, classes)
+        Target scores, can either be probability estimates of the positive
+        class or confidence values.
+
+    pooled : bool
+        Calculate also EER for the pooled items and classes.
+        Default value True
+
+    eps : float
+        Minimum difference considered equal.
+        Default value numpy.spacing(1)
+
+    Returns
+    -------
+    class_wise_eer : numpy.ndarray, shape=(classes,)
+        EER for each class, nan for classes without positive items
+
+    pooled_eer : float or None
+        EER for the pooled items and classes, None if pooled is False
+
+    """
+
+    y_true = numpy.asarray(y_true)
+    y_score = numpy.asarray(y_score)
+
+    item_count, class_count = y_score.shape
+    class_wise_eer = numpy.full(class_count, numpy.nan)
+
+    pooled_eer = numpy.nan if pooled else None
+
+    if item_count == 0:
+        return class_wise_eer, pooled_eer
+
+    # Sort scores in descending order class by class, classes are laid out in rows for contiguous memory access.
+    # Order of tied scores does not affect the curve, hence the faster unstable sort can be used.
+    columns = numpy.arange(class_count)
+    rows = columns[:, numpy.newaxis]
+    y_score = numpy.ascontiguousarray(y_score.T)
+    order = numpy.argsort(y_score, axis=1)[:, ::-1]
+    y_score = y_score[rows, order]
+    positives = numpy.ascontiguousarray((y_true == 1).T)[rows, order]
+
+    true_positives = numpy.cumsum(positives, axis=1, dtype=numpy.float64)
+
+    # Last index of each distinct score
+    threshold = numpy.ones((class_count, item_count), dtype=bool)
+    threshold[:, :-1] = numpy.diff(y_score, axis=1) != 0
+
+    # Curve points of all classes, concatenated class by class
+    point_class, point_row = numpy.nonzero(threshold)
+    true_positives = true_positives[threshold]
+    false_positives = 1 + point_row - true_positives
+
+    point_counts = numpy.bincount(point_class, minlength=class_count)
+    point_last = numpy.cumsum(point_counts) - 1
+    point_first = point_last - point_counts + 1
+
+    if pooled and true_positives[point_last].sum() > 0:
+        pooled_eer = _pooled_equal_error_rate(
+            point_score=y_score[threshold],
+            true_positives=true_positives,
+            false_positives=false_positives,
+            point_first=point_first,
+            eps=eps
+        )
+
+    # Keep only corners of the curve, first and last points of each class are always kept
+    keep = numpy.zeros(len(point_class), dtype=bool)
+    keep[1:-1] = numpy.logical_or(numpy.diff(false_positives, 2), numpy.diff(true_positives, 2))
+    keep[point_first] = True
+    keep[point_last] = True
+
+    point_class = point_class[keep]
+    true_positives = true_positives[keep]
+    false_positives = false_positives[keep]
+
+    point_counts = numpy.bincount(point_class, minlength=class_count)
+    point_last = numpy.cumsum(point_counts) - 1
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        false_positives_total = false_positives[point_last]
+        true_positives_total = true_positives[point_last]
+        false_positive_rate = false_positives / false_positives_total[point_class]
+        true_positive_rate = true_positives / true_positives_total[point_class]
+
+    false_positive_rate[(false_positives_total <= 0)[point_class]] = numpy.nan
+    true_positive_rate[(true_positives_total <= 0)[point_class]] = numpy.nan
+
+    # Curves start from (0, 0) given twice, as in equal_error_rate, the second one is the first ROC curve point
+    shift = 2 * (point_class + 1)
+    curve_first = numpy.cumsum(point_counts + 2) - point_counts - 2
+    curve_last = curve_first + point_counts + 1
+
+    points_x = numpy.zeros(len(point_class) + 2 * class_count)
+    points_y = numpy.zeros(len(point_class) + 2 * class_count)
+    points_x[numpy.arange(len(point_class)) + shift] = false_positive_rate
+    points_y[numpy.arange(len(point_class)) + shift] = true_positive_rate
+    points_x[curve_first + 1] = numpy.where(false_positives_total <= 0, numpy.nan, 0.0)
+    points_y[curve_first + 1] = numpy.where(true_positives_total <= 0, numpy.nan, 0.0)
+
+    # First point where false positive rate reaches false negative rate, last point if none
+    crossing = numpy.nonzero(points_x + eps >= 1 - points_y)[0]
+    crossing_class = numpy.repeat(columns, point_counts + 2)[crossing]
+    crossing_first = numpy.ones(len(crossing), dtype=bool)
+    crossing_first[1:] = crossing_class[1:] != crossing_class[:-1]
+    i = curve_last.copy()
+    i[crossing_class[crossing_first]] = crossing[crossing_first]
+
+    x1 = points_x[i - 1]
+    y1 = points_y[i - 1]
+    x2 = points_x[i]
+    y2 = points_y[i]
+
+    # Interpolate between point1 and point2
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        m = (y2 - y1) / (x2 - x1)
+        o = y1 - m * x1
+        eer = numpy.where(numpy.abs(x2 - x1) < eps, x1, (1 - o) / (1 + m))
+
+    valid = numpy.any(y_true, axis=0)
+    class_wise_eer[valid] = eer[valid]
+
+    return class_wise_eer, pooled_eer
+
+
+def _pooled_equal_error_rate(point_score, true_positives, false_positives, point_first, eps=numpy.spacing(1)):
+    """Equal error rate (EER) of pooled classes from the class-wise ROC curve points
+
+    Points are the distinct thresholds of each class in descending order, concatenated class by class. Points of all
+    classes are sorted into one descending order, and the true and false positives are accumulated over it.
+    """
+
+    # Counts at each point instead of counts accumulated within the class
+    true_positive_counts = true_positives.copy()
+    false_positive_counts = false_positives.copy()
+    true_positive_counts[1:] -= true_positives[:-1]
+    false_positive_counts[1:] -= false_positives[:-1]
+    true_positive_counts[point_first] = true_positives[point_first]
+    false_positive_counts[point_first] = false_positives[point_first]
+
+    order = numpy.argsort(-point_score, kind='mergesort')
+    point_score = point_score[order]
+
+    # Last index of each distinct score
+    threshold_index = numpy.r_[numpy.where(numpy.diff(point_score))[0], point_score.size - 1]
+
+    false_positive_rate, true_positive_rate, thresholds = _roc_curve_from_counts(
+        true_positives=numpy.cumsum(true_positive_counts[order])[threshold_index],
+        false_positives=numpy.cumsum(false_positive_counts[order])[threshold_index],
+        thresholds=point_score[threshold_index],
+        drop_intermediate=True
+    )
+
+    return _equal_error_rate_from_roc_curve(
+        false_positive_rate=false_positive_rate,
+        true_positive_rate=true_positive_rate,
+        eps=eps
+    )
+
+
+# -- Merging -- #
+class MergeableMetrics(object):
+    """Base class for metric objects accumulating intermediate values
+
+    Metric objects evaluated over separate sets of files (e.g. in parallel processes) can be merged with ``merge()``,
+    and the results equal to the ones obtained by evaluating all files with a single object. The ``+`` operator
+    merges into a copy, and ``sum()`` over a list of metric objects merges them all.
+
+    """
+
+    def __add__(self, other):
+        return copy.deepcopy(self).merge(other)
+
+    def __radd__(self, other):
+        # Allows sum() over a list of metric objects
+        if other == 0:
+            return copy.deepcopy(self)
+
+        return copy.deepcopy(other).merge(self)
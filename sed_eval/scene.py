@@ -148,7 +148,9 @@ Usage example to evaluate results stored in variables:
     SceneClassificationMetrics.result_report_parameters
     SceneClassificationMetrics.result_report_class_wise
     SceneClassificationMetrics.result_report_class_wise_average
+    SceneClassificationMetrics.confusion_matrix
     SceneClassificationMetrics.reset
+    SceneClassificationMetrics.merge
 
 """
 
@@ -156,26 +158,17 @@ from __future__ import absolute_import
 import numpy
 import dcase_util
 from . import metric
+from . import util
 
 
-class SceneClassificationMetrics:
+class SceneClassificationMetrics(metric.MergeableMetrics):
     def __init__(self, scene_labels=None):
         self.accuracies_per_class = None
         self.scene_label_list = scene_labels
 
-        self.overall = {
-            'Ncorr': 0.0,
-            'Nref': 0.0,
-            'Nsys': 0.0
-        }
+        self._scene_label_vocabulary = util.LabelVocabulary(self.scene_label_list)
 
-        self.scene_wise = {}
-        for label in self.scene_label_list:
-            self.scene_wise[label] = {
-                'Ncorr': 0.0,
-                'Nref': 0.0,
-                'Nsys': 0.0
-            }
+        self.reset()
 
         self.ui = dcase_util.ui.FancyStringifier()
 
@@ -195,6 +188,64 @@ class SceneClassificationMetrics:
 
         return output
 
+    @property
+    def confusion_matrix(self):
+        """Confusion matrix of the evaluated items, rows are reference and columns estimated scene labels
+
+        Items having a label outside scene_labels are not included.
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(scene_labels), len(scene_labels)), dtype=int
+
+        """
+
+        scene_label_count = len(self.scene_label_list)
+        return self._confusion_matrix[:scene_label_count, :scene_label_count].copy()
+
+    @property
+    def overall(self):
+        """Overall counts, derived from the confusion matrix
+
+        Returns
+        -------
+        dict
+            Correct (Ncorr), reference (Nref) and system output (Nsys) item counts
+
+        """
+
+        scene_label_count = len(self.scene_label_list)
+        return {
+            'Ncorr': float(numpy.trace(self._confusion_matrix[:scene_label_count, :scene_label_count])),
+            'Nref': float(numpy.sum(self._confusion_matrix)),
+            'Nsys': float(numpy.sum(self._confusion_matrix))
+        }
+
+    @property
+    def scene_wise(self):
+        """Scene-wise counts, derived from the confusion matrix
+
+        Returns
+        -------
+        dict
+            Correct (Ncorr), reference (Nref) and system output (Nsys) item counts for each scene label
+
+        """
+
+        Ncorr = numpy.diagonal(self._confusion_matrix)
+        Nref = numpy.sum(self._confusion_matrix, axis=1)
+        Nsys = numpy.sum(self._confusion_matrix, axis=0)
+
+        scene_wise = {}
+        for scene_id, scene_label in enumerate(self.scene_label_list):
+            scene_wise[scene_label] = {
+                'Ncorr': float(Ncorr[scene_id]),
+                'Nref': float(Nref[scene_id]),
+                'Nsys': float(Nsys[scene_id])
+            }
+
+        return scene_wise
+
     def evaluate(self, reference_scene_list, estimated_scene_list=None, estimated_scene_probabilities=None):
         """Evaluate file pair (reference and estimated)
 
@@ -244,15 +295,17 @@ class SceneClassificationMetrics:
             if 'filename' not in item and 'file' in item:
                 item['filename'] = item['file']
 
+        # Index reference items by filename, first item of each file is used
+        reference_index = {}
+        for reference_item in reference_scene_list:
+            if reference_item['filename'] not in reference_index:
+                reference_index[reference_item['filename']] = reference_item
+
         y_true = []
         y_pred = []
 
         for estimated_item in estimated_scene_list:
-            reference_item_matched = {}
-            for reference_item in reference_scene_list:
-                if estimated_item['filename'] == reference_item['filename']:
-                    reference_item_matched = reference_item
-                    break
+            reference_item_matched = reference_index.get(estimated_item['filename'])
 
             if not reference_item_matched:
                 raise ValueError(
@@ -262,46 +315,59 @@ class SceneClassificationMetrics:
             y_true.append(reference_item_matched['scene_label'])
             y_pred.append(estimated_item['scene_label'])
 
-        y_true = numpy.array(y_true)
-        y_pred = numpy.array(y_pred)
-
-        Ncorr_overall = 0
-        for scene_id, scene_label in enumerate(self.scene_label_list):
-            true_id = numpy.where(y_true == scene_label)[0]
-            pred_id = numpy.where(y_pred == scene_label)[0]
-
-            Ncorr = 0
-            for id in true_id:
-                if id in pred_id:
-                    Ncorr += 1
+        # Integer-code scene labels, labels outside scene_label_list get code len(scene_label_list)
+        scene_label_count = len(self.scene_label_list)
+        y_true = self._scene_label_vocabulary.encode(y_true, default=scene_label_count)
+        y_pred = self._scene_label_vocabulary.encode(y_pred, default=scene_label_count)
 
-            Ncorr_overall += Ncorr
-            self.scene_wise[scene_label]['Ncorr'] += Ncorr
-            self.scene_wise[scene_label]['Nref'] += true_id.shape[0]
-            self.scene_wise[scene_label]['Nsys'] += pred_id.shape[0]
+        # Confusion matrix of the file pair, last row and column collect labels outside scene_label_list
+        confusion_matrix = numpy.bincount(
+            y_true * (scene_label_count + 1) + y_pred,
+            minlength=(scene_label_count + 1) ** 2
+        ).reshape(scene_label_count + 1, scene_label_count + 1)
 
-        self.overall['Ncorr'] += Ncorr_overall
-        self.overall['Nref'] += y_true.shape[0]
-        self.overall['Nsys'] += y_pred.shape[0]
+        self._confusion_matrix += confusion_matrix
 
         return self
 
     def reset(self):
         """Reset internal state
         """
-        self.overall = {
-            'Ncorr': 0.0,
-            'Nref': 0.0,
-            'Nsys': 0.0
-        }
 
-        self.scene_wise = {}
-        for label in self.scene_label_list:
-            self.scene_wise[label] = {
-                'Ncorr': 0.0,
-                'Nref': 0.0,
-                'Nsys': 0.0
-            }
+        self._confusion_matrix = numpy.zeros(
+            (len(self.scene_label_list) + 1, len(self.scene_label_list) + 1),
+            dtype=numpy.int64
+        )
+
+        return self
+
+    def merge(self, other):
+        """Merge intermediate values accumulated in another metric object into this one
+
+        Parameters
+        ----------
+        other : SceneClassificationMetrics
+            Metric object to be merged, created with the same scene_labels
+
+        Raises
+        ------
+        ValueError:
+            Metric objects are not compatible
+
+        Returns
+        -------
+        self
+
+        """
+
+        if not isinstance(other, SceneClassificationMetrics) or list(other.scene_label_list) != list(self.scene_label_list):
+            raise ValueError(
+                "Only SceneClassificationMetrics with same scene_labels can be merged"
+            )
+
+        self._confusion_matrix += other._confusion_matrix
+
+        return self
 
     # Reports
     def result_report_parameters(self):
@@ -402,13 +468,14 @@ class SceneClassificationMetrics:
 
         """
 
-        if self.overall['Nsys'] != 0:
-            accuracy = self.overall['Ncorr'] / float(self.overall['Nsys'])
+        overall = self.overall
+        if overall['Nsys'] != 0:
+            accuracy = overall['Ncorr'] / float(overall['Nsys'])
         else:
             accuracy = None
 
         return {
-            'count': self.overall,
+            'count': overall,
             'accuracy': accuracy
         }
 
@@ -422,19 +489,21 @@ class SceneClassificationMetrics:
 
         """
 
+        scene_wise = self.scene_wise
+
         results = {}
         for scene_id, scene_label in enumerate(self.scene_label_list):
             if scene_label not in results:
                 results[scene_label] = {}
 
             results[scene_label]['count'] = {}
-            results[scene_label]['count']['Ncorr'] = self.scene_wise[scene_label]['Ncorr']
-            results[scene_label]['count']['Nref'] = self.scene_wise[scene_label]['Nref']
-            results[scene_label]['count']['Nsys'] = self.scene_wise[scene_label]['Nsys']
+            results[scene_label]['count']['Ncorr'] = scene_wise[scene_label]['Ncorr']
+            results[scene_label]['count']['Nref'] = scene_wise[scene_label]['Nref']
+            results[scene_label]['count']['Nsys'] = scene_wise[scene_label]['Nsys']
             results[scene_label]['accuracy'] = {
                 'accuracy': metric.accuracy_corr(
-                    Ncorr=self.scene_wise[scene_label]['Ncorr'],
-                    N=self.scene_wise[scene_label]['Nref']
+                    Ncorr=scene_wise[scene_label]['Ncorr'],
+                    N=scene_wise[scene_label]['Nref']
                 )
             }
 
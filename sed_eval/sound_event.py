@@ -18,7 +18,9 @@ Event-based metrics, main functions:
 * :func:`sed_eval.sound_event.EventBasedMetrics.results_class_wise_average_metrics`: Calculate and return class-wise average metrics (macro-averaged).
 
 Functions :func:`sed_eval.sound_event.SegmentBasedMetrics.evaluate` and :func:`sed_eval.sound_event.EventBasedMetrics.evaluate`
-take as a parameter event lists, use :func:`sed_eval.io.load_event_list` to read them from a file.
+take as a parameter event lists, use :func:`sed_eval.io.load_event_list` to read them from a file. Event lists are
+converted internally into columnar :class:`sed_eval.util.EventTable` with integer-coded labels, tables can be also
+given directly.
 
 
 Usage example when reading event lists from disk (you can run example in path ``tests/data/sound_event``):
@@ -84,6 +86,9 @@ Usage example when reading event lists from disk (you can run example in path ``
             estimated_event_list=file_pair['estimated_event_list']
         )
 
+    # Or evaluate all files at once
+    # segment_based_metrics.evaluate_batch(reference_event_list, estimated_event_list)
+
     # Get only certain metrics
     overall_segment_based_metrics = segment_based_metrics.results_overall_metrics()
     print("Accuracy:", overall_segment_based_metrics['accuracy']['accuracy'])
@@ -181,6 +186,37 @@ Usage example to evaluate results stored in variables:
     print(segment_based_metrics)
     print(event_based_metrics)
 
+Metric objects can be merged with :func:`sed_eval.sound_event.SegmentBasedMetrics.merge` (or the ``+`` operator),
+which allows evaluating the file pairs in parallel processes. Results equal to the sequential evaluation.
+
+.. code-block:: python
+    :linenos:
+
+    import multiprocessing
+    import sed_eval
+
+    def evaluate_shard(shard):
+        metrics = sed_eval.sound_event.SegmentBasedMetrics(
+            event_label_list=event_labels,
+            time_resolution=1.0
+        )
+        for file_pair in shard:
+            metrics.evaluate(
+                reference_event_list=file_pair['reference_event_list'],
+                estimated_event_list=file_pair['estimated_event_list']
+            )
+        return metrics
+
+    pool = multiprocessing.Pool(processes=4)
+    try:
+        segment_based_metrics = sum(pool.map(evaluate_shard, [data[i::4] for i in range(4)]))
+
+    finally:
+        pool.close()
+        pool.join()
+
+    print(segment_based_metrics)
+
 Segment based metrics
 ^^^^^^^^^^^^^^^^^^^^^
 
@@ -189,6 +225,7 @@ Segment based metrics
 
     SegmentBasedMetrics
     SegmentBasedMetrics.evaluate
+    SegmentBasedMetrics.evaluate_batch
     SegmentBasedMetrics.results
     SegmentBasedMetrics.results_overall_metrics
     SegmentBasedMetrics.results_class_wise_metrics
@@ -198,10 +235,52 @@ Segment based metrics
     SegmentBasedMetrics.result_report_class_wise
     SegmentBasedMetrics.result_report_class_wise_average
     SegmentBasedMetrics.reset
+    SegmentBasedMetrics.merge
 
 .. autoclass:: SegmentBasedMetrics
    :members:
 
+Segment based metrics over thresholds
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+:class:`SegmentBasedThresholdMetrics` evaluates frame-wise class probabilities against reference event lists for a
+vector of decision thresholds at once, and returns segment-based metrics as curves (one value per threshold).
+
+.. code-block:: python
+    :linenos:
+
+    import numpy
+    import sed_eval
+
+    threshold_metrics = sed_eval.sound_event.SegmentBasedThresholdMetrics(
+        event_label_list=event_labels,
+        thresholds=numpy.linspace(0.0, 1.0, 101),
+        time_resolution=1.0
+    )
+
+    for file_pair in data:
+        threshold_metrics.evaluate(
+            reference_event_list=file_pair['reference_event_list'],
+            estimated_probabilities=file_pair['estimated_probabilities'],  # shape (frames, len(event_labels))
+            frame_resolution=0.02
+        )
+
+    results = threshold_metrics.results()
+    best_threshold = results['thresholds'][numpy.nanargmax(results['overall']['f_measure']['f_measure'])]
+
+.. autosummary::
+    :toctree: generated/
+
+    SegmentBasedThresholdMetrics
+    SegmentBasedThresholdMetrics.evaluate
+    SegmentBasedThresholdMetrics.results
+    SegmentBasedThresholdMetrics.segment_based_metrics
+    SegmentBasedThresholdMetrics.reset
+    SegmentBasedThresholdMetrics.merge
+
+.. autoclass:: SegmentBasedThresholdMetrics
+   :members:
+
 Event based metrics
 ^^^^^^^^^^^^^^^^^^^
 
@@ -210,6 +289,7 @@ Event based metrics
 
     EventBasedMetrics
     EventBasedMetrics.evaluate
+    EventBasedMetrics.evaluate_batch
     EventBasedMetrics.results
     EventBasedMetrics.results_overall_metrics
     EventBasedMetrics.results_class_wise_metrics
@@ -219,6 +299,7 @@ Event based metrics
     EventBasedMetrics.result_report_class_wise
     EventBasedMetrics.result_report_class_wise_average
     EventBasedMetrics.reset
+    EventBasedMetrics.merge
 
 .. autoclass:: EventBasedMetrics
    :members:
@@ -235,7 +316,34 @@ from . import metric
 from . import util
 
 
-class SoundEventMetrics(object):
+def _event_table(event_list, label_vocabulary, file_vocabulary=None):
+    """Event list as event table coded with the given label vocabulary"""
+
+    if not isinstance(event_list, (util.EventTable, dcase_util.containers.MetaDataContainer)):
+        # Plain lists are normalized through the container, e.g. field names and label whitespace
+        event_list = dcase_util.containers.MetaDataContainer(event_list)
+
+    return util.EventTable.from_event_list(
+        event_list,
+        label_vocabulary=label_vocabulary,
+        file_vocabulary=file_vocabulary
+    )
+
+
+def _split_by_file(event_table):
+    """Event table sorted by file code, and start and stop positions of the events of each file code"""
+
+    if numpy.any(event_table.file[1:] < event_table.file[:-1]):
+        # Stable sort keeps the event order within a file
+        event_table = event_table[numpy.argsort(event_table.file, kind='mergesort')]
+
+    counts = numpy.bincount(event_table.file, minlength=len(event_table.file_vocabulary))
+    stops = numpy.cumsum(counts)
+
+    return event_table, stops - counts, stops
+
+
+class SoundEventMetrics(metric.MergeableMetrics):
     """Base class for sound event detection metrics.
 
     """
@@ -258,6 +366,68 @@ class SoundEventMetrics(object):
         self.ui = dcase_util.ui.FancyStringifier()
         self.empty_system_output_handling = empty_system_output_handling
 
+    def evaluate_batch(self, reference_event_list, estimated_event_list):
+        """Evaluate event lists containing multiple files
+
+        Convenience wrapper for the file-by-file evaluation loop. Events are grouped by filename once with a sort
+        instead of filtering the event lists for each file, and each file is then evaluated separately with
+        :func:`evaluate`, hence the per-file evaluation itself is not batched.
+
+        Accumulated statistics equal to evaluating ``reference_event_list.filter(filename=filename)`` and
+        ``estimated_event_list.filter(filename=filename)`` for each filename in ``reference_event_list.unique_files``.
+        Files present only in the estimated event list are not evaluated.
+
+        Parameters
+        ----------
+        reference_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable or sed_eval.util.EventStore
+            Reference event list.
+
+        estimated_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable or sed_eval.util.EventStore
+            Estimated event list.
+
+        Returns
+        -------
+        self
+
+        """
+
+        label_vocabulary = util.LabelVocabulary(self.event_label_list)
+        file_vocabulary = util.LabelVocabulary()
+
+        def grouped(event_list):
+            # Event getter by filename
+            if isinstance(event_list, util.EventStore):
+                return event_list.files, event_list.filter
+
+            if not isinstance(event_list, (util.EventTable, dcase_util.containers.MetaDataContainer)):
+                event_list = dcase_util.containers.MetaDataContainer(event_list)
+
+            if isinstance(event_list, dcase_util.containers.MetaDataContainer):
+                # Files are included also when they do not have events
+                file_vocabulary.intern([item.get('filename') for item in event_list])
+
+            event_table, starts, stops = _split_by_file(
+                _event_table(event_list, label_vocabulary, file_vocabulary)
+            )
+            files = event_table.file_vocabulary.labels[0:len(starts)]
+
+            def events(filename):
+                if filename in file_vocabulary and file_vocabulary.code(filename) < len(starts):
+                    file_id = file_vocabulary.code(filename)
+                    return event_table[starts[file_id]:stops[file_id]]
+
+                return event_table[0:0]
+
+            return files, events
+
+        reference_files, reference_events = grouped(reference_event_list)
+        estimated_events = grouped(estimated_event_list)[1]
+
+        for filename in sorted(reference_files, key=str):
+            self.evaluate(reference_events(filename), estimated_events(filename))
+
+        return self
+
     # Reports
     def result_report_overall(self):
         """Report overall results
@@ -596,7 +766,8 @@ class SoundEventMetrics(object):
 class SegmentBasedMetrics(SoundEventMetrics):
     def __init__(self,
                  event_label_list,
-                 time_resolution=1.0):
+                 time_resolution=1.0,
+                 event_roll_type='float'):
         """Constructor
 
         Parameters
@@ -608,6 +779,15 @@ class SegmentBasedMetrics(SoundEventMetrics):
             Segment size used in the evaluation, in seconds.
             Default value 1.0
 
+        event_roll_type : str
+            Representation of the event rolls used in the evaluation. Use 'float' for float64 event rolls, 'bool' for
+            boolean event rolls (8x less memory), or 'packed' for bit-packed event rolls (64x less memory), where
+            eight event labels are stored into one byte and the metrics are computed with bitwise operations.
+            Use 'interval' to skip event rolls altogether and compute the metrics from merged event intervals
+            quantized to the segments, cost scales then with the number of events instead of the evaluated length.
+            All representations produce identical results.
+            Default value 'float'
+
         """
 
         SoundEventMetrics.__init__(self)
@@ -626,11 +806,17 @@ class SegmentBasedMetrics(SoundEventMetrics):
                 "time_resolution needs to be float > 0"
             )
 
+        if event_roll_type not in ['float', 'bool', 'packed', 'interval']:
+            raise ValueError(
+                "event_roll_type needs to be 'float', 'bool', 'packed' or 'interval'"
+            )
+
         self.event_label_list = event_label_list
         self.evaluated_length_seconds = 0.0
         self.evaluated_files = 0
 
         self.time_resolution = time_resolution
+        self.event_roll_type = event_roll_type
 
         self.overall = {
             'Ntp': 0.0,
@@ -679,10 +865,10 @@ class SegmentBasedMetrics(SoundEventMetrics):
         Parameters
         ----------
 
-        reference_event_list : list of dict or dcase_util.containers.MetaDataContainer
+        reference_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable
             Reference event list.
 
-        estimated_event_list : list of dict or dcase_util.containers.MetaDataContainer
+        estimated_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable
             Estimated event list.
 
         evaluated_length_seconds : float, optional
@@ -695,122 +881,150 @@ class SegmentBasedMetrics(SoundEventMetrics):
 
         """
 
-        # Make sure input is dcase_util.containers.MetaDataContainer
-        if not isinstance(reference_event_list, dcase_util.containers.MetaDataContainer):
-            reference_event_list = dcase_util.containers.MetaDataContainer(reference_event_list)
-
-        if not isinstance(estimated_event_list, dcase_util.containers.MetaDataContainer):
-            estimated_event_list = dcase_util.containers.MetaDataContainer(estimated_event_list)
+        # Convert inputs into event tables, only valid events are included. Labels are coded with a vocabulary local
+        # to this call: labels of event_label_list get codes in their order, other labels the following codes.
+        label_vocabulary = util.LabelVocabulary(self.event_label_list)
+        reference_event_list = _event_table(reference_event_list, label_vocabulary)
+        estimated_event_list = _event_table(estimated_event_list, label_vocabulary)
 
         # Check that input event list have event only from one file
-        reference_files = reference_event_list.unique_files
-        if len(reference_files) > 1:
+        if len(reference_event_list.unique_files) > 1:
             raise ValueError(
                 "reference_event_list contains events from multiple files. Evaluate only file by file."
             )
 
-        estimated_files = estimated_event_list.unique_files
-        if len(estimated_files) > 1:
+        if len(estimated_event_list.unique_files) > 1:
             raise ValueError(
                 "estimated_event_list contains events from multiple files. Evaluate only file by file."
             )
 
-        # Evaluate only valid events
-        valid_reference_event_list = dcase_util.containers.MetaDataContainer()
-        for item in reference_event_list:
-            if 'event_onset' in item and 'event_offset' in item and 'event_label' in item:
-                valid_reference_event_list.append(item)
-
-            elif 'onset' in item and 'offset' in item and 'event_label' in item:
-                valid_reference_event_list.append(item)
+        if evaluated_length_seconds is None:
+            evaluated_length_seconds = max(reference_event_list.max_offset, estimated_event_list.max_offset)
+            evaluated_length_segments = int(math.ceil(evaluated_length_seconds * 1 / float(self.time_resolution)))
 
-        reference_event_list = valid_reference_event_list
+        else:
+            evaluated_length_segments = int(math.ceil(evaluated_length_seconds * 1 / float(self.time_resolution)))
 
-        valid_estimated_event_list = dcase_util.containers.MetaDataContainer()
-        for item in estimated_event_list:
-            if 'event_onset' in item and 'event_offset' in item and 'event_label' in item:
-                valid_estimated_event_list.append(item)
+        self.evaluated_length_seconds += evaluated_length_seconds
+        self.evaluated_files += 1
 
-            elif 'onset' in item and 'offset' in item and 'event_label' in item:
-                valid_estimated_event_list.append(item)
+        if self.event_roll_type == 'interval':
+            # Convert event list into run-length representation and compute statistics directly from it
+            reference_intervals = util.event_list_to_segment_intervals(
+                source_event_list=reference_event_list,
+                event_label_list=self.event_label_list,
+                time_resolution=self.time_resolution,
+                length=evaluated_length_segments
+            )
 
-        estimated_event_list = valid_estimated_event_list
+            estimated_intervals = util.event_list_to_segment_intervals(
+                source_event_list=estimated_event_list,
+                event_label_list=self.event_label_list,
+                time_resolution=self.time_resolution,
+                length=evaluated_length_segments
+            )
 
-        # Convert event list into frame-based representation
-        reference_event_roll = util.event_list_to_event_roll(
-            source_event_list=reference_event_list,
-            event_label_list=self.event_label_list,
-            time_resolution=self.time_resolution
-        )
+            statistics = util.segment_interval_statistics(
+                reference_intervals=reference_intervals,
+                estimated_intervals=estimated_intervals,
+                event_label_count=len(self.event_label_list)
+            )
 
-        estimated_event_roll = util.event_list_to_event_roll(
-            source_event_list=estimated_event_list,
-            event_label_list=self.event_label_list,
-            time_resolution=self.time_resolution
-        )
+            class_Nref = statistics['Nref']
+            class_Nsys = statistics['Nsys']
+            class_Ntp = statistics['Ntp']
 
-        if evaluated_length_seconds is None:
-            evaluated_length_seconds = max(reference_event_list.max_offset, estimated_event_list.max_offset)
-            evaluated_length_segments = int(math.ceil(evaluated_length_seconds * 1 / float(self.time_resolution)))
+            S = statistics['S']
+            D = statistics['D']
+            I = statistics['I']
 
         else:
-            evaluated_length_segments = int(math.ceil(evaluated_length_seconds * 1 / float(self.time_resolution)))
+            # Convert event list into frame-based representation
+            if self.event_roll_type == 'packed':
+                reference_event_roll = util.event_list_to_packed_event_roll(
+                    source_event_list=reference_event_list,
+                    event_label_list=self.event_label_list,
+                    time_resolution=self.time_resolution
+                )
+
+                estimated_event_roll = util.event_list_to_packed_event_roll(
+                    source_event_list=estimated_event_list,
+                    event_label_list=self.event_label_list,
+                    time_resolution=self.time_resolution
+                )
+
+            else:
+                reference_event_roll = util.event_list_to_event_roll(
+                    source_event_list=reference_event_list,
+                    event_label_list=self.event_label_list,
+                    time_resolution=self.time_resolution,
+                    dtype=self.event_roll_type
+                )
+
+                estimated_event_roll = util.event_list_to_event_roll(
+                    source_event_list=estimated_event_list,
+                    event_label_list=self.event_label_list,
+                    time_resolution=self.time_resolution,
+                    dtype=self.event_roll_type
+                )
+
+            reference_event_roll, estimated_event_roll = util.match_event_roll_lengths(
+                reference_event_roll,
+                estimated_event_roll,
+                evaluated_length_segments
+            )
 
-        self.evaluated_length_seconds += evaluated_length_seconds
-        self.evaluated_files += 1
+            # Amount of active reference, estimated, and correctly estimated entries per segment and per class
+            if self.event_roll_type == 'packed':
+                true_positive_event_roll = numpy.bitwise_and(reference_event_roll, estimated_event_roll)
+                event_label_count = len(self.event_label_list)
 
-        reference_event_roll, estimated_event_roll = util.match_event_roll_lengths(
-            reference_event_roll,
-            estimated_event_roll,
-            evaluated_length_segments
-        )
+                segment_Nref = util.packed_event_roll_sum(reference_event_roll, axis=1)
+                segment_Nsys = util.packed_event_roll_sum(estimated_event_roll, axis=1)
+                segment_Ntp = util.packed_event_roll_sum(true_positive_event_roll, axis=1)
 
-        # Compute segment-based overall metrics
-        for segment_id in range(0, reference_event_roll.shape[0]):
-            annotated_segment = reference_event_roll[segment_id, :]
-            system_segment = estimated_event_roll[segment_id, :]
-
-            Ntp = sum(system_segment + annotated_segment > 1)
-            Ntn = sum(system_segment + annotated_segment == 0)
-            Nfp = sum(system_segment - annotated_segment > 0)
-            Nfn = sum(annotated_segment - system_segment > 0)
-
-            Nref = sum(annotated_segment)
-            Nsys = sum(system_segment)
-
-            S = min(Nref, Nsys) - Ntp
-            D = max(0, Nref - Nsys)
-            I = max(0, Nsys - Nref)
-
-            self.overall['Ntp'] += Ntp
-            self.overall['Ntn'] += Ntn
-            self.overall['Nfp'] += Nfp
-            self.overall['Nfn'] += Nfn
-            self.overall['Nref'] += Nref
-            self.overall['Nsys'] += Nsys
-            self.overall['S'] += S
-            self.overall['D'] += D
-            self.overall['I'] += I
+                class_Nref = util.packed_event_roll_sum(reference_event_roll, axis=0, event_label_count=event_label_count)
+                class_Nsys = util.packed_event_roll_sum(estimated_event_roll, axis=0, event_label_count=event_label_count)
+                class_Ntp = util.packed_event_roll_sum(true_positive_event_roll, axis=0, event_label_count=event_label_count)
 
-        # Compute segment-based class-wise metrics
-        for class_id, class_label in enumerate(self.event_label_list):
-            annotated_segment = reference_event_roll[:, class_id]
-            system_segment = estimated_event_roll[:, class_id]
+            else:
+                true_positive_event_roll = numpy.logical_and(reference_event_roll, estimated_event_roll)
 
-            Ntp = sum(system_segment + annotated_segment > 1)
-            Ntn = sum(system_segment + annotated_segment == 0)
-            Nfp = sum(system_segment - annotated_segment > 0)
-            Nfn = sum(annotated_segment - system_segment > 0)
+                segment_Nref = numpy.sum(reference_event_roll, axis=1)
+                segment_Nsys = numpy.sum(estimated_event_roll, axis=1)
+                segment_Ntp = numpy.sum(true_positive_event_roll, axis=1)
 
-            Nref = sum(annotated_segment)
-            Nsys = sum(system_segment)
+                class_Nref = numpy.sum(reference_event_roll, axis=0)
+                class_Nsys = numpy.sum(estimated_event_roll, axis=0)
+                class_Ntp = numpy.sum(true_positive_event_roll, axis=0)
 
-            self.class_wise[class_label]['Ntp'] += Ntp
-            self.class_wise[class_label]['Ntn'] += Ntn
-            self.class_wise[class_label]['Nfp'] += Nfp
-            self.class_wise[class_label]['Nfn'] += Nfn
-            self.class_wise[class_label]['Nref'] += Nref
-            self.class_wise[class_label]['Nsys'] += Nsys
+            S = numpy.sum(numpy.minimum(segment_Nref, segment_Nsys) - segment_Ntp)
+            D = numpy.sum(numpy.maximum(0, segment_Nref - segment_Nsys))
+            I = numpy.sum(numpy.maximum(0, segment_Nsys - segment_Nref))
+
+        # Compute segment-based class-wise metrics
+        class_Nfp = class_Nsys - class_Ntp
+        class_Nfn = class_Nref - class_Ntp
+        class_Ntn = evaluated_length_segments - class_Ntp - class_Nfp - class_Nfn
+
+        for class_id, class_label in enumerate(self.event_label_list):
+            self.class_wise[class_label]['Ntp'] += class_Ntp[class_id]
+            self.class_wise[class_label]['Ntn'] += class_Ntn[class_id]
+            self.class_wise[class_label]['Nfp'] += class_Nfp[class_id]
+            self.class_wise[class_label]['Nfn'] += class_Nfn[class_id]
+            self.class_wise[class_label]['Nref'] += class_Nref[class_id]
+            self.class_wise[class_label]['Nsys'] += class_Nsys[class_id]
+
+        # Compute segment-based overall metrics
+        self.overall['Ntp'] += numpy.sum(class_Ntp)
+        self.overall['Ntn'] += numpy.sum(class_Ntn)
+        self.overall['Nfp'] += numpy.sum(class_Nfp)
+        self.overall['Nfn'] += numpy.sum(class_Nfn)
+        self.overall['Nref'] += numpy.sum(class_Nref)
+        self.overall['Nsys'] += numpy.sum(class_Nsys)
+        self.overall['S'] += S
+        self.overall['D'] += D
+        self.overall['I'] += I
 
         return self
 
@@ -843,6 +1057,44 @@ class SegmentBasedMetrics(SoundEventMetrics):
 
         return self
 
+    def merge(self, other):
+        """Merge intermediate values accumulated in another metric object into this one
+
+        Parameters
+        ----------
+        other : SegmentBasedMetrics
+            Metric object to be merged, created with the same event_label_list and time_resolution
+
+        Raises
+        ------
+        ValueError:
+            Metric objects are not compatible
+
+        Returns
+        -------
+        self
+
+        """
+
+        if (not isinstance(other, SegmentBasedMetrics) or
+                other.event_label_list != self.event_label_list or
+                other.time_resolution != self.time_resolution):
+            raise ValueError(
+                "Only SegmentBasedMetrics with same event_label_list and time_resolution can be merged"
+            )
+
+        self.evaluated_length_seconds += other.evaluated_length_seconds
+        self.evaluated_files += other.evaluated_files
+
+        for field in self.overall:
+            self.overall[field] += other.overall[field]
+
+        for class_label in self.class_wise:
+            for field in self.class_wise[class_label]:
+                self.class_wise[class_label][field] += other.class_wise[class_label][field]
+
+        return self
+
     # Metrics
     def overall_f_measure(self):
         """Overall f-measure metrics (f_measure, precision, and recall)
@@ -1105,6 +1357,373 @@ class SegmentBasedMetrics(SoundEventMetrics):
         return output
 
 
+class SegmentBasedThresholdMetrics(metric.MergeableMetrics):
+    def __init__(self,
+                 event_label_list,
+                 thresholds,
+                 time_resolution=1.0,
+                 empty_system_output_handling=None):
+        """Constructor
+
+        Parameters
+        ----------
+        event_label_list : list, numpy.array
+            List of unique event labels
+
+        thresholds : list, numpy.array
+            Decision thresholds to be evaluated. A segment is estimated active when its probability is
+            equal to or greater than the threshold.
+
+        time_resolution : float (0,]
+            Segment size used in the evaluation, in seconds.
+            Default value 1.0
+
+        empty_system_output_handling : str
+            Controls how empty system output is handled, see :class:`SoundEventMetrics`.
+            Default value None
+
+        """
+
+        if isinstance(event_label_list, numpy.ndarray) and len(event_label_list.shape) == 1:
+            # We have numpy array, convert it to list
+            event_label_list = event_label_list.tolist()
+
+        if not isinstance(event_label_list, list):
+            raise ValueError(
+                "event_label_list needs to be list or numpy.array"
+            )
+
+        thresholds = numpy.asarray(thresholds, dtype=float)
+        if len(thresholds.shape) != 1 or thresholds.shape[0] == 0:
+            raise ValueError(
+                "thresholds needs to be non-empty one dimensional list or numpy.array"
+            )
+
+        if not isinstance(time_resolution, float) or time_resolution <= 0.0:
+            raise ValueError(
+                "time_resolution needs to be float > 0"
+            )
+
+        self.event_label_list = event_label_list
+        self.thresholds = thresholds
+        self.time_resolution = time_resolution
+        self.empty_system_output_handling = empty_system_output_handling
+
+        # Counts are accumulated in ascending threshold order
+        self._threshold_order = numpy.argsort(self.thresholds, kind='mergesort')
+
+        self.reset()
+
+    def evaluate(self, reference_event_list, estimated_probabilities, frame_resolution, evaluated_length_seconds=None):
+        """Evaluate file pair (reference event list and estimated frame probabilities) at all thresholds
+
+        Frame probabilities are quantized into segments by taking the maximum over the frames overlapping the
+        segment, and counts for all thresholds are collected in one pass with cumulative histograms over the
+        segment probabilities.
+
+        Parameters
+        ----------
+
+        reference_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable
+            Reference event list.
+
+        estimated_probabilities : numpy.ndarray, shape=(frames, len(event_label_list))
+            Estimated class probabilities per frame, columns in the order of event_label_list.
+
+        frame_resolution : float (0,]
+            Frame hop size of estimated_probabilities, in seconds.
+
+        evaluated_length_seconds : float, optional
+            Evaluated length. If none given, maximum of reference offsets and length of estimated_probabilities is used.
+            Default value None
+
+        Returns
+        -------
+        self
+
+        """
+
+        reference_event_list = _event_table(reference_event_list, util.LabelVocabulary(self.event_label_list))
+
+        # Check that input event list have event only from one file
+        if len(reference_event_list.unique_files) > 1:
+            raise ValueError(
+                "reference_event_list contains events from multiple files. Evaluate only file by file."
+            )
+
+        estimated_probabilities = numpy.asarray(estimated_probabilities, dtype=float)
+        if len(estimated_probabilities.shape) != 2 or estimated_probabilities.shape[1] != len(self.event_label_list):
+            raise ValueError(
+                "estimated_probabilities needs to be numpy.array with shape (frames, len(event_label_list))"
+            )
+
+        if frame_resolution <= 0.0:
+            raise ValueError(
+                "frame_resolution needs to be > 0"
+            )
+
+        frame_count = estimated_probabilities.shape[0]
+        if evaluated_length_seconds is None:
+            evaluated_length_seconds = max(reference_event_list.max_offset, frame_count * frame_resolution)
+
+        evaluated_length_segments = int(math.ceil(evaluated_length_seconds * 1 / float(self.time_resolution)))
+
+        self.evaluated_length_seconds += evaluated_length_seconds
+        self.evaluated_length_segments += evaluated_length_segments
+        self.evaluated_files += 1
+
+        reference_event_roll = util.event_list_to_event_roll(
+            source_event_list=reference_event_list,
+            event_label_list=self.event_label_list,
+            time_resolution=self.time_resolution,
+            dtype=bool
+        )
+        reference_event_roll = util.pad_event_roll(
+            reference_event_roll,
+            evaluated_length_segments
+        )[0:evaluated_length_segments, :]
+
+        # Segment probabilities, frames are quantized into segments the same way as events
+        frame_onset = numpy.floor(
+            numpy.arange(frame_count) * frame_resolution * 1 / float(self.time_resolution)
+        ).astype(int)
+        frame_offset = numpy.ceil(
+            numpy.arange(1, frame_count + 1) * frame_resolution * 1 / float(self.time_resolution)
+        ).astype(int)
+        segments_per_frame = frame_offset - frame_onset
+
+        frame_index = numpy.repeat(numpy.arange(frame_count), segments_per_frame)
+        segment_index = (
+            numpy.repeat(frame_onset, segments_per_frame) +
+            numpy.arange(frame_index.shape[0]) -
+            numpy.repeat(numpy.cumsum(segments_per_frame) - segments_per_frame, segments_per_frame)
+        )
+        valid = segment_index < evaluated_length_segments
+
+        segment_probabilities = numpy.full(
+            (evaluated_length_segments, len(self.event_label_list)),
+            -numpy.inf
+        )
+        numpy.maximum.at(
+            segment_probabilities,
+            segment_index[valid],
+            estimated_probabilities[frame_index[valid]]
+        )
+
+        # Segment is estimated active for the thresholds sorted_thresholds[0:threshold_count]
+        threshold_count = numpy.searchsorted(
+            self.thresholds[self._threshold_order],
+            segment_probabilities,
+            side='right'
+        )
+
+        class_Nref = numpy.sum(reference_event_roll, axis=0)
+        class_Nsys = self._active_count(threshold_count)
+        class_Ntp = self._active_count(numpy.where(reference_event_roll, threshold_count, 0))
+
+        # Deletions in a segment at threshold k are the reference entries exceeding the estimated active entries.
+        # With threshold counts sorted in descending order, the m-th reference entry is deleted once the m-th
+        # largest threshold count is at or below k.
+        segment_Nref = numpy.sum(reference_event_roll, axis=1)
+        sorted_threshold_count = numpy.sort(threshold_count, axis=1)[:, ::-1]
+        deleted = numpy.arange(len(self.event_label_list))[numpy.newaxis, :] < segment_Nref[:, numpy.newaxis]
+        D = numpy.cumsum(
+            numpy.bincount(sorted_threshold_count[deleted], minlength=len(self.thresholds) + 1)
+        )[0:len(self.thresholds)]
+
+        Nref = numpy.sum(class_Nref)
+        Nsys = numpy.sum(class_Nsys, axis=0)
+        Ntp = numpy.sum(class_Ntp, axis=0)
+
+        # sum(min(Nref, Nsys) - Ntp) and sum(max(0, Nsys - Nref)) per segment expressed through deletions
+        S = Nref - D - Ntp
+        I = Nsys - Nref + D
+
+        inverse_order = numpy.empty_like(self._threshold_order)
+        inverse_order[self._threshold_order] = numpy.arange(len(self.thresholds))
+
+        self.overall['Ntp'] += Ntp[inverse_order]
+        self.overall['Nsys'] += Nsys[inverse_order]
+        self.overall['Nref'] += Nref
+        self.overall['S'] += S[inverse_order]
+        self.overall['D'] += D[inverse_order]
+        self.overall['I'] += I[inverse_order]
+
+        for class_id, class_label in enumerate(self.event_label_list):
+            self.class_wise[class_label]['Ntp'] += class_Ntp[class_id][inverse_order]
+            self.class_wise[class_label]['Nsys'] += class_Nsys[class_id][inverse_order]
+            self.class_wise[class_label]['Nref'] += class_Nref[class_id]
+
+        return self
+
+    def _active_count(self, threshold_count):
+        """Amount of active segments per class for each threshold in ascending order
+
+        Parameters
+        ----------
+        threshold_count : numpy.ndarray, shape=(segments, len(event_label_list))
+            Amount of sorted thresholds for which the segment is active
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(event_label_list), len(thresholds))
+
+        """
+
+        bin_count = len(self.thresholds) + 1
+        class_offset = numpy.arange(threshold_count.shape[1]) * bin_count
+        histogram = numpy.bincount(
+            (threshold_count + class_offset[numpy.newaxis, :]).ravel(),
+            minlength=threshold_count.shape[1] * bin_count
+        ).reshape(threshold_count.shape[1], bin_count)
+
+        # Segment with count c is active for thresholds 0..c-1, reverse cumulative sum gives the active amount
+        return numpy.cumsum(histogram[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+    def reset(self):
+        """Reset internal state"""
+
+        self.evaluated_length_seconds = 0.0
+        self.evaluated_length_segments = 0
+        self.evaluated_files = 0
+
+        self.overall = {
+            'Ntp': numpy.zeros(len(self.thresholds)),
+            'Nref': 0.0,
+            'Nsys': numpy.zeros(len(self.thresholds)),
+            'S': numpy.zeros(len(self.thresholds)),
+            'D': numpy.zeros(len(self.thresholds)),
+            'I': numpy.zeros(len(self.thresholds)),
+        }
+
+        self.class_wise = {}
+        for class_label in self.event_label_list:
+            self.class_wise[class_label] = {
+                'Ntp': numpy.zeros(len(self.thresholds)),
+                'Nref': 0.0,
+                'Nsys': numpy.zeros(len(self.thresholds)),
+            }
+
+        return self
+
+    def merge(self, other):
+        """Merge intermediate values accumulated in another metric object into this one
+
+        Parameters
+        ----------
+        other : SegmentBasedThresholdMetrics
+            Metric object to be merged, created with the same event_label_list, thresholds and time_resolution
+
+        Raises
+        ------
+        ValueError:
+            Metric objects are not compatible
+
+        Returns
+        -------
+        self
+
+        """
+
+        if (not isinstance(other, SegmentBasedThresholdMetrics) or
+                other.event_label_list != self.event_label_list or
+                not numpy.array_equal(other.thresholds, self.thresholds) or
+                other.time_resolution != self.time_resolution):
+            raise ValueError(
+                "Only SegmentBasedThresholdMetrics with same event_label_list, thresholds and time_resolution "
+                "can be merged"
+            )
+
+        self.evaluated_length_seconds += other.evaluated_length_seconds
+        self.evaluated_length_segments += other.evaluated_length_segments
+        self.evaluated_files += other.evaluated_files
+
+        for field in self.overall:
+            self.overall[field] = self.overall[field] + other.overall[field]
+
+        for class_label in self.class_wise:
+            for field in self.class_wise[class_label]:
+                self.class_wise[class_label][field] = (
+                    self.class_wise[class_label][field] + other.class_wise[class_label][field]
+                )
+
+        return self
+
+    def segment_based_metrics(self, threshold_id):
+        """Segment-based metrics at one threshold
+
+        Parameters
+        ----------
+        threshold_id : int
+            Index of the threshold in thresholds
+
+        Returns
+        -------
+        SegmentBasedMetrics
+            Metric object holding the intermediate values accumulated for the threshold
+
+        """
+
+        metrics = SegmentBasedMetrics(
+            event_label_list=self.event_label_list,
+            time_resolution=self.time_resolution
+        )
+        metrics.empty_system_output_handling = self.empty_system_output_handling
+        metrics.evaluated_length_seconds = self.evaluated_length_seconds
+        metrics.evaluated_files = self.evaluated_files
+
+        for class_label in self.event_label_list:
+            Ntp = float(self.class_wise[class_label]['Ntp'][threshold_id])
+            Nsys = float(self.class_wise[class_label]['Nsys'][threshold_id])
+            Nref = float(self.class_wise[class_label]['Nref'])
+
+            metrics.class_wise[class_label].update({
+                'Ntp': Ntp,
+                'Ntn': self.evaluated_length_segments - Nsys - Nref + Ntp,
+                'Nfp': Nsys - Ntp,
+                'Nfn': Nref - Ntp,
+                'Nref': Nref,
+                'Nsys': Nsys,
+            })
+
+        for field in ['Ntp', 'Ntn', 'Nfp', 'Nfn']:
+            metrics.overall[field] = sum(metrics.class_wise[class_label][field] for class_label in self.event_label_list)
+
+        metrics.overall['Nref'] = float(self.overall['Nref'])
+        for field in ['Nsys', 'S', 'D', 'I']:
+            metrics.overall[field] = float(self.overall[field][threshold_id])
+
+        return metrics
+
+    def results(self):
+        """All metrics as curves over thresholds
+
+        Returns
+        -------
+        dict
+            results in a dictionary format, each metric is numpy.array with one value per threshold
+
+        """
+
+        results = [
+            self.segment_based_metrics(threshold_id).results() for threshold_id in range(len(self.thresholds))
+        ]
+
+        output = _stack_results(results)
+        output['thresholds'] = self.thresholds
+
+        return output
+
+
+def _stack_results(results):
+    """Stack list of result dictionaries with identical structure into a dictionary of numpy arrays"""
+
+    if isinstance(results[0], dict):
+        return dict((key, _stack_results([item[key] for item in results])) for key in results[0])
+
+    return numpy.array(results)
+
+
 class EventBasedMetrics(SoundEventMetrics):
     def __init__(self,
                  event_label_list,
@@ -1113,6 +1732,9 @@ class EventBasedMetrics(SoundEventMetrics):
                  t_collar=0.200,
                  percentage_of_length=0.5,
                  event_matching_type='optimal',
+                 candidate_generation='dense',
+                 bipartite_matcher='dict',
+                 substitution_matching_type='greedy',
                  **kwargs):
         """Constructor
 
@@ -1145,6 +1767,32 @@ class EventBasedMetrics(SoundEventMetrics):
             Use default 'optimal' event matching, if you do not intend to compare your results to old results.
             Default value 'optimal'
 
+        candidate_generation : str
+            Candidate generation for the event matching. Set 'dense' to validate all reference and estimated event
+            pairs through full hit matrices, or 'sparse' to search candidate pairs with a sorted sweep bounded by
+            the time collar and the length based tolerance. Both produce identical results, 'sparse' keeps memory
+            usage proportional to the number of matching candidates and is meant for long recordings with large
+            number of events.
+            Default value 'dense'
+
+        bipartite_matcher : str
+            Maximum cardinality matching implementation used with 'optimal' event matching. Set 'dict' for
+            :func:`sed_eval.util.event_matching.bipartite_match` operating on a graph stored in dictionaries, or 'csr'
+            for :func:`sed_eval.util.event_matching.bipartite_match_csr` operating on integer arrays.
+            Both produce identical results, 'csr' is meant for files with large number of events. Set 'convex' to use
+            :func:`sed_eval.util.event_matching.convex_bipartite_match` when the matching graph is convex, e.g. when
+            only onsets or only offsets are evaluated, and 'csr' otherwise. It runs in O((n + m) log n) time and finds
+            the same amount of matched events, however, it may select a different maximum matching, which can change
+            the amount of substitutions.
+            Default value 'dict'
+
+        substitution_matching_type : str
+            Matching type for substitutions, i.e. leftover reference and estimated events fulfilling the onset and
+            offset conditions but having different labels. Set 'greedy' to always select the first found
+            estimated event for each leftover reference event, or 'optimal' to count substitutions with maximum
+            cardinality matching.
+            Default value 'greedy'
+
         """
 
         SoundEventMetrics.__init__(self, **kwargs)
@@ -1174,12 +1822,31 @@ class EventBasedMetrics(SoundEventMetrics):
         if not evaluate_onset and not evaluate_offset:
             raise ValueError("Both evaluate_onset and evaluate_offset cannot be set to False")
 
+        if candidate_generation not in ['dense', 'sparse']:
+            raise ValueError(
+                "candidate_generation needs to be either 'dense' or 'sparse'"
+            )
+
+        if bipartite_matcher not in ['dict', 'csr', 'convex']:
+            raise ValueError(
+                "bipartite_matcher needs to be one of 'dict', 'csr' or 'convex'"
+            )
+
+        if substitution_matching_type not in ['greedy', 'optimal']:
+            raise ValueError(
+                "substitution_matching_type needs to be either 'greedy' or 'optimal'"
+            )
+
         self.evaluate_onset = evaluate_onset
         self.evaluate_offset = evaluate_offset
 
         self.t_collar = t_collar
         self.percentage_of_length = percentage_of_length
         self.event_matching_type = event_matching_type
+        self.candidate_generation = candidate_generation
+        self.bipartite_matcher = bipartite_matcher
+        self.substitution_matching_type = substitution_matching_type
+
         self.overall = {
             'Nref': 0.0,
             'Nsys': 0.0,
@@ -1236,10 +1903,10 @@ class EventBasedMetrics(SoundEventMetrics):
         Parameters
         ----------
 
-        reference_event_list : event list
+        reference_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable
             Reference event list
 
-        estimated_event_list : event list
+        estimated_event_list : list of dict or dcase_util.containers.MetaDataContainer or sed_eval.util.EventTable
             Estimated event list
 
         Returns
@@ -1248,212 +1915,145 @@ class EventBasedMetrics(SoundEventMetrics):
 
         """
 
-        # Make sure input is dcase_util.containers.MetaDataContainer
-        if not isinstance(reference_event_list, dcase_util.containers.MetaDataContainer):
-            reference_event_list = dcase_util.containers.MetaDataContainer(reference_event_list)
-
-        if not isinstance(estimated_event_list, dcase_util.containers.MetaDataContainer):
-            estimated_event_list = dcase_util.containers.MetaDataContainer(estimated_event_list)
+        # Convert inputs into event tables, only valid events are included. Labels are coded with a vocabulary local
+        # to this call: labels of event_label_list get codes in their order, other labels the following codes.
+        label_vocabulary = util.LabelVocabulary(self.event_label_list)
+        reference_event_list = _event_table(reference_event_list, label_vocabulary)
+        estimated_event_list = _event_table(estimated_event_list, label_vocabulary)
 
         # Check that input event list have event only from one file
-        reference_files = reference_event_list.unique_files
-        if len(reference_files) > 1:
+        if len(reference_event_list.unique_files) > 1:
             raise ValueError(
                 "reference_event_list contains events from multiple files. Evaluate only file by file."
             )
 
-        estimated_files = estimated_event_list.unique_files
-        if len(estimated_files) > 1:
+        if len(estimated_event_list.unique_files) > 1:
             raise ValueError(
                 "estimated_event_list contains events from multiple files. Evaluate only file by file."
             )
 
-        # Evaluate only valid events
-        valid_reference_event_list = dcase_util.containers.MetaDataContainer()
-        for item in reference_event_list:
-            if 'event_onset' in item and 'event_offset' in item and 'event_label' in item:
-                valid_reference_event_list.append(item)
-
-            elif 'onset' in item and 'offset' in item and 'event_label' in item:
-                valid_reference_event_list.append(item)
-
-        reference_event_list = valid_reference_event_list
-
-        valid_estimated_event_list = dcase_util.containers.MetaDataContainer()
-        for item in estimated_event_list:
-            if 'event_onset' in item and 'event_offset' in item and 'event_label' in item:
-                valid_estimated_event_list.append(item)
-
-            elif 'onset' in item and 'offset' in item and 'event_label' in item:
-                valid_estimated_event_list.append(item)
-
-        estimated_event_list = valid_estimated_event_list
-
         self.evaluated_length += reference_event_list.max_offset
         self.evaluated_files += 1
 
+        # Event onsets, offsets and label codes as arrays
+        reference_onsets = reference_event_list.onset
+        reference_offsets = reference_event_list.offset
+        reference_labels = reference_event_list.label
+
+        estimated_onsets = estimated_event_list.onset
+        estimated_offsets = estimated_event_list.offset
+        estimated_labels = estimated_event_list.label
+
         # Overall metrics
 
         # Total number of detected and reference events
         Nsys = len(estimated_event_list)
         Nref = len(reference_event_list)
 
-        if self.event_matching_type == 'optimal':
-            label_hit_matrix = numpy.zeros((len(reference_event_list), len(estimated_event_list)), dtype=bool)
-            for j in range(0, len(reference_event_list)):
-                for i in range(0, len(estimated_event_list)):
-                    label_hit_matrix[j, i] = reference_event_list[j]['event_label'] == estimated_event_list[i]['event_label']
+        # Reference and estimated event pairs fulfilling the onset and offset conditions, regardless of the event label
+        if self.candidate_generation == 'sparse':
+            hit_reference, hit_estimated = util.event_hit_pairs(
+                reference_onsets=reference_onsets,
+                reference_offsets=reference_offsets,
+                estimated_onsets=estimated_onsets,
+                estimated_offsets=estimated_offsets,
+                evaluate_onset=self.evaluate_onset,
+                evaluate_offset=self.evaluate_offset,
+                t_collar=self.t_collar,
+                percentage_of_length=self.percentage_of_length
+            )
 
-            hit_matrix = label_hit_matrix
+        else:
+            time_hit_matrix = numpy.ones((Nref, Nsys), dtype=bool)
             if self.evaluate_onset:
-                onset_hit_matrix = numpy.zeros((len(reference_event_list), len(estimated_event_list)), dtype=bool)
-                for j in range(0, len(reference_event_list)):
-                    for i in range(0, len(estimated_event_list)):
-                        onset_hit_matrix[j, i] = self.validate_onset(
-                            reference_event=reference_event_list[j],
-                            estimated_event=estimated_event_list[i],
-                            t_collar=self.t_collar
-                        )
+                time_hit_matrix &= util.onset_hit_matrix(
+                    reference_onsets=reference_onsets,
+                    estimated_onsets=estimated_onsets,
+                    t_collar=self.t_collar
+                )
 
-                hit_matrix *= onset_hit_matrix
+            if self.evaluate_offset:
+                time_hit_matrix &= util.offset_hit_matrix(
+                    reference_onsets=reference_onsets,
+                    reference_offsets=reference_offsets,
+                    estimated_offsets=estimated_offsets,
+                    t_collar=self.t_collar,
+                    percentage_of_length=self.percentage_of_length
+                )
+
+            hit_reference, hit_estimated = numpy.nonzero(time_hit_matrix)
+
+        label_hit = reference_labels[hit_reference] == estimated_labels[hit_estimated]
+
+        # Orderings of the estimated events under which the matching graphs can be convex, events are grouped by
+        # label since only events with the same label are matched
+        estimated_ranks = []
+        if self.event_matching_type == 'optimal' and self.bipartite_matcher == 'convex':
+            estimated_times = []
+            if self.evaluate_onset:
+                estimated_times.append(estimated_onsets)
 
             if self.evaluate_offset:
-                offset_hit_matrix = numpy.zeros((len(reference_event_list), len(estimated_event_list)), dtype=bool)
-                for j in range(0, len(reference_event_list)):
-                    for i in range(0, len(estimated_event_list)):
-                        offset_hit_matrix[j, i] = self.validate_offset(
-                            reference_event=reference_event_list[j],
-                            estimated_event=estimated_event_list[i],
-                            t_collar=self.t_collar,
-                            percentage_of_length=self.percentage_of_length
-                        )
-
-                hit_matrix *= offset_hit_matrix
-
-            hits = numpy.where(hit_matrix)
-            G = {}
-            for ref_i, est_i in zip(*hits):
-                if est_i not in G:
-                    G[est_i] = []
+                estimated_times.append(estimated_offsets)
 
-                G[est_i].append(ref_i)
+            for times in estimated_times:
+                estimated_rank = numpy.empty(Nsys, dtype=int)
+                estimated_rank[numpy.lexsort((times, estimated_labels))] = numpy.arange(Nsys)
+                estimated_ranks.append(estimated_rank)
 
-            matching = sorted(util.bipartite_match(G).items())
+        if self.event_matching_type == 'optimal':
+            matched_reference, matched_estimated = self._optimal_matching(
+                hit_reference=hit_reference[label_hit],
+                hit_estimated=hit_estimated[label_hit],
+                reference_count=Nref,
+                estimated_ranks=estimated_ranks
+            )
 
             ref_correct = numpy.zeros(Nref, dtype=bool)
             sys_correct = numpy.zeros(Nsys, dtype=bool)
-            for item in matching:
-                ref_correct[item[0]] = True
-                sys_correct[item[1]] = True
+            ref_correct[matched_reference] = True
+            sys_correct[matched_estimated] = True
 
-            Ntp = len(matching)
-            # Substitutions
-            Nsubs = 0
-
-            ref_leftover = numpy.nonzero(numpy.logical_not(ref_correct))[0]
-            sys_leftover = numpy.nonzero(numpy.logical_not(sys_correct))[0]
-            sys_counted = numpy.zeros(Nsys, dtype=bool)
-            for j in ref_leftover:
-                for i in sys_leftover:
-                    if not sys_counted[i]:
-                        if self.evaluate_onset:
-                            onset_condition = self.validate_onset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar
-                            )
-
-                        else:
-                            onset_condition = True
-
-                        if self.evaluate_offset:
-                            offset_condition = self.validate_offset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar,
-                                percentage_of_length=self.percentage_of_length
-                            )
-
-                        else:
-                            offset_condition = True
-
-                        if onset_condition and offset_condition:
-                            sys_counted[i] = True
-                            Nsubs += 1
-                            break
+            Ntp = len(matched_reference)
 
         elif self.event_matching_type == 'greedy':
             sys_correct = numpy.zeros(Nsys, dtype=bool)
             ref_correct = numpy.zeros(Nref, dtype=bool)
 
-            # Number of correctly detected events
-            for j in range(0, len(reference_event_list)):
-                for i in range(0, len(estimated_event_list)):
-                    if not sys_correct[i]:  # skip already matched events
-                        label_condition = reference_event_list[j]['event_label'] == estimated_event_list[i]['event_label']
-
-                        if self.evaluate_onset:
-                            onset_condition = self.validate_onset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar
-                            )
-
-                        else:
-                            onset_condition = True
-
-                        if self.evaluate_offset:
-                            offset_condition = self.validate_offset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar,
-                                percentage_of_length=self.percentage_of_length
-                            )
-
-                        else:
-                            offset_condition = True
-
-                        if label_condition and onset_condition and offset_condition:
-                            ref_correct[j] = True
-                            sys_correct[i] = True
-                            break
+            # Number of correctly detected events, pairs are ordered by reference event and then by estimated event,
+            # so the first unmatched estimated event is selected for each reference event.
+            for j, i in zip(hit_reference[label_hit], hit_estimated[label_hit]):
+                if not ref_correct[j] and not sys_correct[i]:
+                    ref_correct[j] = True
+                    sys_correct[i] = True
 
             Ntp = numpy.sum(sys_correct)
 
-            ref_leftover = numpy.nonzero(numpy.logical_not(ref_correct))[0]
-            sys_leftover = numpy.nonzero(numpy.logical_not(sys_correct))[0]
+        # Substitutions, leftover reference and estimated event pairs fulfilling the onset and offset conditions
+        # regardless of the event label. Candidate pairs are taken from the already validated pairs.
+        leftover_hit = numpy.logical_and(
+            numpy.logical_not(ref_correct[hit_reference]),
+            numpy.logical_not(sys_correct[hit_estimated])
+        )
+
+        if self.substitution_matching_type == 'optimal':
+            Nsubs = len(self._optimal_matching(
+                hit_reference=hit_reference[leftover_hit],
+                hit_estimated=hit_estimated[leftover_hit],
+                reference_count=Nref
+            )[0])
 
-            # Substitutions
+        else:
+            # Pairs are ordered by reference event and then by estimated event, so the first uncounted estimated event
+            # is selected for each leftover reference event.
             Nsubs = 0
+            ref_counted = numpy.zeros(Nref, dtype=bool)
             sys_counted = numpy.zeros(Nsys, dtype=bool)
-            for j in ref_leftover:
-                for i in sys_leftover:
-                    if not sys_counted[i]:
-                        if self.evaluate_onset:
-                            onset_condition = self.validate_onset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar
-                            )
-
-                        else:
-                            onset_condition = True
-
-                        if self.evaluate_offset:
-                            offset_condition = self.validate_offset(
-                                reference_event=reference_event_list[j],
-                                estimated_event=estimated_event_list[i],
-                                t_collar=self.t_collar,
-                                percentage_of_length=self.percentage_of_length
-                            )
-
-                        else:
-                            offset_condition = True
-
-                        if onset_condition and offset_condition:
-                            sys_counted[i] = True
-                            Nsubs += 1
-                            break
+            for j, i in zip(hit_reference[leftover_hit], hit_estimated[leftover_hit]):
+                if not ref_counted[j] and not sys_counted[i]:
+                    ref_counted[j] = True
+                    sys_counted[i] = True
+                    Nsubs += 1
 
         Nfp = Nsys - Ntp - Nsubs
         Nfn = Nref - Ntp - Nsubs
@@ -1466,101 +2066,22 @@ class EventBasedMetrics(SoundEventMetrics):
         self.overall['Nfn'] += Nfn
 
         # Class-wise metrics
+
+        # Only events with the same label are matched, hence the matching graph is block-diagonal by class and the
+        # overall matching restricted to a class is a matching of the class. Class-wise correct events are counted
+        # from the overall matching instead of matching each class again.
+        class_codes = label_vocabulary.encode(self.event_label_list)
+        label_count = len(label_vocabulary)
+
+        # Count event frequencies in the ground truth and in the system output
+        class_Nref = numpy.bincount(reference_labels, minlength=label_count)[class_codes]
+        class_Nsys = numpy.bincount(estimated_labels, minlength=label_count)[class_codes]
+        class_Ntp = numpy.bincount(reference_labels[ref_correct], minlength=label_count)[class_codes]
+
         for class_id, class_label in enumerate(self.event_label_list):
-            Nref = 0.0
-            Nsys = 0.0
-            Ntp = 0.0
-
-            # Count event frequencies in the ground truth
-            for i in range(0, len(reference_event_list)):
-                if reference_event_list[i]['event_label'] == class_label:
-                    Nref += 1
-
-            # Count event frequencies in the system output
-            for i in range(0, len(estimated_event_list)):
-                if estimated_event_list[i]['event_label'] == class_label:
-                    Nsys += 1
-
-            if self.event_matching_type == 'optimal':
-                class_reference_event_list = reference_event_list.filter(event_label=class_label)
-                class_estimated_event_list = estimated_event_list.filter(event_label=class_label)
-
-                hit_matrix = numpy.ones((len(class_reference_event_list), len(class_estimated_event_list)), dtype=bool)
-                if self.evaluate_onset:
-                    onset_hit_matrix = numpy.zeros((len(class_reference_event_list), len(class_estimated_event_list)), dtype=bool)
-                    for j in range(0, len(class_reference_event_list)):
-                        for i in range(0, len(class_estimated_event_list)):
-                            onset_hit_matrix[j, i] = self.validate_onset(
-                                reference_event=class_reference_event_list[j],
-                                estimated_event=class_estimated_event_list[i],
-                                t_collar=self.t_collar
-                            )
-
-                    hit_matrix *= onset_hit_matrix
-
-                if self.evaluate_offset:
-                    offset_hit_matrix = numpy.zeros((len(class_reference_event_list), len(class_estimated_event_list)), dtype=bool)
-                    for j in range(0, len(class_reference_event_list)):
-                        for i in range(0, len(class_estimated_event_list)):
-                            offset_hit_matrix[j, i] = self.validate_offset(
-                                reference_event=class_reference_event_list[j],
-                                estimated_event=class_estimated_event_list[i],
-                                t_collar=self.t_collar,
-                                percentage_of_length=self.percentage_of_length
-                            )
-
-                    hit_matrix *= offset_hit_matrix
-
-                hits = numpy.where(hit_matrix)
-                G = {}
-                for ref_i, est_i in zip(*hits):
-                    if est_i not in G:
-                        G[est_i] = []
-
-                    G[est_i].append(ref_i)
-
-                matching = sorted(util.bipartite_match(G).items())
-
-                ref_correct = numpy.zeros(int(Nref), dtype=bool)
-                sys_correct = numpy.zeros(int(Nsys), dtype=bool)
-
-                for item in matching:
-                    ref_correct[item[0]] = True
-                    sys_correct[item[1]] = True
-
-                Ntp = len(matching)
-
-            elif self.event_matching_type == 'greedy':
-                sys_counted = numpy.zeros(len(estimated_event_list), dtype=bool)
-                for j in range(0, len(reference_event_list)):
-                    if reference_event_list[j]['event_label'] == class_label:
-                        for i in range(0, len(estimated_event_list)):
-                            if estimated_event_list[i]['event_label'] == class_label and not sys_counted[i]:
-                                if self.evaluate_onset:
-                                    onset_condition = self.validate_onset(
-                                        reference_event=reference_event_list[j],
-                                        estimated_event=estimated_event_list[i],
-                                        t_collar=self.t_collar
-                                    )
-
-                                else:
-                                    onset_condition = True
-
-                                if self.evaluate_offset:
-                                    offset_condition = self.validate_offset(
-                                        reference_event=reference_event_list[j],
-                                        estimated_event=estimated_event_list[i],
-                                        t_collar=self.t_collar,
-                                        percentage_of_length=self.percentage_of_length
-                                    )
-
-                                else:
-                                    offset_condition = True
-
-                                if onset_condition and offset_condition:
-                                    sys_counted[i] = True
-                                    Ntp += 1
-                                    break
+            Nref = float(class_Nref[class_id])
+            Nsys = float(class_Nsys[class_id])
+            Ntp = float(class_Ntp[class_id])
 
             Nfp = Nsys - Ntp
             Nfn = Nref - Ntp
@@ -1600,6 +2121,132 @@ class EventBasedMetrics(SoundEventMetrics):
 
         return self
 
+    def merge(self, other):
+        """Merge intermediate values accumulated in another metric object into this one
+
+        Parameters
+        ----------
+        other : EventBasedMetrics
+            Metric object to be merged, created with the same event_label_list and evaluation parameters
+
+        Raises
+        ------
+        ValueError:
+            Metric objects are not compatible
+
+        Returns
+        -------
+        self
+
+        """
+
+        if (not isinstance(other, EventBasedMetrics) or
+                other.event_label_list != self.event_label_list or
+                other.evaluate_onset != self.evaluate_onset or
+                other.evaluate_offset != self.evaluate_offset or
+                other.t_collar != self.t_collar or
+                other.percentage_of_length != self.percentage_of_length or
+                other.event_matching_type != self.event_matching_type or
+                other.substitution_matching_type != self.substitution_matching_type or
+                other.bipartite_matcher != self.bipartite_matcher):
+            raise ValueError(
+                "Only EventBasedMetrics with same event_label_list and evaluation parameters can be merged"
+            )
+
+        self.evaluated_length += other.evaluated_length
+        self.evaluated_files += other.evaluated_files
+
+        for field in self.overall:
+            self.overall[field] += other.overall[field]
+
+        for class_label in self.class_wise:
+            for field in self.class_wise[class_label]:
+                self.class_wise[class_label][field] += other.class_wise[class_label][field]
+
+        return self
+
+    def _optimal_matching(self, hit_reference, hit_estimated, reference_count, estimated_ranks=None):
+        """Maximum cardinality matching between reference and estimated events
+
+        Parameters
+        ----------
+        hit_reference : numpy.ndarray
+            Reference event index of each candidate pair
+
+        hit_estimated : numpy.ndarray
+            Estimated event index of each candidate pair
+
+        reference_count : int
+            Amount of reference events
+
+        estimated_ranks : list of numpy.ndarray
+            Orderings of the estimated events tried with the 'convex' matcher.
+            Default value None
+
+        Returns
+        -------
+        matched_reference : numpy.ndarray
+            Matched reference event indices
+
+        matched_estimated : numpy.ndarray
+            Estimated event indices matched to the reference events
+
+        """
+
+        if self.bipartite_matcher == 'convex':
+            for estimated_rank in estimated_ranks or []:
+                graph = util.convex_bipartite_graph(
+                    left=hit_reference,
+                    right=hit_estimated,
+                    right_rank=estimated_rank
+                )
+
+                if graph is not None:
+                    reference_vertices, interval_start, interval_stop = graph
+                    matching = util.convex_bipartite_match(
+                        interval_start=interval_start,
+                        interval_stop=interval_stop,
+                        right_vertex_count=len(estimated_rank)
+                    )
+
+                    matched_position = numpy.nonzero(matching >= 0)[0]
+                    matched_reference = reference_vertices[matching[matched_position]]
+                    matched_estimated = numpy.argsort(estimated_rank)[matched_position]
+
+                    order = numpy.argsort(matched_reference, kind='mergesort')
+
+                    return matched_reference[order], matched_estimated[order]
+
+        if self.bipartite_matcher in ['csr', 'convex']:
+            # Graph is not convex, fall back to general matching
+            left_vertices, indptr, indices = util.bipartite_graph_csr(
+                left=hit_estimated,
+                right=hit_reference
+            )
+
+            matching = util.bipartite_match_csr(
+                indptr=indptr,
+                indices=indices,
+                right_vertex_count=reference_count
+            )
+
+            matched_reference = numpy.nonzero(matching >= 0)[0]
+
+            return matched_reference, left_vertices[matching[matched_reference]]
+
+        else:
+            G = {}
+            for ref_i, est_i in zip(hit_reference, hit_estimated):
+                if est_i not in G:
+                    G[est_i] = []
+
+                G[est_i].append(ref_i)
+
+            matching = sorted(util.bipartite_match(G).items())
+
+            return (numpy.array([item[0] for item in matching], dtype=int),
+                    numpy.array([item[1] for item in matching], dtype=int))
+
     @staticmethod
     def validate_onset(reference_event, estimated_event, t_collar=0.200):
         """Validate estimated event based on event onset
@@ -5,7 +5,7 @@ Utilities
 ==================
 
 Functions to handle event lists (list of event items), event rolls (event activity indicator matrix used in evaluation),
-and scene lists.
+and scene lists, and containers for label vocabularies, columnar event lists, and consolidated multi-file event stores.
 
 Event list operations
 ---------------------
@@ -18,6 +18,27 @@ Event list operations
     event_list.filter_event_list
     event_list.max_event_offset
 
+Event tables, event stores and label vocabularies
+-------------------------------------------------
+
+.. autosummary::
+    :toctree: generated/
+
+    event_table.EventTable
+    event_table.EventTable.from_event_list
+    event_table.EventTable.to_event_list
+    event_table.EventTable.with_vocabularies
+    event_table.EventTable.label_positions
+    event_table.EventTable.filter
+    event_store.EventStore
+    event_store.EventStore.create
+    event_store.EventStore.filter
+    label_vocabulary.LabelVocabulary
+    label_vocabulary.LabelVocabulary.intern
+    label_vocabulary.LabelVocabulary.encode
+    label_vocabulary.LabelVocabulary.decode
+    label_vocabulary.LabelVocabulary.recode
+
 Event roll operations
 ---------------------
 
@@ -25,6 +46,12 @@ Event roll operations
     :toctree: generated/
 
     event_roll.event_list_to_event_roll
+    event_roll.event_list_to_packed_event_roll
+    event_roll.pack_event_roll
+    event_roll.unpack_event_roll
+    event_roll.packed_event_roll_sum
+    event_roll.event_list_to_segment_intervals
+    event_roll.segment_interval_statistics
     event_roll.pad_event_roll
     event_roll.match_event_roll_lengths
 
@@ -43,9 +70,20 @@ Event matching operations
     :toctree: generated/
 
     event_matching.bipartite_match
+    event_matching.bipartite_graph_csr
+    event_matching.bipartite_match_csr
+    event_matching.convex_bipartite_graph
+    event_matching.convex_bipartite_match
+    event_matching.label_hit_matrix
+    event_matching.onset_hit_matrix
+    event_matching.offset_hit_matrix
+    event_matching.event_hit_pairs
 
 """
 
+from .label_vocabulary import *
+from .event_table import *
+from .event_store import *
 from .event_list import *
 from .event_roll import *
 from .scene_list import *
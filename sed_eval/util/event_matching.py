@@ -4,6 +4,212 @@
 Event matching
 """
 
+import heapq
+import numpy
+
+__all__ = ['bipartite_match',
+           'bipartite_graph_csr',
+           'bipartite_match_csr',
+           'convex_bipartite_graph',
+           'convex_bipartite_match',
+           'label_hit_matrix',
+           'onset_hit_matrix',
+           'offset_hit_matrix',
+           'event_hit_pairs']
+
+
+def label_hit_matrix(reference_labels, estimated_labels):
+    """Label hit matrix, reference and estimated events having the same label
+
+    Parameters
+    ----------
+    reference_labels : numpy.ndarray, shape=(n,)
+        Reference event labels
+
+    estimated_labels : numpy.ndarray, shape=(m,)
+        Estimated event labels
+
+    Returns
+    -------
+    numpy.ndarray, shape=(n,m), dtype=bool
+
+    """
+
+    reference_labels = numpy.asarray(reference_labels)
+    estimated_labels = numpy.asarray(estimated_labels)
+
+    return numpy.asarray(reference_labels[:, numpy.newaxis] == estimated_labels[numpy.newaxis, :], dtype=bool)
+
+
+def onset_hit_matrix(reference_onsets, estimated_onsets, t_collar=0.200):
+    """Onset hit matrix, estimated onset within the time collar from the reference onset
+
+    Vectorized counterpart of :func:`sed_eval.sound_event.EventBasedMetrics.validate_onset`.
+
+    Parameters
+    ----------
+    reference_onsets : numpy.ndarray, shape=(n,)
+        Reference event onsets in seconds
+
+    estimated_onsets : numpy.ndarray, shape=(m,)
+        Estimated event onsets in seconds
+
+    t_collar : float > 0, seconds
+        Time collar with which the estimated onset has to be in order to be consider valid estimation.
+        Default value 0.2
+
+    Returns
+    -------
+    numpy.ndarray, shape=(n,m), dtype=bool
+
+    """
+
+    reference_onsets = numpy.asarray(reference_onsets, dtype=float)
+    estimated_onsets = numpy.asarray(estimated_onsets, dtype=float)
+
+    return numpy.abs(reference_onsets[:, numpy.newaxis] - estimated_onsets[numpy.newaxis, :]) <= t_collar
+
+
+def offset_hit_matrix(reference_onsets, reference_offsets, estimated_offsets, t_collar=0.200, percentage_of_length=0.5):
+    """Offset hit matrix, estimated offset within the tolerance from the reference offset
+
+    Vectorized counterpart of :func:`sed_eval.sound_event.EventBasedMetrics.validate_offset`.
+
+    Parameters
+    ----------
+    reference_onsets : numpy.ndarray, shape=(n,)
+        Reference event onsets in seconds
+
+    reference_offsets : numpy.ndarray, shape=(n,)
+        Reference event offsets in seconds
+
+    estimated_offsets : numpy.ndarray, shape=(m,)
+        Estimated event offsets in seconds
+
+    t_collar : float > 0, seconds
+        First condition, Time collar with which the estimated offset has to be in order to be consider valid estimation.
+        Default value 0.2
+
+    percentage_of_length : float in [0, 1]
+        Second condition, percentage of the length within which the estimated offset has to be in order to be
+        consider valid estimation.
+        Default value 0.5
+
+    Returns
+    -------
+    numpy.ndarray, shape=(n,m), dtype=bool
+
+    """
+
+    reference_onsets = numpy.asarray(reference_onsets, dtype=float)
+    reference_offsets = numpy.asarray(reference_offsets, dtype=float)
+    estimated_offsets = numpy.asarray(estimated_offsets, dtype=float)
+
+    tolerance = numpy.maximum(t_collar, percentage_of_length * (reference_offsets - reference_onsets))
+
+    return numpy.abs(reference_offsets[:, numpy.newaxis] - estimated_offsets[numpy.newaxis, :]) <= tolerance[:, numpy.newaxis]
+
+
+def event_hit_pairs(reference_onsets, reference_offsets, estimated_onsets, estimated_offsets,
+                    evaluate_onset=True, evaluate_offset=True, t_collar=0.200, percentage_of_length=0.5):
+    """Reference and estimated event pairs fulfilling the onset and offset conditions
+
+    Sparse counterpart of :func:`onset_hit_matrix` and :func:`offset_hit_matrix`. Estimated events are sorted by
+    onset (or by offset when only offset is evaluated) and candidates for each reference event are searched within
+    the tolerance window, hence memory scales with the number of candidate pairs instead of the product of the
+    event list lengths.
+
+    Parameters
+    ----------
+    reference_onsets : numpy.ndarray, shape=(n,)
+        Reference event onsets in seconds
+
+    reference_offsets : numpy.ndarray, shape=(n,)
+        Reference event offsets in seconds
+
+    estimated_onsets : numpy.ndarray, shape=(m,)
+        Estimated event onsets in seconds
+
+    estimated_offsets : numpy.ndarray, shape=(m,)
+        Estimated event offsets in seconds
+
+    evaluate_onset : bool
+        Evaluate onset.
+        Default value True
+
+    evaluate_offset : bool
+        Evaluate offset.
+        Default value True
+
+    t_collar : float > 0, seconds
+        Time collar used when evaluating validity of the onset and offset.
+        Default value 0.2
+
+    percentage_of_length : float in [0, 1]
+        Second condition, percentage of the length within which the estimated offset has to be in order to be
+        consider valid estimation.
+        Default value 0.5
+
+    Returns
+    -------
+    reference_index : numpy.ndarray, shape=(k,)
+        Reference event indices
+
+    estimated_index : numpy.ndarray, shape=(k,)
+        Estimated event indices, pairs are ordered by reference index and then by estimated index
+
+    """
+
+    reference_onsets = numpy.asarray(reference_onsets, dtype=float)
+    reference_offsets = numpy.asarray(reference_offsets, dtype=float)
+    estimated_onsets = numpy.asarray(estimated_onsets, dtype=float)
+    estimated_offsets = numpy.asarray(estimated_offsets, dtype=float)
+
+    offset_tolerance = numpy.maximum(t_collar, percentage_of_length * (reference_offsets - reference_onsets))
+
+    # Search window, onset collar is narrower than the offset tolerance
+    if evaluate_onset:
+        reference_times = reference_onsets
+        estimated_times = estimated_onsets
+        window = numpy.full(reference_onsets.shape, t_collar, dtype=float)
+
+    else:
+        reference_times = reference_offsets
+        estimated_times = estimated_offsets
+        window = offset_tolerance
+
+    # Widen window slightly, exact conditions are validated below in the same way as in the hit matrices
+    window = window + 1e-9 * (1.0 + numpy.abs(reference_times) + window)
+
+    estimated_order = numpy.argsort(estimated_times, kind='mergesort')
+    estimated_times_sorted = estimated_times[estimated_order]
+
+    start = numpy.searchsorted(estimated_times_sorted, reference_times - window, side='left')
+    stop = numpy.searchsorted(estimated_times_sorted, reference_times + window, side='right')
+    counts = stop - start
+
+    # Expand windows into candidate pairs
+    reference_index = numpy.repeat(numpy.arange(len(reference_times)), counts)
+    position = numpy.arange(reference_index.shape[0]) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    estimated_index = estimated_order[numpy.repeat(start, counts) + position]
+
+    valid = numpy.ones(reference_index.shape, dtype=bool)
+    if evaluate_onset:
+        valid &= numpy.abs(reference_onsets[reference_index] - estimated_onsets[estimated_index]) <= t_collar
+
+    if evaluate_offset:
+        valid &= numpy.abs(
+            reference_offsets[reference_index] - estimated_offsets[estimated_index]
+        ) <= offset_tolerance[reference_index]
+
+    reference_index = reference_index[valid]
+    estimated_index = estimated_index[valid]
+
+    order = numpy.lexsort((estimated_index, reference_index))
+
+    return reference_index[order], estimated_index[order]
+
+
 def bipartite_match(graph):
     """
     Find maximum cardinality matching of a bipartite graph (U,V,E).
@@ -109,4 +315,324 @@ def bipartite_match(graph):
             return False
 
         for v in unmatched:
-            recurse(v)
\ No newline at end of file
+            recurse(v)
+
+
+def bipartite_graph_csr(left, right):
+    """Bipartite graph in compressed sparse row (CSR) format from edge arrays
+
+    Left vertices are ordered by their first appearance in the edge arrays, and neighbours of each left vertex
+    keep their order in the edge arrays. This is the same vertex order :func:`bipartite_match` sees when the graph
+    dictionary is filled by iterating the edges.
+
+    Parameters
+    ----------
+    left : numpy.ndarray, shape=(k,)
+        Left vertex of each edge
+
+    right : numpy.ndarray, shape=(k,)
+        Right vertex of each edge, integers in [0, right_vertex_count)
+
+    Returns
+    -------
+    left_vertices : numpy.ndarray, shape=(n,)
+        Left vertex corresponding to each row
+
+    indptr : numpy.ndarray, shape=(n+1,)
+        Row pointers, neighbours of row r are indices[indptr[r]:indptr[r+1]]
+
+    indices : numpy.ndarray, shape=(k,)
+        Right vertices
+
+    """
+
+    left = numpy.asarray(left, dtype=int)
+    right = numpy.asarray(right, dtype=int)
+
+    left_vertices, first_position, row = numpy.unique(left, return_index=True, return_inverse=True)
+
+    # Rank left vertices by first appearance
+    appearance_order = numpy.argsort(first_position, kind='mergesort')
+    rank = numpy.empty(len(left_vertices), dtype=int)
+    rank[appearance_order] = numpy.arange(len(left_vertices))
+    row = rank[row.reshape(-1)]
+
+    edge_order = numpy.argsort(row, kind='mergesort')
+
+    indptr = numpy.zeros(len(left_vertices) + 1, dtype=int)
+    numpy.cumsum(numpy.bincount(row, minlength=len(left_vertices)), out=indptr[1:])
+
+    return left_vertices[appearance_order], indptr, right[edge_order]
+
+
+def bipartite_match_csr(indptr, indices, right_vertex_count):
+    """Find maximum cardinality matching of a bipartite graph given in CSR format.
+
+    Array-backed counterpart of :func:`bipartite_match`. Hopcroft-Karp phases are run over preallocated integer
+    buffers and augmenting paths are searched with an iterative depth-first search, hence long augmenting paths
+    do not hit the recursion limit. Vertices are visited in the same order as in :func:`bipartite_match`,
+    and the returned matching is the same.
+
+    Parameters
+    ----------
+    indptr : numpy.ndarray, shape=(n+1,)
+        Row pointers, neighbours of left vertex u are indices[indptr[u]:indptr[u+1]]
+
+    indices : numpy.ndarray, shape=(k,)
+        Right vertices, integers in [0, right_vertex_count)
+
+    right_vertex_count : int
+        Amount of right vertices
+
+    Returns
+    -------
+    matching : numpy.ndarray, shape=(right_vertex_count,)
+        Left vertex matched to each right vertex, -1 for unmatched right vertices
+
+    """
+
+    # Element access is faster for lists than for numpy arrays inside the Python loops
+    indptr = numpy.asarray(indptr, dtype=int).tolist()
+    indices = numpy.asarray(indices, dtype=int).tolist()
+
+    left_vertex_count = len(indptr) - 1
+
+    UNMATCHED = -1
+    ABSENT = -2
+
+    matching = [UNMATCHED] * right_vertex_count
+
+    # Preallocated buffers
+    # pred[u]: neighbour in the previous layer for left vertex u, UNMATCHED for free vertices in the first layer
+    pred = [ABSENT] * left_vertex_count
+
+    # preds[v]: linked list of neighbours in the previous layer for right vertex v
+    preds_present = [False] * right_vertex_count
+    preds_head = [-1] * right_vertex_count
+    preds_tail = [-1] * right_vertex_count
+    entry_vertex = [0] * len(indices)
+    entry_next = [-1] * len(indices)
+    in_new_layer = [False] * right_vertex_count
+
+    # initialize greedy matching
+    for u in range(left_vertex_count):
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if matching[v] == UNMATCHED:
+                matching[v] = u
+                break
+
+    while True:
+        # structure residual graph into layers
+        for u in range(left_vertex_count):
+            pred[u] = UNMATCHED
+
+        for v in range(right_vertex_count):
+            preds_present[v] = False
+            if matching[v] != UNMATCHED:
+                pred[matching[v]] = ABSENT
+
+        layer = [u for u in range(left_vertex_count) if pred[u] == UNMATCHED]
+        unmatched = []
+        entry_count = 0
+
+        # repeatedly extend layering structure by another pair of layers
+        while layer and not unmatched:
+            new_layer = []
+            for u in layer:
+                for k in range(indptr[u], indptr[u + 1]):
+                    v = indices[k]
+                    if not preds_present[v]:
+                        entry_vertex[entry_count] = u
+                        entry_next[entry_count] = -1
+                        if not in_new_layer[v]:
+                            in_new_layer[v] = True
+                            new_layer.append(v)
+                            preds_head[v] = entry_count
+
+                        else:
+                            entry_next[preds_tail[v]] = entry_count
+
+                        preds_tail[v] = entry_count
+                        entry_count += 1
+
+            layer = []
+            for v in new_layer:
+                in_new_layer[v] = False
+                preds_present[v] = True
+
+                if matching[v] != UNMATCHED:
+                    layer.append(matching[v])
+                    pred[matching[v]] = v
+
+                else:
+                    unmatched.append(v)
+
+        # did we finish layering without finding any alternating paths?
+        if not unmatched:
+            return numpy.array(matching, dtype=int)
+
+        # search backward through layers to find alternating paths, with explicit stack
+        for root in unmatched:
+            if not preds_present[root]:
+                continue
+
+            preds_present[root] = False
+            stack_vertex = [root]
+            stack_entry = [preds_head[root]]
+            stack_candidate = [-1]
+
+            while stack_vertex:
+                v = stack_vertex[-1]
+                entry = stack_entry[-1]
+                found = False
+                descended = False
+
+                while entry != -1:
+                    u = entry_vertex[entry]
+                    entry = entry_next[entry]
+
+                    if pred[u] != ABSENT:
+                        pu = pred[u]
+                        pred[u] = ABSENT
+
+                        if pu == UNMATCHED:
+                            matching[v] = u
+                            found = True
+                            break
+
+                        if preds_present[pu]:
+                            # descend into pu, continue with the rest of the list when returning
+                            preds_present[pu] = False
+                            stack_entry[-1] = entry
+                            stack_candidate[-1] = u
+                            stack_vertex.append(pu)
+                            stack_entry.append(preds_head[pu])
+                            stack_candidate.append(-1)
+                            descended = True
+                            break
+
+                if descended:
+                    continue
+
+                stack_vertex.pop()
+                stack_entry.pop()
+                stack_candidate.pop()
+
+                if found:
+                    # alternating path found, flip the matching along the stack
+                    while stack_vertex:
+                        matching[stack_vertex.pop()] = stack_candidate.pop()
+                        stack_entry.pop()
+
+                    break
+
+
+def convex_bipartite_graph(left, right, right_rank):
+    """Interval representation of a convex bipartite graph
+
+    Bipartite graph is convex when neighbours of each left vertex form a contiguous range of right vertices
+    ordered by rank. This holds for example for the event pairs fulfilling only the onset condition when estimated
+    events are ordered by onset.
+
+    Parameters
+    ----------
+    left : numpy.ndarray, shape=(k,)
+        Left vertex of each edge, duplicate edges are not allowed
+
+    right : numpy.ndarray, shape=(k,)
+        Right vertex of each edge
+
+    right_rank : numpy.ndarray
+        Rank of each right vertex in the ordering
+
+    Returns
+    -------
+    left_vertices : numpy.ndarray, shape=(n,)
+        Left vertices having neighbours
+
+    interval_start : numpy.ndarray, shape=(n,)
+        Rank of the first neighbour
+
+    interval_stop : numpy.ndarray, shape=(n,)
+        Rank of the last neighbour plus one
+
+    None is returned in case the graph is not convex with the given ordering.
+
+    """
+
+    left = numpy.asarray(left, dtype=int)
+    position = numpy.asarray(right_rank, dtype=int)[numpy.asarray(right, dtype=int)]
+
+    left_vertices, row, counts = numpy.unique(left, return_inverse=True, return_counts=True)
+    row = row.reshape(-1)
+
+    interval_start = numpy.full(len(left_vertices), numpy.iinfo(int).max, dtype=int)
+    interval_stop = numpy.zeros(len(left_vertices), dtype=int)
+    numpy.minimum.at(interval_start, row, position)
+    numpy.maximum.at(interval_stop, row, position + 1)
+
+    if numpy.any(interval_stop - interval_start != counts):
+        return None
+
+    return left_vertices, interval_start, interval_stop
+
+
+def convex_bipartite_match(interval_start, interval_stop, right_vertex_count):
+    """Find maximum cardinality matching of a convex bipartite graph.
+
+    Left vertex i is adjacent to right vertices interval_start[i], ..., interval_stop[i] - 1. Right vertices are
+    scanned in order and each is matched to the adjacent unmatched left vertex whose interval ends first
+    (Glover's rule), which gives maximum cardinality matching in O((n + m) log n) time.
+
+    Parameters
+    ----------
+    interval_start : numpy.ndarray, shape=(n,)
+        First right vertex adjacent to each left vertex
+
+    interval_stop : numpy.ndarray, shape=(n,)
+        Last right vertex adjacent to each left vertex plus one
+
+    right_vertex_count : int
+        Amount of right vertices
+
+    Returns
+    -------
+    matching : numpy.ndarray, shape=(right_vertex_count,)
+        Left vertex matched to each right vertex, -1 for unmatched right vertices
+
+    """
+
+    interval_start = numpy.asarray(interval_start, dtype=int)
+    interval_stop = numpy.asarray(interval_stop, dtype=int)
+
+    order = numpy.argsort(interval_start, kind='mergesort').tolist()
+    start = interval_start.tolist()
+    stop = interval_stop.tolist()
+
+    matching = numpy.full(right_vertex_count, -1, dtype=int)
+
+    heap = []
+    k = 0
+    position = 0
+    while position < right_vertex_count:
+        if not heap:
+            if k == len(order):
+                break
+
+            # Skip right vertices without active intervals
+            position = max(position, start[order[k]])
+
+        while k < len(order) and start[order[k]] <= position:
+            heapq.heappush(heap, (stop[order[k]], order[k]))
+            k += 1
+
+        while heap and heap[0][0] <= position:
+            heapq.heappop(heap)
+
+        if heap:
+            matching[position] = heapq.heappop(heap)[1]
+
+        position += 1
+
+    return matching
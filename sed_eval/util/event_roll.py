@@ -7,10 +7,11 @@ from __future__ import absolute_import
 import math
 import numpy
 from . import event_list
+from .event_table import EventTable
 import dcase_util
 
 
-def event_list_to_event_roll(source_event_list, event_label_list=None, time_resolution=0.01):
+def event_list_to_event_roll(source_event_list, event_label_list=None, time_resolution=0.01, dtype=float):
     """Convert event list into event roll, binary activity matrix
 
     Parameters
@@ -21,10 +22,15 @@ def event_list_to_event_roll(source_event_list, event_label_list=None, time_reso
     event_label_list : list, shape=(k,) or None
         A list of containing unique labels in alphabetical order
         (Default value = None)
+
     time_resolution : float > 0
         Time resolution in seconds of the event roll
         (Default value = 0.01)
 
+    dtype : numpy.dtype
+        Data type of the event roll, use bool for compact representation
+        (Default value = float)
+
     Returns
     -------
 
@@ -33,42 +39,147 @@ def event_list_to_event_roll(source_event_list, event_label_list=None, time_reso
 
     """
 
-    if isinstance(source_event_list, dcase_util.containers.MetaDataContainer):
-        max_offset_value = source_event_list.max_offset
+    segment_count, event_label_list = _event_roll_shape(
+        source_event_list=source_event_list,
+        event_label_list=event_label_list,
+        time_resolution=time_resolution
+    )
 
-        if event_label_list is None:
-            event_label_list = source_event_list.unique_event_labels
+    # Initialize event roll
+    event_roll = numpy.zeros((segment_count, len(event_label_list)), dtype=dtype)
 
-    elif isinstance(source_event_list, list):
-        max_offset_value = event_list.max_event_offset(source_event_list)
+    # Fill-in event_roll
+    label, onset, offset = _event_roll_positions(source_event_list, event_label_list, time_resolution)
+    for pos, onset, offset in zip(label.tolist(), onset.tolist(), offset.tolist()):
+        event_roll[onset:offset, pos] = 1
 
-        if event_label_list is None:
-            event_label_list = event_list.unique_event_labels(source_event_list)
+    return event_roll
 
-    else:
-        raise ValueError('Unknown source_event_list type.')
+
+def event_list_to_packed_event_roll(source_event_list, event_label_list=None, time_resolution=0.01):
+    """Convert event list into bit-packed event roll
+
+    Event activities of eight event labels are packed into one byte, with the same bit layout as
+    ``numpy.packbits(event_roll, axis=1)`` produces. Event roll is filled directly in packed form.
+
+    Parameters
+    ----------
+    source_event_list : list, shape=(n,)
+        A list containing event dicts
+
+    event_label_list : list, shape=(k,) or None
+        A list of containing unique labels in alphabetical order
+        (Default value = None)
+
+    time_resolution : float > 0
+        Time resolution in seconds of the event roll
+        (Default value = 0.01)
+
+    Returns
+    -------
+
+    event_roll: np.ndarray, shape=(m,ceil(k/8)), dtype=uint8
+        Bit-packed event roll
+
+    """
+
+    segment_count, event_label_list = _event_roll_shape(
+        source_event_list=source_event_list,
+        event_label_list=event_label_list,
+        time_resolution=time_resolution
+    )
 
     # Initialize event roll
-    event_roll = numpy.zeros((int(math.ceil(max_offset_value * 1 / time_resolution)), len(event_label_list)))
+    event_roll = numpy.zeros((segment_count, int(math.ceil(len(event_label_list) / 8.0))), dtype=numpy.uint8)
 
     # Fill-in event_roll
-    for event in source_event_list:
-        pos = event_label_list.index(event['event_label'])
+    label, onset, offset = _event_roll_positions(source_event_list, event_label_list, time_resolution)
+    for pos, onset, offset in zip(label.tolist(), onset.tolist(), offset.tolist()):
+        event_roll[onset:offset, pos // 8] |= numpy.uint8(128 >> (pos % 8))
+
+    return event_roll
 
-        if 'event_onset' in event and 'event_offset' in event:
-            event_onset = event['event_onset']
-            event_offset = event['event_offset']
 
-        elif 'onset' in event and 'offset' in event:
-            event_onset = event['onset']
-            event_offset = event['offset']
+def pack_event_roll(event_roll):
+    """Pack event roll into bit-packed event roll
 
-        onset = int(math.floor(event_onset * 1 / float(time_resolution)))
-        offset = int(math.ceil(event_offset * 1 / float(time_resolution)))
+    Parameters
+    ----------
+    event_roll: np.ndarray, shape=(m,k)
+        Event roll
 
-        event_roll[onset:offset, pos] = 1
+    Returns
+    -------
+    event_roll: np.ndarray, shape=(m,ceil(k/8)), dtype=uint8
+        Bit-packed event roll
 
-    return event_roll
+    """
+
+    return numpy.packbits(numpy.asarray(event_roll) > 0, axis=1)
+
+
+def unpack_event_roll(event_roll, event_label_count):
+    """Unpack bit-packed event roll into boolean event roll
+
+    Parameters
+    ----------
+    event_roll: np.ndarray, shape=(m,ceil(k/8)), dtype=uint8
+        Bit-packed event roll
+
+    event_label_count : int
+        Amount of event labels (k)
+
+    Returns
+    -------
+    event_roll: np.ndarray, shape=(m,k), dtype=bool
+        Event roll
+
+    """
+
+    return numpy.unpackbits(event_roll, axis=1)[:, 0:event_label_count].astype(bool)
+
+
+def packed_event_roll_sum(event_roll, axis=0, event_label_count=None):
+    """Amount of active entries in bit-packed event roll along given axis
+
+    Equivalent to ``numpy.sum(unpack_event_roll(event_roll, event_label_count), axis=axis)``, computed
+    without unpacking the event roll.
+
+    Parameters
+    ----------
+    event_roll: np.ndarray, shape=(m,ceil(k/8)), dtype=uint8
+        Bit-packed event roll
+
+    axis : int
+        Axis, 0 to get amount per event label, and 1 to get amount per segment
+        (Default value = 0)
+
+    event_label_count : int or None
+        Amount of event labels (k), used to drop padding bits when axis is 0
+        (Default value = None)
+
+    Returns
+    -------
+    np.ndarray, shape=(k,) or shape=(m,)
+        Amount of active entries
+
+    """
+
+    if axis == 1 or axis == -1:
+        return numpy.sum(_POPCOUNT_TABLE[event_roll], axis=1, dtype=int)
+
+    elif axis == 0:
+        counts = numpy.zeros(event_roll.shape[1] * 8, dtype=int)
+        for bit in range(0, 8):
+            counts[bit::8] = numpy.sum((event_roll >> (7 - bit)) & 1, axis=0, dtype=int)
+
+        if event_label_count is not None:
+            counts = counts[0:event_label_count]
+
+        return counts
+
+    else:
+        raise ValueError('Unknown axis [{axis}].'.format(axis=axis))
 
 
 def pad_event_roll(event_roll, length):
@@ -90,12 +201,186 @@ def pad_event_roll(event_roll, length):
     """
 
     if length > event_roll.shape[0]:
-        padding = numpy.zeros((length-event_roll.shape[0], event_roll.shape[1]))
-        event_roll = numpy.vstack((event_roll, padding))
+        padded_event_roll = numpy.zeros((length, event_roll.shape[1]), dtype=event_roll.dtype)
+        padded_event_roll[0:event_roll.shape[0], :] = event_roll
+        event_roll = padded_event_roll
 
     return event_roll
 
 
+def event_list_to_segment_intervals(source_event_list, event_label_list=None, time_resolution=0.01, length=None):
+    """Convert event list into segment intervals, run-length representation of the event roll
+
+    Events are quantized into segments in the same way as in :func:`event_list_to_event_roll`, and overlapping
+    or adjacent events having the same label are merged. Active entries of the event roll for label index
+    ``label[i]`` are segments ``onset[i]`` to ``offset[i] - 1``.
+
+    Parameters
+    ----------
+    source_event_list : list, shape=(n,)
+        A list containing event dicts
+
+    event_label_list : list, shape=(k,) or None
+        A list of containing unique labels in alphabetical order
+        (Default value = None)
+
+    time_resolution : float > 0
+        Time resolution in seconds of the segments
+        (Default value = 0.01)
+
+    length : int, optional
+        Length of the event roll in segments, intervals are cut to it. If none given, length is set by
+        the maximum event offset.
+        (Default value = None)
+
+    Returns
+    -------
+    label : np.ndarray, shape=(p,), dtype=int
+        Label indices, intervals are ordered by label index and onset
+
+    onset : np.ndarray, shape=(p,), dtype=int
+        Interval onsets in segments
+
+    offset : np.ndarray, shape=(p,), dtype=int
+        Interval offsets in segments (exclusive)
+
+    """
+
+    segment_count, event_label_list = _event_roll_shape(
+        source_event_list=source_event_list,
+        event_label_list=event_label_list,
+        time_resolution=time_resolution
+    )
+
+    if length is None:
+        length = segment_count
+
+    label, onset, offset = _event_roll_positions(source_event_list, event_label_list, time_resolution)
+
+    onset = numpy.clip(onset, 0, int(length))
+    offset = numpy.clip(offset, 0, int(length))
+
+    # Drop empty intervals
+    valid = onset < offset
+    label = label[valid]
+    onset = onset[valid]
+    offset = offset[valid]
+
+    if label.shape[0] == 0:
+        return label, onset, offset
+
+    order = numpy.lexsort((onset, label))
+    label = label[order]
+    onset = onset[order]
+    offset = offset[order]
+
+    # Merge overlapping and adjacent intervals within each label, labels are separated
+    # by shifting the intervals along the time axis
+    shift = label * (int(length) + 1)
+    running_offset = numpy.maximum.accumulate(offset + shift)
+    new_interval = numpy.ones(label.shape[0], dtype=bool)
+    new_interval[1:] = onset[1:] + shift[1:] > running_offset[:-1]
+
+    interval_start = numpy.flatnonzero(new_interval)
+    interval_stop = numpy.append(interval_start[1:], label.shape[0]) - 1
+
+    return label[interval_start], onset[interval_start], running_offset[interval_stop] - shift[interval_start]
+
+
+def segment_interval_statistics(reference_intervals, estimated_intervals, event_label_count):
+    """Segment-based intermediate statistics from segment intervals
+
+    Counts are the same as ones computed from the corresponding event rolls, but the computation scales with
+    the number of intervals instead of the length of the event roll.
+
+    Parameters
+    ----------
+    reference_intervals : tuple of np.ndarray
+        Reference segment intervals (label, onset, offset), see :func:`event_list_to_segment_intervals`
+
+    estimated_intervals : tuple of np.ndarray
+        Estimated segment intervals (label, onset, offset), see :func:`event_list_to_segment_intervals`
+
+    event_label_count : int
+        Amount of event labels (k)
+
+    Returns
+    -------
+    dict
+        Class-wise amount of active reference entries (Nref), active estimated entries (Nsys), and entries
+        active in both (Ntp) as np.ndarray, shape=(k,), and segment-wise substitutions (S), deletions (D),
+        and insertions (I) summed over all segments.
+
+    """
+
+    reference_label, reference_onset, reference_offset = reference_intervals
+    estimated_label, estimated_onset, estimated_offset = estimated_intervals
+
+    Nref = numpy.bincount(reference_label, weights=reference_offset - reference_onset, minlength=event_label_count)
+    Nsys = numpy.bincount(estimated_label, weights=estimated_offset - estimated_onset, minlength=event_label_count)
+
+    # Sweep label by label to get intervals active in both
+    label = numpy.concatenate((reference_label, reference_label, estimated_label, estimated_label))
+    position = numpy.concatenate((reference_onset, reference_offset, estimated_onset, estimated_offset))
+    reference_delta = numpy.concatenate((
+        numpy.ones(reference_label.shape[0], dtype=int),
+        -numpy.ones(reference_label.shape[0], dtype=int),
+        numpy.zeros(2 * estimated_label.shape[0], dtype=int)
+    ))
+    estimated_delta = numpy.concatenate((
+        numpy.zeros(2 * reference_label.shape[0], dtype=int),
+        numpy.ones(estimated_label.shape[0], dtype=int),
+        -numpy.ones(estimated_label.shape[0], dtype=int)
+    ))
+
+    order = numpy.lexsort((position, label))
+    label = label[order]
+    position = position[order]
+
+    # Deltas of each label sum to zero, hence cumulative sum restarts from zero on every label
+    both_active = numpy.logical_and(
+        numpy.cumsum(reference_delta[order]) > 0,
+        numpy.cumsum(estimated_delta[order]) > 0
+    )[:-1]
+
+    tp_label = label[:-1][both_active]
+    tp_onset = position[:-1][both_active]
+    tp_offset = position[1:][both_active]
+
+    Ntp = numpy.bincount(tp_label, weights=tp_offset - tp_onset, minlength=event_label_count)
+
+    # Sweep over all labels to get amount of active labels per segment
+    position = numpy.concatenate((
+        reference_onset, reference_offset, estimated_onset, estimated_offset, tp_onset, tp_offset
+    ))
+    deltas = numpy.zeros((position.shape[0], 3), dtype=int)
+    offset = 0
+    for channel, (onset, stop) in enumerate([(reference_onset, reference_offset),
+                                              (estimated_onset, estimated_offset),
+                                              (tp_onset, tp_offset)]):
+        deltas[offset:offset + onset.shape[0], channel] = 1
+        deltas[offset + onset.shape[0]:offset + 2 * onset.shape[0], channel] = -1
+        offset += 2 * onset.shape[0]
+
+    order = numpy.argsort(position, kind='mergesort')
+    position = position[order]
+    active = numpy.cumsum(deltas[order, :], axis=0)[:-1, :]
+    piece_length = numpy.diff(position)
+
+    segment_Nref = active[:, 0]
+    segment_Nsys = active[:, 1]
+    segment_Ntp = active[:, 2]
+
+    return {
+        'Nref': Nref.astype(int),
+        'Nsys': Nsys.astype(int),
+        'Ntp': Ntp.astype(int),
+        'S': int(numpy.sum(piece_length * (numpy.minimum(segment_Nref, segment_Nsys) - segment_Ntp))),
+        'D': int(numpy.sum(piece_length * numpy.maximum(0, segment_Nref - segment_Nsys))),
+        'I': int(numpy.sum(piece_length * numpy.maximum(0, segment_Nsys - segment_Nref))),
+    }
+
+
 def match_event_roll_lengths(event_roll_a, event_roll_b, length=None):
     """Fix the length of two event rolls
 
@@ -147,3 +432,37 @@ def match_event_roll_lengths(event_roll_a, event_roll_b, length=None):
 
     return event_roll_a, event_roll_b
 
+
+# Amount of set bits for each byte value
+_POPCOUNT_TABLE = numpy.array([bin(value).count('1') for value in range(0, 256)], dtype=numpy.uint8)
+
+
+def _event_roll_shape(source_event_list, event_label_list, time_resolution):
+    if isinstance(source_event_list, (EventTable, dcase_util.containers.MetaDataContainer)):
+        max_offset_value = source_event_list.max_offset
+
+        if event_label_list is None:
+            event_label_list = source_event_list.unique_event_labels
+
+    elif isinstance(source_event_list, list):
+        max_offset_value = event_list.max_event_offset(source_event_list)
+
+        if event_label_list is None:
+            event_label_list = event_list.unique_event_labels(source_event_list)
+
+    else:
+        raise ValueError('Unknown source_event_list type.')
+
+    return int(math.ceil(max_offset_value * 1 / time_resolution)), event_label_list
+
+
+def _event_roll_positions(source_event_list, event_label_list, time_resolution):
+    # Label indices, onsets and offsets in segments as arrays, labels are encoded once per call
+    if not isinstance(source_event_list, EventTable):
+        source_event_list = EventTable.from_event_list(source_event_list)
+
+    label = source_event_list.label_positions(event_label_list)
+    onset = numpy.floor(source_event_list.onset * 1 / float(time_resolution)).astype(int)
+    offset = numpy.ceil(source_event_list.offset * 1 / float(time_resolution)).astype(int)
+
+    return label, onset, offset
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Consolidated multi-file event store
+"""
+
+from __future__ import absolute_import
+import os
+import json
+import numpy
+from .label_vocabulary import LabelVocabulary
+from .event_table import EventTable
+
+__all__ = ['EventStore']
+
+
+class EventStore(object):
+    """Consolidated event annotations of many files
+
+    Events of all files are stored in a directory as single onset, offset and label code arrays ordered by file,
+    together with a per-file index into them. Arrays are memory-mapped when the store is opened, and the events
+    of a file are returned as an event table viewing the mapped arrays, hence only the accessed parts are read
+    from disk.
+
+    Store can be used in place of an event list in the file-by-file evaluation loop, as it provides
+    ``unique_files`` and ``filter(filename=...)``.
+
+    Examples
+    --------
+
+    .. code-block:: python
+        :linenos:
+
+        sed_eval.util.EventStore.create('reference_store', reference_event_lists)
+        reference_store = sed_eval.util.EventStore('reference_store')
+
+        for filename in reference_store.unique_files:
+            segment_based_metrics.evaluate(
+                reference_event_list=reference_store[filename],
+                estimated_event_list=estimated_event_list.filter(filename=filename)
+            )
+
+    """
+
+    # Store format version
+    version = 1
+
+    def __init__(self, path, mmap_mode='r'):
+        """Constructor
+
+        Parameters
+        ----------
+        path : str
+            Store directory
+
+        mmap_mode : str, optional
+            Memory-mapping mode for the arrays, see numpy.load. Use None to read arrays fully into memory.
+            Default value 'r'
+
+        Raises
+        ------
+        ValueError:
+            Unknown store format
+
+        """
+
+        self.path = path
+
+        with open(os.path.join(path, 'store.json'), 'rt') as store_file:
+            info = json.load(store_file)
+
+        if info.get('version') != self.version:
+            raise ValueError(
+                "Unknown event store format in [{path}].".format(path=path)
+            )
+
+        self.label_vocabulary = LabelVocabulary(info['labels'])
+        self.files = info['files']
+
+        self.onset = numpy.load(os.path.join(path, 'onset.npy'), mmap_mode=mmap_mode)
+        self.offset = numpy.load(os.path.join(path, 'offset.npy'), mmap_mode=mmap_mode)
+        self.label = numpy.load(os.path.join(path, 'label.npy'), mmap_mode=mmap_mode)
+        self.index = numpy.load(os.path.join(path, 'index.npy'))
+
+        self._file_positions = dict((file, file_id) for file_id, file in enumerate(self.files))
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, filename):
+        return filename in self._file_positions
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __getitem__(self, filename):
+        """Events of a file
+
+        Parameters
+        ----------
+        filename : str
+            Filename
+
+        Raises
+        ------
+        KeyError:
+            File not in the store
+
+        Returns
+        -------
+        EventTable
+            Event table viewing the store arrays
+
+        """
+
+        file_id = self._file_positions[filename]
+        start = int(self.index[file_id])
+        stop = int(self.index[file_id + 1])
+
+        return EventTable(
+            onset=self.onset[start:stop],
+            offset=self.offset[start:stop],
+            label=self.label[start:stop],
+            file=numpy.zeros(stop - start, dtype=int),
+            label_vocabulary=self.label_vocabulary,
+            file_vocabulary=[filename]
+        )
+
+    @classmethod
+    def create(cls, path, event_lists):
+        """Create event store from event lists
+
+        Events are grouped by their filename. Files present in the file vocabulary of an event table are
+        included even without events.
+
+        Parameters
+        ----------
+        path : str
+            Store directory, created if it does not exist. Existing store in the directory is overwritten.
+
+        event_lists : iterable of list of dict or dcase_util.containers.MetaDataContainer or EventTable
+            Event lists, events need to have filename.
+
+        Raises
+        ------
+        ValueError:
+            Events without filename
+
+        Returns
+        -------
+        EventStore
+            Opened store
+
+        """
+
+        label_vocabulary = LabelVocabulary()
+        file_vocabulary = LabelVocabulary()
+
+        onsets = []
+        offsets = []
+        labels = []
+        files = []
+        for event_list in event_lists:
+            event_table = EventTable.from_event_list(
+                event_list,
+                label_vocabulary=label_vocabulary,
+                file_vocabulary=file_vocabulary
+            )
+
+            onsets.append(event_table.onset)
+            offsets.append(event_table.offset)
+            labels.append(event_table.label)
+            files.append(event_table.file)
+
+        file = numpy.concatenate(files) if files else numpy.zeros(0, dtype=int)
+
+        # Events ordered by file, stable sort keeps the event order within a file
+        order = numpy.argsort(file, kind='mergesort')
+        counts = numpy.bincount(file, minlength=len(file_vocabulary))
+
+        file_ids = numpy.arange(len(file_vocabulary))
+        if None in file_vocabulary:
+            if counts[file_vocabulary.code(None)]:
+                raise ValueError(
+                    "Events without filename cannot be stored."
+                )
+
+            file_ids = file_ids[file_ids != file_vocabulary.code(None)]
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        numpy.save(os.path.join(path, 'onset.npy'), numpy.concatenate(onsets or [numpy.zeros(0)])[order])
+        numpy.save(os.path.join(path, 'offset.npy'), numpy.concatenate(offsets or [numpy.zeros(0)])[order])
+        numpy.save(os.path.join(path, 'label.npy'), numpy.concatenate(labels or [numpy.zeros(0, dtype=int)])[order])
+        numpy.save(os.path.join(path, 'index.npy'), numpy.concatenate(([0], numpy.cumsum(counts[file_ids]))))
+
+        with open(os.path.join(path, 'store.json'), 'wt') as store_file:
+            json.dump({
+                'version': cls.version,
+                'labels': label_vocabulary.labels,
+                'files': file_vocabulary.decode(file_ids)
+            }, store_file)
+
+        return cls(path)
+
+    @property
+    def unique_files(self):
+        """Unique files
+
+        Returns
+        -------
+        list
+            Unique filenames in alphabetical order
+
+        """
+
+        return sorted(self.files)
+
+    @property
+    def unique_event_labels(self):
+        """Unique event labels
+
+        Returns
+        -------
+        list
+            Unique labels in alphabetical order, events without label are not included
+
+        """
+
+        return sorted(label for label in self.label_vocabulary.decode(numpy.unique(self.label)) if label is not None)
+
+    def filter(self, filename):
+        """Events of a file, empty event table for files not in the store
+
+        Parameters
+        ----------
+        filename : str
+            Filename
+
+        Returns
+        -------
+        EventTable
+
+        """
+
+        if filename in self:
+            return self[filename]
+
+        return EventTable(
+            onset=numpy.zeros(0),
+            offset=numpy.zeros(0),
+            label=numpy.zeros(0, dtype=int),
+            file=numpy.zeros(0, dtype=int),
+            label_vocabulary=self.label_vocabulary,
+            file_vocabulary=[filename]
+        )
@@ -0,0 +1,358 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Columnar event list
+"""
+
+from __future__ import absolute_import
+import numpy
+import dcase_util
+from .label_vocabulary import LabelVocabulary
+
+__all__ = ['EventTable']
+
+
+class EventTable(object):
+    """Columnar event list
+
+    Events are stored as arrays: onsets and offsets in seconds, event labels and filenames as integer codes into
+    label and file vocabularies. Metric classes accept event tables directly in place of event lists.
+
+    """
+
+    def __init__(self, onset, offset, label, file=None, label_vocabulary=None, file_vocabulary=None):
+        """Constructor
+
+        Parameters
+        ----------
+        onset : numpy.ndarray, shape=(n,)
+            Event onsets in seconds
+
+        offset : numpy.ndarray, shape=(n,)
+            Event offsets in seconds
+
+        label : numpy.ndarray, shape=(n,), dtype=int
+            Event label codes in label_vocabulary
+
+        file : numpy.ndarray, shape=(n,), dtype=int, optional
+            Filename codes in file_vocabulary. If none given, all events belong to the same unnamed file.
+            Default value None
+
+        label_vocabulary : LabelVocabulary or list, optional
+            Event labels. If none given, an empty vocabulary is used.
+            Default value None
+
+        file_vocabulary : LabelVocabulary or list, optional
+            Filenames. If none given, vocabulary containing None as filename is used.
+            Default value None
+
+        """
+
+        self.onset = numpy.asarray(onset, dtype=float).reshape(-1)
+        self.offset = numpy.asarray(offset, dtype=float).reshape(-1)
+        self.label = numpy.asarray(label, dtype=int).reshape(-1)
+
+        if file is None:
+            file = numpy.zeros(self.onset.shape[0], dtype=int)
+
+            if file_vocabulary is None:
+                file_vocabulary = [None]
+
+        self.file = numpy.asarray(file, dtype=int).reshape(-1)
+
+        if not isinstance(label_vocabulary, LabelVocabulary):
+            label_vocabulary = LabelVocabulary(label_vocabulary)
+
+        if not isinstance(file_vocabulary, LabelVocabulary):
+            file_vocabulary = LabelVocabulary(file_vocabulary)
+
+        self.label_vocabulary = label_vocabulary
+        self.file_vocabulary = file_vocabulary
+
+        if not (self.onset.shape[0] == self.offset.shape[0] == self.label.shape[0] == self.file.shape[0]):
+            raise ValueError(
+                "onset, offset, label and file need to have same length"
+            )
+
+    def __len__(self):
+        return self.onset.shape[0]
+
+    def __getitem__(self, index):
+        return EventTable(
+            onset=self.onset[index],
+            offset=self.offset[index],
+            label=self.label[index],
+            file=self.file[index],
+            label_vocabulary=self.label_vocabulary,
+            file_vocabulary=self.file_vocabulary
+        )
+
+    @classmethod
+    def from_event_list(cls, event_list, label_vocabulary=None, file_vocabulary=None):
+        """Convert event list into event table
+
+        Only events having onset, offset, and event label are included.
+
+        Parameters
+        ----------
+        event_list : list of dict or dcase_util.containers.MetaDataContainer or EventTable
+            Event list
+
+        label_vocabulary : LabelVocabulary, optional
+            Vocabulary used for event labels, labels not yet present are added to it.
+            Default value None
+
+        file_vocabulary : LabelVocabulary, optional
+            Vocabulary used for filenames, filenames not yet present are added to it.
+            Default value None
+
+        Returns
+        -------
+        EventTable
+
+        """
+
+        if label_vocabulary is None:
+            label_vocabulary = LabelVocabulary()
+
+        if file_vocabulary is None:
+            file_vocabulary = LabelVocabulary()
+
+        if isinstance(event_list, EventTable):
+            return event_list.with_vocabularies(
+                label_vocabulary=label_vocabulary,
+                file_vocabulary=file_vocabulary
+            )
+
+        onset = numpy.zeros(len(event_list))
+        offset = numpy.zeros(len(event_list))
+        label = numpy.zeros(len(event_list), dtype=int)
+        file = numpy.zeros(len(event_list), dtype=int)
+        valid = numpy.zeros(len(event_list), dtype=bool)
+
+        for event_id, event in enumerate(event_list):
+            if 'event_label' not in event:
+                continue
+
+            if 'event_onset' in event and 'event_offset' in event:
+                onset[event_id] = event['event_onset']
+                offset[event_id] = event['event_offset']
+
+            elif 'onset' in event and 'offset' in event:
+                onset[event_id] = event['onset']
+                offset[event_id] = event['offset']
+
+            else:
+                continue
+
+            label[event_id] = label_vocabulary.code(event['event_label'])
+            file[event_id] = file_vocabulary.code(event.get('filename', event.get('file')))
+            valid[event_id] = True
+
+        if not numpy.all(valid):
+            onset = onset[valid]
+            offset = offset[valid]
+            label = label[valid]
+            file = file[valid]
+
+        return cls(
+            onset=onset,
+            offset=offset,
+            label=label,
+            file=file,
+            label_vocabulary=label_vocabulary,
+            file_vocabulary=file_vocabulary
+        )
+
+    def to_event_list(self):
+        """Convert event table into event list
+
+        Returns
+        -------
+        dcase_util.containers.MetaDataContainer
+
+        """
+
+        event_list = dcase_util.containers.MetaDataContainer()
+        for onset, offset, label, file in zip(self.onset.tolist(), self.offset.tolist(),
+                                              self.label_vocabulary.decode(self.label),
+                                              self.file_vocabulary.decode(self.file)):
+            item = {
+                'event_label': label,
+                'onset': onset,
+                'offset': offset
+            }
+
+            if file is not None:
+                item['filename'] = file
+
+            event_list.append(item)
+
+        return event_list
+
+    def with_vocabularies(self, label_vocabulary=None, file_vocabulary=None):
+        """Event table with codes translated into given vocabularies
+
+        Labels and filenames not yet present are added to the given vocabularies. Arrays are shared when
+        vocabularies are already the same.
+
+        Parameters
+        ----------
+        label_vocabulary : LabelVocabulary, optional
+            Target vocabulary for event labels, if none given, the current one is kept.
+            Default value None
+
+        file_vocabulary : LabelVocabulary, optional
+            Target vocabulary for filenames, if none given, the current one is kept.
+            Default value None
+
+        Returns
+        -------
+        EventTable
+
+        """
+
+        label = self.label
+        if label_vocabulary is None:
+            label_vocabulary = self.label_vocabulary
+
+        elif label_vocabulary is not self.label_vocabulary:
+            label = label_vocabulary.intern(self.label_vocabulary.labels)[label]
+
+        file = self.file
+        if file_vocabulary is None:
+            file_vocabulary = self.file_vocabulary
+
+        elif file_vocabulary is not self.file_vocabulary:
+            file = file_vocabulary.intern(self.file_vocabulary.labels)[file]
+
+        return EventTable(
+            onset=self.onset,
+            offset=self.offset,
+            label=label,
+            file=file,
+            label_vocabulary=label_vocabulary,
+            file_vocabulary=file_vocabulary
+        )
+
+    def label_positions(self, event_label_list):
+        """Index of each event label in given label list
+
+        Parameters
+        ----------
+        event_label_list : list
+            Event labels
+
+        Raises
+        ------
+        ValueError:
+            Event label not in event_label_list
+
+        Returns
+        -------
+        numpy.ndarray, shape=(n,), dtype=int
+
+        """
+
+        if self.label_vocabulary.labels[0:len(event_label_list)] == list(event_label_list):
+            positions = self.label
+            positions = numpy.where(positions < len(event_label_list), positions, -1)
+
+        else:
+            positions = LabelVocabulary(event_label_list).encode(self.label_vocabulary.labels, default=-1)[self.label]
+
+        if numpy.any(positions < 0):
+            raise ValueError(
+                "Unknown event label [{label}].".format(
+                    label=self.label_vocabulary.labels[self.label[numpy.flatnonzero(positions < 0)[0]]]
+                )
+            )
+
+        return positions
+
+    @property
+    def event_labels(self):
+        """Event labels
+
+        Returns
+        -------
+        list
+
+        """
+
+        return self.label_vocabulary.decode(self.label)
+
+    @property
+    def unique_event_labels(self):
+        """Unique event labels
+
+        Returns
+        -------
+        list
+            Unique labels in alphabetical order, events without label are not included
+
+        """
+
+        return sorted(label for label in self.label_vocabulary.decode(numpy.unique(self.label)) if label is not None)
+
+    @property
+    def unique_files(self):
+        """Unique files
+
+        Returns
+        -------
+        list
+            Unique filenames in alphabetical order
+
+        """
+
+        return sorted(str(file) for file in self.file_vocabulary.decode(numpy.unique(self.file)))
+
+    @property
+    def max_offset(self):
+        """Offset (end-time) of the last event
+
+        Returns
+        -------
+        float
+
+        """
+
+        if self.offset.shape[0] == 0:
+            return 0
+
+        return max(0, float(numpy.max(self.offset)))
+
+    def filter(self, filename=None, event_label=None):
+        """Filter events based on given fields
+
+        Parameters
+        ----------
+        filename : str, optional
+            Filename
+
+        event_label : str, optional
+            Event label
+
+        Returns
+        -------
+        EventTable
+
+        """
+
+        selected = numpy.ones(len(self), dtype=bool)
+        if filename is not None:
+            if filename in self.file_vocabulary:
+                selected &= self.file == self.file_vocabulary.code(filename)
+
+            else:
+                selected[:] = False
+
+        if event_label is not None:
+            if event_label in self.label_vocabulary:
+                selected &= self.label == self.label_vocabulary.code(event_label)
+
+            else:
+                selected[:] = False
+
+        return self[selected]
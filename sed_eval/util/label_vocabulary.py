@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Label vocabulary, mapping between labels and integer codes
+"""
+
+import numpy
+
+__all__ = ['LabelVocabulary']
+
+
+class LabelVocabulary(object):
+    """Mapping between labels and integer codes
+
+    Codes are assigned in the order labels are added, hence labels given at construction get codes
+    0..len(labels)-1 in the given order. Metric classes encode the labels once and compare integer codes
+    afterwards.
+
+    """
+
+    def __init__(self, labels=None):
+        """Constructor
+
+        Parameters
+        ----------
+        labels : list, optional
+            Labels to be added in the vocabulary.
+            Default value None
+
+        """
+
+        self.labels = []
+        self._codes = {}
+
+        if labels is not None:
+            self.intern(labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self._codes
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def code(self, label):
+        """Code of label, label is added to the vocabulary if not yet present
+
+        Parameters
+        ----------
+        label : str
+            Label
+
+        Returns
+        -------
+        int
+
+        """
+
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+
+        return code
+
+    def intern(self, labels):
+        """Codes of labels, labels not yet present are added to the vocabulary
+
+        Parameters
+        ----------
+        labels : list
+            Labels
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(labels),), dtype=int
+
+        """
+
+        return numpy.array([self.code(label) for label in labels], dtype=int)
+
+    def encode(self, labels, default=None):
+        """Codes of labels, vocabulary is not modified
+
+        Parameters
+        ----------
+        labels : list
+            Labels
+
+        default : int, optional
+            Code used for labels not present in the vocabulary. If none given, ValueError is raised for them.
+            Default value None
+
+        Raises
+        ------
+        ValueError:
+            Label not present in the vocabulary and no default given
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(labels),), dtype=int
+
+        """
+
+        codes = numpy.empty(len(labels), dtype=int)
+        for label_id, label in enumerate(labels):
+            code = self._codes.get(label, default)
+            if code is None:
+                raise ValueError(
+                    "Unknown label [{label}].".format(label=label)
+                )
+
+            codes[label_id] = code
+
+        return codes
+
+    def decode(self, codes):
+        """Labels of codes
+
+        Parameters
+        ----------
+        codes : numpy.ndarray or list of int
+            Codes
+
+        Returns
+        -------
+        list
+
+        """
+
+        return [self.labels[code] for code in numpy.asarray(codes, dtype=int).reshape(-1)]
+
+    def recode(self, other, default=None):
+        """Translation table from the codes of this vocabulary to the codes of another vocabulary
+
+        Parameters
+        ----------
+        other : LabelVocabulary
+            Target vocabulary
+
+        default : int, optional
+            Code used for labels not present in the target vocabulary. If none given, ValueError is raised for them.
+            Default value None
+
+        Returns
+        -------
+        numpy.ndarray, shape=(len(self),), dtype=int
+            Target code for each code, use as ``table[codes]``
+
+        """
+
+        if other is self:
+            return numpy.arange(len(self.labels))
+
+        return other.encode(self.labels, default=default)
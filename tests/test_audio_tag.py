@@ -447,6 +447,122 @@ def test_direct_use2():
     nose.tools.eq_(results['overall']['count']['Nref'], 0)
 
 
+def test_merge():
+    reference_tag_list = dcase_util.containers.MetaDataContainer([
+        {'filename': 'test1.wav', 'tags': 'cat,dog'},
+        {'filename': 'test2.wav', 'tags': 'dog'},
+        {'filename': 'test3.wav', 'tags': 'bird,cat'},
+        {'filename': 'test4.wav', 'tags': 'cat'},
+        {'filename': 'test5.wav', 'tags': 'bird,speech'},
+    ])
+
+    estimated_tag_list = dcase_util.containers.MetaDataContainer([
+        {'filename': 'test1.wav', 'tags': 'cat'},
+        {'filename': 'test2.wav', 'tags': 'dog,cat'},
+        {'filename': 'test3.wav', 'tags': 'bird'},
+        {'filename': 'test4.wav', 'tags': 'dog'},
+        {'filename': 'test5.wav', 'tags': 'speech'},
+    ])
+
+    tags = reference_tag_list.unique_tags
+
+    sequential = sed_eval.audio_tag.AudioTaggingMetrics(tags=tags)
+    sequential.evaluate(reference_tag_list=reference_tag_list, estimated_tag_list=estimated_tag_list)
+
+    shards = []
+    for files in [['test1.wav', 'test2.wav'], ['test3.wav', 'test4.wav', 'test5.wav']]:
+        shard = sed_eval.audio_tag.AudioTaggingMetrics(tags=tags)
+        shard.evaluate(
+            reference_tag_list=dcase_util.containers.MetaDataContainer(
+                [item for item in reference_tag_list if item.filename in files]
+            ),
+            estimated_tag_list=dcase_util.containers.MetaDataContainer(
+                [item for item in estimated_tag_list if item.filename in files]
+            )
+        )
+        shards.append(shard)
+
+    merged = sum(shards)
+    nose.tools.assert_dict_equal(merged.overall, sequential.overall)
+    nose.tools.assert_dict_equal(merged.tag_wise, sequential.tag_wise)
+    numpy.testing.assert_array_equal(merged.y_true, sequential.y_true)
+    numpy.testing.assert_array_equal(merged.y_pred, sequential.y_pred)
+
+
+def test_score_histogram():
+    random_state = numpy.random.RandomState(0)
+    tags = ['bird', 'cat', 'dog']
+
+    reference_tag_list = dcase_util.containers.MetaDataContainer()
+    estimated_tag_probabilities = dcase_util.containers.ProbabilityContainer()
+    for file_id in range(200):
+        filename = 'test{id}.wav'.format(id=file_id)
+        file_tags = [tag for tag in tags if random_state.rand() < 0.4]
+        reference_tag_list.append({'filename': filename, 'tags': ','.join(file_tags) + ','})
+        for tag in tags:
+            probability = 0.6 * random_state.rand() + (0.4 if tag in file_tags else 0.0)
+            estimated_tag_probabilities.append({'filename': filename, 'label': tag, 'probability': probability})
+
+    tag_evaluator = sed_eval.audio_tag.AudioTaggingMetrics(tags=tags)
+    tag_evaluator.evaluate(
+        reference_tag_list=reference_tag_list,
+        estimated_tag_probabilities=estimated_tag_probabilities
+    )
+
+    tag_evaluator_streaming = sed_eval.audio_tag.AudioTaggingMetrics(tags=tags, score_histogram_bins=1000)
+    for file_id in range(0, 200, 50):
+        files = ['test{id}.wav'.format(id=i) for i in range(file_id, file_id + 50)]
+        tag_evaluator_streaming.evaluate(
+            reference_tag_list=dcase_util.containers.MetaDataContainer(
+                [item for item in reference_tag_list if item.filename in files]
+            ),
+            estimated_tag_probabilities=dcase_util.containers.ProbabilityContainer(
+                [item for item in estimated_tag_probabilities if item.filename in files]
+            )
+        )
+
+    # Nothing retained per file
+    nose.tools.eq_(tag_evaluator_streaming.y_pred_score.shape, (0, 3))
+
+    results = tag_evaluator.results()
+    results_streaming = tag_evaluator_streaming.results()
+    nose.tools.assert_almost_equals(
+        results_streaming['overall']['eer']['eer'], results['overall']['eer']['eer'], places=2
+    )
+    for tag in tags:
+        nose.tools.assert_almost_equals(
+            results_streaming['class_wise'][tag]['eer']['eer'], results['class_wise'][tag]['eer']['eer'], places=2
+        )
+
+    nose.tools.eq_(
+        sed_eval.audio_tag.AudioTaggingMetrics(tags=tags, score_histogram_bins=numpy.int64(1000)).score_histogram_bins,
+        1000
+    )
+    for score_histogram_bins in [0, 10.0, True]:
+        nose.tools.assert_raises(
+            ValueError, sed_eval.audio_tag.AudioTaggingMetrics, tags=tags, score_histogram_bins=score_histogram_bins
+        )
+
+
+@nose.tools.raises(ValueError)
+def test_missing_estimated_file():
+    reference_tag_list = dcase_util.containers.MetaDataContainer([
+        {'filename': 'test1.wav', 'tags': 'cat,dog'},
+        {'filename': 'test2.wav', 'tags': 'dog'},
+    ])
+    estimated_tag_list = dcase_util.containers.MetaDataContainer([
+        {'filename': 'test1.wav', 'tags': 'cat'},
+    ])
+
+    tag_evaluator = sed_eval.audio_tag.AudioTaggingMetrics(
+        tags=reference_tag_list.unique_tags
+    )
+    tag_evaluator.evaluate(
+        reference_tag_list=reference_tag_list,
+        estimated_tag_list=estimated_tag_list
+    )
+
+
 @nose.tools.raises(ValueError)
 def test_parameters_1():
 
@@ -0,0 +1,52 @@
+"""
+Unit tests for evaluators
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import nose.tools
+import dcase_util
+import sed_eval
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'evaluators'))
+import sound_event_eval
+
+
+def test_sound_event_eval_streaming():
+    file_list_filename = os.path.join('data', 'sound_event', 'file_list.txt')
+    file_list = sed_eval.io.load_file_pair_list(file_list_filename)
+    path = os.path.dirname(file_list_filename)
+
+    event_labels = sound_event_eval.collect_event_labels(file_list, path)
+    segment_based_metrics, event_based_metrics = sound_event_eval.evaluate_file_pairs(
+        file_list, path, event_labels, prefetch=1
+    )
+
+    output_path = tempfile.mkdtemp()
+    try:
+        results = {}
+        cache_dir = os.path.join(output_path, 'cache')
+        for mode, options in [('default', []), ('stream', ['--stream']), ('jobs', ['-j', '2']),
+                              ('cache', ['--cache', cache_dir]), ('cached', ['--cache', cache_dir])]:
+            output_file = os.path.join(output_path, mode + '.yaml')
+            sound_event_eval.main(['sound_event_eval.py', file_list_filename, '-o', output_file] + options)
+            results[mode] = dcase_util.containers.DictContainer().load(filename=output_file)
+
+    finally:
+        shutil.rmtree(output_path)
+
+    nose.tools.assert_dict_equal(results['stream'], results['default'])
+    nose.tools.assert_dict_equal(results['jobs'], results['default'])
+    nose.tools.assert_dict_equal(results['cache'], results['default'])
+    nose.tools.assert_dict_equal(results['cached'], results['default'])
+
+    nose.tools.assert_almost_equal(
+        segment_based_metrics.results()['overall']['f_measure']['f_measure'],
+        results['default']['segment_based_metrics']['overall']['f_measure']['f_measure']
+    )
+    nose.tools.assert_almost_equal(
+        event_based_metrics.results()['overall']['error_rate']['error_rate'],
+        results['default']['event_based_metrics']['overall']['error_rate']['error_rate']
+    )
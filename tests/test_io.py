@@ -4,6 +4,8 @@ import nose.tools
 import sed_eval
 import tempfile
 import os
+import collections
+import shutil
 
 
 def test_load_event_list():
@@ -50,6 +52,208 @@ def test_load_event_list():
             os.unlink(tmp.name)
 
 
+def test_load_event_table():
+    delimiters = [',', ';', '\t']
+    for delimiter in delimiters:
+        tmp = tempfile.NamedTemporaryFile('r+', suffix='.txt', delete=False)
+        try:
+            tmp.write('0.5'+delimiter+'0.7'+delimiter+'event\n1.5'+delimiter+'2.0'+delimiter+'other\n')
+            tmp.close()
+            data = sed_eval.io.load_event_table(tmp.name)
+
+            nose.tools.eq_(len(data), 2)
+            nose.tools.assert_list_equal(data.onset.tolist(), [0.5, 1.5])
+            nose.tools.assert_list_equal(data.offset.tolist(), [0.7, 2.0])
+            nose.tools.assert_list_equal(data.event_labels, ['event', 'other'])
+
+        finally:
+            os.unlink(tmp.name)
+
+        tmp = tempfile.NamedTemporaryFile('r+', suffix='.txt', delete=False)
+        try:
+            tmp.write(
+                'file.wav'+delimiter+'scene'+delimiter+'0.5'+delimiter+'0.7'+delimiter+'event\n' +
+                'empty.wav\n'
+            )
+            tmp.close()
+
+            for data in [sed_eval.io.load_event_table(tmp.name),
+                         sed_eval.io.load_event_table(
+                             tmp.name,
+                             fields=['filename', 'scene_label', 'onset', 'offset', 'event_label'],
+                             delimiter=delimiter)]:
+                nose.tools.eq_(len(data), 1)
+                nose.tools.assert_list_equal(data.event_labels, ['event'])
+                nose.tools.assert_list_equal(data.unique_files, ['file.wav'])
+                nose.tools.eq_(data.onset[0], 0.5)
+                nose.tools.eq_(data.offset[0], 0.7)
+
+        finally:
+            os.unlink(tmp.name)
+
+        # Row not matching the layout
+        tmp = tempfile.NamedTemporaryFile('r+', suffix='.txt', delete=False)
+        try:
+            tmp.write(
+                'file.wav'+delimiter+'0.5'+delimiter+'0.7'+delimiter+'event\n' +
+                'file.wav'+delimiter+'1.5'+delimiter+'2.0\n'
+            )
+            tmp.close()
+
+            with nose.tools.assert_raises(ValueError) as context:
+                sed_eval.io.load_event_table(tmp.name)
+            nose.tools.ok_('row [2]' in str(context.exception))
+
+            nose.tools.assert_raises(
+                ValueError,
+                sed_eval.io.load_event_table,
+                tmp.name,
+                fields=['filename', 'scene_label', 'onset', 'offset', 'event_label'],
+                delimiter=delimiter
+            )
+
+            nose.tools.assert_raises(
+                ValueError,
+                sed_eval.io.load_event_table,
+                tmp.name,
+                fields=['filename', 'onset', 'offset']
+            )
+
+        finally:
+            os.unlink(tmp.name)
+
+    # Tab delimited file with commas inside labels
+    data = sed_eval.io.load_event_table(os.path.join('data', 'sound_event', 'audioset1.txt'))
+    nose.tools.assert_list_equal(
+        data.event_labels,
+        sed_eval.util.EventTable.from_event_list(
+            sed_eval.io.load_event_list(os.path.join('data', 'sound_event', 'audioset1.txt'))
+        ).event_labels
+    )
+
+
+def test_load_cached():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+        for cached in range(2):
+            nose.tools.assert_list_equal(
+                list(sed_eval.io.load_event_list(filename, cache_dir=cache_dir)),
+                list(sed_eval.io.load_event_list(filename))
+            )
+
+            table = sed_eval.io.load_event_table(filename, cache_dir=cache_dir)
+            nose.tools.assert_list_equal(table.event_labels, sed_eval.io.load_event_table(filename).event_labels)
+            nose.tools.assert_list_equal(table.onset.tolist(), sed_eval.io.load_event_table(filename).onset.tolist())
+
+        filename = os.path.join('data', 'scene', 'reference.txt')
+        for cached in range(2):
+            nose.tools.assert_list_equal(
+                list(sed_eval.io.load_scene_list(filename, cache_dir=cache_dir)),
+                list(sed_eval.io.load_scene_list(filename))
+            )
+
+        nose.tools.eq_(len(os.listdir(cache_dir)), 3)
+
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_cache_compatibility():
+    # Fallbacks used with Python 2
+    stat = collections.namedtuple('stat', ['st_mtime'])(st_mtime=1.5)
+    nose.tools.eq_(sed_eval.io._modification_time_ns(stat), 1500000000)
+
+    path = tempfile.mkdtemp()
+    try:
+        source = os.path.join(path, 'source')
+        destination = os.path.join(path, 'destination')
+        for filename, content in [(source, 'new'), (destination, 'old')]:
+            with open(filename, 'wt') as output_file:
+                output_file.write(content)
+
+        # Module os without replace, as in Python 2
+        sed_eval.io.os = collections.namedtuple('os', ['path', 'remove', 'rename'])(
+            path=os.path, remove=os.remove, rename=os.rename
+        )
+
+        sed_eval.io._replace_file(source, destination)
+
+        with open(destination, 'rt') as input_file:
+            nose.tools.eq_(input_file.read(), 'new')
+        nose.tools.ok_(not os.path.exists(source))
+
+    finally:
+        sed_eval.io.os = os
+
+        shutil.rmtree(path)
+
+
+def test_prefetch_file_pairs():
+    file_list = os.path.join('data', 'sound_event', 'file_list.txt')
+    path = os.path.join('data', 'sound_event')
+
+    loaded = []
+    for file_pair in sed_eval.io.load_file_pair_list(file_list):
+        loaded.append((
+            file_pair,
+            sed_eval.io.load_event_list(os.path.abspath(os.path.join(path, file_pair['reference_file']))),
+            sed_eval.io.load_event_list(os.path.abspath(os.path.join(path, file_pair['estimated_file'])))
+        ))
+
+    for queue_depth in [1, 2, 8]:
+        prefetched = list(sed_eval.io.prefetch_file_pairs(file_list, queue_depth=queue_depth))
+
+        nose.tools.eq_(len(prefetched), len(loaded))
+        for (file_pair, reference, estimated), (file_pair_, reference_, estimated_) in zip(prefetched, loaded):
+            nose.tools.assert_dict_equal(file_pair, file_pair_)
+            nose.tools.assert_list_equal(list(reference), list(reference_))
+            nose.tools.assert_list_equal(list(estimated), list(estimated_))
+
+    file_pairs = sed_eval.io.prefetch_file_pairs(
+        [{'reference_file': 'missing.txt', 'estimated_file': 'missing.txt'}],
+        path=path
+    )
+    nose.tools.assert_raises(IOError, list, file_pairs)
+
+    nose.tools.assert_raises(ValueError, sed_eval.io.prefetch_file_pairs, file_list, queue_depth=0)
+
+
+def test_build_event_store():
+    path = tempfile.mkdtemp()
+    try:
+        filenames = [
+            os.path.join('data', 'sound_event', 'binary1.txt'),
+            os.path.join('data', 'sound_event', 'audioset1.txt')
+        ]
+        sed_eval.io.build_event_store(path, filenames)
+        store = sed_eval.io.load_event_store(path)
+
+        audioset = sed_eval.io.load_event_list(filenames[1])
+        nose.tools.assert_list_equal(
+            store.unique_files,
+            sorted([filenames[0]] + audioset.unique_files)
+        )
+
+        binary = sed_eval.io.load_event_list(filenames[0])
+        reference = sed_eval.sound_event.SegmentBasedMetrics(binary.unique_event_labels)
+        reference.evaluate(binary, binary)
+
+        stored = sed_eval.sound_event.SegmentBasedMetrics(binary.unique_event_labels)
+        stored.evaluate(store[filenames[0]], binary)
+
+        nose.tools.assert_dict_equal(reference.overall, stored.overall)
+
+        for filename in audioset.unique_files:
+            nose.tools.assert_list_equal(
+                store[filename].event_labels,
+                sed_eval.util.EventTable.from_event_list(audioset.filter(filename=filename)).event_labels
+            )
+
+    finally:
+        shutil.rmtree(path)
+
+
 def test_load_scene_list():
     delimiters = [',', ';', '\t']
     for delimiter in delimiters:
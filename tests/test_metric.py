@@ -3,6 +3,7 @@ Unit tests for metrics
 '''
 
 import nose.tools
+import numpy
 import sed_eval
 
 
@@ -67,3 +68,66 @@ def test_error_rate():
     nose.tools.assert_almost_equals(sed_eval.metric.error_rate(0.2, 0.2, 0.2), 0.6)
     nose.tools.assert_almost_equals(sed_eval.metric.error_rate(1.5, 0.2, 0.2), 1.9)
 
+
+def test_roc_curve():
+    false_positive_rate, true_positive_rate, thresholds = sed_eval.metric.roc_curve(
+        y_true=[0, 0, 1, 1],
+        y_score=[0.1, 0.4, 0.35, 0.8]
+    )
+    numpy.testing.assert_array_almost_equal(false_positive_rate, [0.0, 0.0, 0.5, 0.5, 1.0])
+    numpy.testing.assert_array_almost_equal(true_positive_rate, [0.0, 0.5, 0.5, 1.0, 1.0])
+    numpy.testing.assert_array_almost_equal(thresholds, [numpy.inf, 0.8, 0.4, 0.35, 0.1])
+
+
+def test_equal_error_rate():
+    nose.tools.assert_almost_equals(
+        sed_eval.metric.equal_error_rate(y_true=[0, 0, 1, 1], y_score=[0.1, 0.4, 0.35, 0.8]),
+        0.5
+    )
+    nose.tools.assert_almost_equals(
+        sed_eval.metric.equal_error_rate(y_true=[0, 0, 1, 1], y_score=[0.1, 0.2, 0.35, 0.8]),
+        0.0
+    )
+    nose.tools.ok_(numpy.isnan(sed_eval.metric.equal_error_rate(y_true=[0, 0], y_score=[0.1, 0.2])))
+
+    # Equal to the scikit-learn based implementation
+    try:
+        from sklearn import metrics
+
+    except ImportError:
+        return
+
+    random_state = numpy.random.RandomState(0)
+    for i in range(100):
+        y_true = random_state.randint(0, 2, 50)
+        y_score = numpy.round(random_state.rand(50), 1)
+
+        false_positive_rate, true_positive_rate, thresholds = sed_eval.metric.roc_curve(y_true, y_score)
+        target_false_positive_rate, target_true_positive_rate, target_thresholds = metrics.roc_curve(y_true, y_score)
+        numpy.testing.assert_array_equal(false_positive_rate, target_false_positive_rate)
+        numpy.testing.assert_array_equal(true_positive_rate, target_true_positive_rate)
+        numpy.testing.assert_array_equal(thresholds[1:], target_thresholds[1:])
+
+
+def test_equal_error_rate_batch():
+    random_state = numpy.random.RandomState(0)
+    y_true = random_state.randint(0, 2, (50, 6))
+    y_true[:, 0] = 0
+    y_score = numpy.round(random_state.rand(50, 6), 1)
+
+    class_wise_eer, pooled_eer = sed_eval.metric.equal_error_rate_batch(y_true=y_true, y_score=y_score)
+
+    nose.tools.ok_(numpy.isnan(class_wise_eer[0]))
+    for class_id in range(1, 6):
+        nose.tools.eq_(
+            class_wise_eer[class_id],
+            sed_eval.metric.equal_error_rate(y_true=y_true[:, class_id], y_score=y_score[:, class_id])
+        )
+
+    nose.tools.eq_(
+        pooled_eer,
+        sed_eval.metric.equal_error_rate(y_true=y_true.T.ravel(), y_score=y_score.T.ravel())
+    )
+
+    class_wise_eer, pooled_eer = sed_eval.metric.equal_error_rate_batch(y_true=y_true[:, 0:1], y_score=y_score[:, 0:1])
+    nose.tools.ok_(numpy.isnan(pooled_eer))
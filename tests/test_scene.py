@@ -69,6 +69,130 @@ def test_direct_use():
     print(scene_metrics)
 
 
+def test_merge():
+    reference = dcase_util.containers.MetaDataContainer([
+        {'scene_label': 'supermarket', 'file': 'supermarket09.wav'},
+        {'scene_label': 'tubestation', 'file': 'tubestation10.wav'},
+        {'scene_label': 'quietstreet', 'file': 'quietstreet08.wav'},
+        {'scene_label': 'office', 'file': 'office10.wav'},
+        {'scene_label': 'bus', 'file': 'bus01.wav'},
+    ])
+
+    estimated = dcase_util.containers.MetaDataContainer([
+        {'scene_label': 'supermarket', 'file': 'supermarket09.wav'},
+        {'scene_label': 'bus', 'file': 'tubestation10.wav'},
+        {'scene_label': 'quietstreet', 'file': 'quietstreet08.wav'},
+        {'scene_label': 'park', 'file': 'office10.wav'},
+        {'scene_label': 'bus', 'file': 'bus01.wav'},
+    ])
+
+    scene_labels = sed_eval.sound_event.util.unique_scene_labels(reference)
+
+    sequential = sed_eval.scene.SceneClassificationMetrics(scene_labels)
+    sequential.evaluate(reference_scene_list=reference, estimated_scene_list=estimated)
+
+    shard1 = sed_eval.scene.SceneClassificationMetrics(scene_labels)
+    shard1.evaluate(reference_scene_list=reference[:2], estimated_scene_list=estimated[:2])
+    shard2 = sed_eval.scene.SceneClassificationMetrics(scene_labels)
+    shard2.evaluate(reference_scene_list=reference[2:], estimated_scene_list=estimated[2:])
+
+    merged = shard1 + shard2
+    nose.tools.assert_dict_equal(merged.results(), sequential.results())
+    nose.tools.assert_dict_equal(shard1.merge(shard2).scene_wise, sequential.scene_wise)
+
+
+def test_confusion_matrix():
+    reference = dcase_util.containers.MetaDataContainer([
+        {'scene_label': 'bus', 'file': 'a.wav'},
+        {'scene_label': 'bus', 'file': 'b.wav'},
+        {'scene_label': 'office', 'file': 'c.wav'},
+        {'scene_label': 'park', 'file': 'd.wav'},
+    ])
+
+    estimated = dcase_util.containers.MetaDataContainer([
+        {'scene_label': 'bus', 'file': 'a.wav'},
+        {'scene_label': 'office', 'file': 'b.wav'},
+        {'scene_label': 'office', 'file': 'c.wav'},
+        {'scene_label': 'car', 'file': 'd.wav'},
+    ])
+
+    scene_metrics = sed_eval.scene.SceneClassificationMetrics(['bus', 'office', 'park'])
+    scene_metrics.evaluate(reference_scene_list=reference, estimated_scene_list=estimated)
+
+    numpy.testing.assert_array_equal(
+        scene_metrics.confusion_matrix,
+        [[1, 1, 0],
+         [0, 1, 0],
+         [0, 0, 0]]
+    )
+
+    results = scene_metrics.results()
+    nose.tools.assert_equal(results['overall']['count']['Nref'], 4)
+    nose.tools.assert_equal(results['class_wise']['park']['count']['Nref'], 1)
+    nose.tools.assert_equal(results['class_wise']['office']['count']['Nsys'], 2)
+    nose.tools.assert_almost_equal(results['overall']['accuracy'], 0.5)
+
+
+def test_reference_index():
+    reference = [
+        {'scene_label': 'bus', 'file': 'a.wav'},
+        {'scene_label': 'office', 'file': 'a.wav'},
+        {'scene_label': 'office', 'file': 'b.wav'},
+        {'scene_label': 'forest', 'file': 'c.wav'},
+        {'scene_label': 'bus', 'file': 'd.wav'},
+    ]
+
+    estimated = [
+        {'scene_label': 'bus', 'file': 'a.wav'},
+        {'scene_label': 'office', 'file': 'b.wav'},
+        {'scene_label': 'bus', 'file': 'c.wav'},
+        {'scene_label': 'car', 'file': 'd.wav'},
+        {'scene_label': 'office', 'file': 'a.wav'},
+    ]
+
+    scene_metrics = sed_eval.scene.SceneClassificationMetrics(['bus', 'office'])
+    scene_metrics.evaluate(reference_scene_list=reference, estimated_scene_list=estimated)
+
+    # First reference item of a file is used, labels outside scene_labels are counted but never correct
+    nose.tools.assert_dict_equal(scene_metrics.overall, {'Ncorr': 2.0, 'Nref': 5.0, 'Nsys': 5.0})
+    nose.tools.assert_dict_equal(scene_metrics.scene_wise['bus'], {'Ncorr': 1.0, 'Nref': 3.0, 'Nsys': 2.0})
+    nose.tools.assert_dict_equal(scene_metrics.scene_wise['office'], {'Ncorr': 1.0, 'Nref': 1.0, 'Nsys': 2.0})
+
+    nose.tools.assert_raises(
+        ValueError,
+        scene_metrics.evaluate,
+        reference,
+        [{'scene_label': 'bus', 'file': 'e.wav'}]
+    )
+
+
+def test_count_attributes():
+    reference = [{'scene_label': 'bus', 'file': 'a.wav'}, {'scene_label': 'office', 'file': 'b.wav'}]
+    estimated = [{'scene_label': 'bus', 'file': 'a.wav'}, {'scene_label': 'bus', 'file': 'b.wav'}]
+
+    scene_metrics = sed_eval.scene.SceneClassificationMetrics(['bus', 'office'])
+    scene_metrics.evaluate(reference_scene_list=reference, estimated_scene_list=estimated)
+
+    nose.tools.assert_dict_equal(scene_metrics.overall, {'Ncorr': 1.0, 'Nref': 2.0, 'Nsys': 2.0})
+    nose.tools.assert_dict_equal(scene_metrics.scene_wise['bus'], {'Ncorr': 1.0, 'Nref': 1.0, 'Nsys': 2.0})
+
+    # Counts are derived from the confusion matrix, changes to the returned dicts are not kept
+    scene_metrics.overall['Ncorr'] = 2.0
+    scene_metrics.scene_wise['bus']['Ncorr'] = 2.0
+    nose.tools.assert_equal(scene_metrics.overall['Ncorr'], 1.0)
+    nose.tools.assert_equal(scene_metrics.scene_wise['bus']['Ncorr'], 1.0)
+    nose.tools.assert_almost_equal(scene_metrics.results()['overall']['accuracy'], 0.5)
+
+    scene_metrics.evaluate(reference_scene_list=reference, estimated_scene_list=estimated)
+    nose.tools.assert_dict_equal(scene_metrics.overall, {'Ncorr': 2.0, 'Nref': 4.0, 'Nsys': 4.0})
+
+    with nose.tools.assert_raises(AttributeError):
+        scene_metrics.overall = {'Ncorr': 0.0, 'Nref': 1.0, 'Nsys': 1.0}
+
+    scene_metrics.reset()
+    nose.tools.assert_dict_equal(scene_metrics.overall, {'Ncorr': 0.0, 'Nref': 0.0, 'Nsys': 0.0})
+
+
 def test_direct_use2():
     reference = [
         {
@@ -6,6 +6,7 @@ import nose.tools
 import sed_eval
 import os
 import numpy
+import pickle
 import dcase_util
 
 @nose.tools.raises(ValueError)
@@ -290,6 +291,238 @@ def test_audioset():
     nose.tools.eq_(results['overall']['f_measure']['f_measure'], 1.0)
 
 
+def test_event_roll_type():
+    reference = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+    estimated = os.path.join('data', 'sound_event', 'street_fold1_detected.txt')
+
+    reference_event_list = sed_eval.io.load_event_list(reference)
+    estimated_event_list = sed_eval.io.load_event_list(estimated)
+
+    evaluated_event_labels = reference_event_list.unique_event_labels
+    evaluated_files = reference_event_list.unique_files
+
+    results = {}
+    for event_roll_type in ['float', 'bool', 'packed', 'interval']:
+        segment_based_metrics = sed_eval.sound_event.SegmentBasedMetrics(
+            event_label_list=evaluated_event_labels,
+            time_resolution=0.1,
+            event_roll_type=event_roll_type
+        )
+
+        for file in evaluated_files:
+            segment_based_metrics.evaluate(
+                reference_event_list=reference_event_list.filter(filename=file),
+                estimated_event_list=estimated_event_list.filter(filename=file)
+            )
+
+        results[event_roll_type] = segment_based_metrics
+
+    for event_roll_type in ['bool', 'packed', 'interval']:
+        nose.tools.assert_dict_equal(results[event_roll_type].overall, results['float'].overall)
+        nose.tools.assert_dict_equal(results[event_roll_type].class_wise, results['float'].class_wise)
+
+
+@nose.tools.raises(ValueError)
+def test_event_roll_type_parameter():
+    sed_eval.sound_event.SegmentBasedMetrics(
+        event_label_list=['event A'],
+        event_roll_type='unknown'
+    )
+
+
+def test_merge():
+    reference = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+    estimated = os.path.join('data', 'sound_event', 'street_fold1_detected.txt')
+
+    reference_event_list = sed_eval.io.load_event_list(reference)
+    estimated_event_list = sed_eval.io.load_event_list(estimated)
+
+    evaluated_event_labels = reference_event_list.unique_event_labels
+    evaluated_files = reference_event_list.unique_files
+
+    for metric_class, parameters in [(sed_eval.sound_event.SegmentBasedMetrics, {'time_resolution': 1.0}),
+                                     (sed_eval.sound_event.EventBasedMetrics, {'t_collar': 0.250})]:
+        sequential = metric_class(event_label_list=evaluated_event_labels, **parameters)
+        shards = [metric_class(event_label_list=evaluated_event_labels, **parameters) for i in range(3)]
+
+        for file_id, file in enumerate(evaluated_files):
+            reference_event_list_for_current_file = reference_event_list.filter(filename=file)
+            estimated_event_list_for_current_file = estimated_event_list.filter(filename=file)
+
+            sequential.evaluate(
+                reference_event_list=reference_event_list_for_current_file,
+                estimated_event_list=estimated_event_list_for_current_file
+            )
+            shards[file_id % 3].evaluate(
+                reference_event_list=reference_event_list_for_current_file,
+                estimated_event_list=estimated_event_list_for_current_file
+            )
+
+        merged = sum(shards)
+
+        nose.tools.assert_dict_equal(merged.results(), sequential.results())
+        nose.tools.assert_dict_equal((shards[0] + shards[1] + shards[2]).overall, sequential.overall)
+
+    nose.tools.assert_raises(
+        ValueError,
+        sed_eval.sound_event.SegmentBasedMetrics(event_label_list=['a']).merge,
+        sed_eval.sound_event.SegmentBasedMetrics(event_label_list=['b'])
+    )
+
+    nose.tools.assert_raises(
+        ValueError,
+        sed_eval.sound_event.EventBasedMetrics(event_label_list=['a'], bipartite_matcher='convex').merge,
+        sed_eval.sound_event.EventBasedMetrics(event_label_list=['a'], bipartite_matcher='csr')
+    )
+
+
+def test_segment_based_threshold_metrics():
+    reference_event_list = dcase_util.containers.MetaDataContainer([
+        {'event_label': 'car', 'event_onset': 0.0, 'event_offset': 2.5, 'filename': 'a.wav'},
+        {'event_label': 'car', 'event_onset': 6.0, 'event_offset': 10.0, 'filename': 'a.wav'},
+        {'event_label': 'horn', 'event_onset': 3.2, 'event_offset': 4.1, 'filename': 'a.wav'},
+    ])
+    event_labels = ['car', 'horn']
+    frame_resolution = 0.5
+
+    random_state = numpy.random.RandomState(1)
+    estimated_probabilities = random_state.rand(20, 2)
+    thresholds = [0.75, 0.25, 0.5]
+
+    threshold_metrics = sed_eval.sound_event.SegmentBasedThresholdMetrics(
+        event_label_list=event_labels,
+        thresholds=thresholds,
+        time_resolution=1.0
+    )
+    threshold_metrics.evaluate(
+        reference_event_list=reference_event_list,
+        estimated_probabilities=estimated_probabilities,
+        frame_resolution=frame_resolution
+    )
+    results = threshold_metrics.results()
+
+    numpy.testing.assert_array_equal(results['thresholds'], thresholds)
+
+    for threshold_id, threshold in enumerate(thresholds):
+        # Binarize probabilities into an event list, one event per active frame
+        estimated_event_list = dcase_util.containers.MetaDataContainer()
+        for frame_id, class_id in zip(*numpy.nonzero(estimated_probabilities >= threshold)):
+            estimated_event_list.append({
+                'event_label': event_labels[class_id],
+                'event_onset': frame_id * frame_resolution,
+                'event_offset': (frame_id + 1) * frame_resolution,
+                'filename': 'a.wav'
+            })
+
+        segment_based_metrics = sed_eval.sound_event.SegmentBasedMetrics(
+            event_label_list=event_labels,
+            time_resolution=1.0
+        )
+        segment_based_metrics.evaluate(
+            reference_event_list=reference_event_list,
+            estimated_event_list=estimated_event_list,
+            evaluated_length_seconds=10.0
+        )
+        expected = segment_based_metrics.results()
+
+        for metric in ['f_measure', 'error_rate', 'accuracy']:
+            for field in expected['overall'][metric]:
+                nose.tools.assert_almost_equal(
+                    results['overall'][metric][field][threshold_id],
+                    expected['overall'][metric][field]
+                )
+
+        for event_label in event_labels:
+            for field in expected['class_wise'][event_label]['f_measure']:
+                numpy.testing.assert_equal(
+                    results['class_wise'][event_label]['f_measure'][field][threshold_id],
+                    expected['class_wise'][event_label]['f_measure'][field]
+                )
+
+    nose.tools.assert_raises(
+        ValueError,
+        (threshold_metrics + threshold_metrics).merge,
+        sed_eval.sound_event.SegmentBasedThresholdMetrics(event_label_list=event_labels, thresholds=[0.5])
+    )
+
+
+def test_event_table_input():
+    reference = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+    estimated = os.path.join('data', 'sound_event', 'street_fold1_detected.txt')
+
+    reference_event_list = sed_eval.io.load_event_list(reference)
+    estimated_event_list = sed_eval.io.load_event_list(estimated)
+
+    evaluated_event_labels = reference_event_list.unique_event_labels
+
+    for metric_class, parameters in [(sed_eval.sound_event.SegmentBasedMetrics, {'time_resolution': 1.0}),
+                                     (sed_eval.sound_event.EventBasedMetrics, {'t_collar': 0.250})]:
+        from_list = metric_class(event_label_list=evaluated_event_labels, **parameters)
+        from_table = metric_class(event_label_list=evaluated_event_labels, **parameters)
+
+        reference_table = sed_eval.util.EventTable.from_event_list(reference_event_list)
+        estimated_table = sed_eval.util.EventTable.from_event_list(estimated_event_list)
+
+        for file in reference_event_list.unique_files:
+            from_list.evaluate(
+                reference_event_list=reference_event_list.filter(filename=file),
+                estimated_event_list=estimated_event_list.filter(filename=file)
+            )
+            from_table.evaluate(
+                reference_event_list=reference_table.filter(filename=file),
+                estimated_event_list=estimated_table.filter(filename=file)
+            )
+
+        nose.tools.assert_dict_equal(from_table.results(), from_list.results())
+
+
+def test_evaluate_batch():
+    reference_event_list = sed_eval.io.load_event_list(os.path.join('data', 'sound_event', 'audioset1.txt'))
+    estimated_event_list = sed_eval.io.load_event_list(os.path.join('data', 'sound_event', 'audioset1_detected.txt'))
+
+    evaluated_event_labels = reference_event_list.unique_event_labels
+
+    for metric_class, parameters in [(sed_eval.sound_event.SegmentBasedMetrics, {'time_resolution': 1.0}),
+                                     (sed_eval.sound_event.EventBasedMetrics, {'t_collar': 0.250})]:
+        file_by_file = metric_class(event_label_list=evaluated_event_labels, **parameters)
+        for file in reference_event_list.unique_files:
+            file_by_file.evaluate(
+                reference_event_list=reference_event_list.filter(filename=file),
+                estimated_event_list=estimated_event_list.filter(filename=file)
+            )
+
+        batch = metric_class(event_label_list=evaluated_event_labels, **parameters)
+        batch.evaluate_batch(
+            reference_event_list=reference_event_list,
+            estimated_event_list=sed_eval.util.EventTable.from_event_list(estimated_event_list)
+        )
+
+        nose.tools.assert_equal(batch.evaluated_files, len(reference_event_list.unique_files))
+        nose.tools.assert_dict_equal(batch.results(), file_by_file.results())
+
+
+def test_labels_outside_event_label_list():
+    def event_list(labels):
+        return [
+            {'event_label': label, 'onset': float(label_id), 'offset': float(label_id) + 0.5, 'filename': 'a.wav'}
+            for label_id, label in enumerate(labels)
+        ]
+
+    reference = event_list(['a', 'q0', 'q1'])
+
+    event_based_metrics = sed_eval.sound_event.EventBasedMetrics(['a'], t_collar=0.2)
+    event_based_metrics.evaluate(reference, event_list(['a', 'q0', 'q2']))
+
+    # Labels outside event_label_list are matched only with the same label
+    nose.tools.assert_equal(event_based_metrics.overall['Ntp'], 2)
+    nose.tools.assert_equal(event_based_metrics.overall['Nsubs'], 1)
+
+    # Metric state does not depend on the labels outside event_label_list
+    renamed = sed_eval.sound_event.EventBasedMetrics(['a'], t_collar=0.2)
+    renamed.evaluate(event_list(['a', 'x0', 'x1']), event_list(['a', 'x0', 'x2']))
+    nose.tools.assert_equal(pickle.dumps(event_based_metrics), pickle.dumps(renamed))
+
+
 def test_direct_use_segment():
     reference_event_list = dcase_util.containers.MetaDataContainer(
         [
@@ -756,6 +989,180 @@ def test_event_matching():
     )
 
 
+def test_candidate_generation():
+    reference = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+    estimated = os.path.join('data', 'sound_event', 'street_fold1_detected.txt')
+
+    reference_event_list = sed_eval.io.load_event_list(reference)
+    estimated_event_list = sed_eval.io.load_event_list(estimated)
+
+    for event_matching_type in ['optimal', 'greedy']:
+        event_based_metrics_dense = sed_eval.sound_event.EventBasedMetrics(
+            event_label_list=reference_event_list.unique_event_labels,
+            t_collar=0.20,
+            event_matching_type=event_matching_type,
+            candidate_generation='dense'
+        )
+        event_based_metrics_sparse = sed_eval.sound_event.EventBasedMetrics(
+            event_label_list=reference_event_list.unique_event_labels,
+            t_collar=0.20,
+            event_matching_type=event_matching_type,
+            candidate_generation='sparse'
+        )
+
+        for filename in reference_event_list.unique_files:
+            reference_event_list_for_current_file = reference_event_list.filter(
+                filename=filename
+            )
+
+            estimated_event_list_for_current_file = estimated_event_list.filter(
+                filename=filename
+            )
+
+            event_based_metrics_dense.evaluate(
+                reference_event_list=reference_event_list_for_current_file,
+                estimated_event_list=estimated_event_list_for_current_file
+            )
+            event_based_metrics_sparse.evaluate(
+                reference_event_list=reference_event_list_for_current_file,
+                estimated_event_list=estimated_event_list_for_current_file
+            )
+
+        nose.tools.assert_dict_equal(event_based_metrics_dense.overall, event_based_metrics_sparse.overall)
+        nose.tools.assert_dict_equal(event_based_metrics_dense.class_wise, event_based_metrics_sparse.class_wise)
+
+
+@nose.tools.raises(ValueError)
+def test_candidate_generation_parameter():
+    sed_eval.sound_event.EventBasedMetrics(
+        event_label_list=['event A'],
+        candidate_generation='unknown'
+    )
+
+
+def test_bipartite_matcher():
+    reference = os.path.join('data', 'sound_event', 'street_fold1_reference.txt')
+    estimated = os.path.join('data', 'sound_event', 'street_fold1_detected.txt')
+
+    reference_event_list = sed_eval.io.load_event_list(reference)
+    estimated_event_list = sed_eval.io.load_event_list(estimated)
+
+    results = {}
+    for bipartite_matcher in ['dict', 'csr']:
+        event_based_metrics = sed_eval.sound_event.EventBasedMetrics(
+            event_label_list=reference_event_list.unique_event_labels,
+            t_collar=0.20,
+            bipartite_matcher=bipartite_matcher
+        )
+
+        for filename in reference_event_list.unique_files:
+            event_based_metrics.evaluate(
+                reference_event_list=reference_event_list.filter(filename=filename),
+                estimated_event_list=estimated_event_list.filter(filename=filename)
+            )
+
+        results[bipartite_matcher] = event_based_metrics
+
+    nose.tools.assert_dict_equal(results['dict'].overall, results['csr'].overall)
+    nose.tools.assert_dict_equal(results['dict'].class_wise, results['csr'].class_wise)
+
+    # Convex matcher finds the same amount of matched events, with and without fallback to general matching
+    for evaluate_offset in [True, False]:
+        results = {}
+        for bipartite_matcher in ['dict', 'convex']:
+            event_based_metrics = sed_eval.sound_event.EventBasedMetrics(
+                event_label_list=reference_event_list.unique_event_labels,
+                t_collar=0.20,
+                evaluate_offset=evaluate_offset,
+                bipartite_matcher=bipartite_matcher
+            )
+
+            for filename in reference_event_list.unique_files:
+                event_based_metrics.evaluate(
+                    reference_event_list=reference_event_list.filter(filename=filename),
+                    estimated_event_list=estimated_event_list.filter(filename=filename)
+                )
+
+            results[bipartite_matcher] = event_based_metrics
+
+        nose.tools.eq_(results['dict'].overall['Ntp'], results['convex'].overall['Ntp'])
+        for event_label in reference_event_list.unique_event_labels:
+            nose.tools.eq_(
+                results['dict'].class_wise[event_label]['Ntp'],
+                results['convex'].class_wise[event_label]['Ntp']
+            )
+
+
+@nose.tools.raises(ValueError)
+def test_bipartite_matcher_parameter():
+    sed_eval.sound_event.EventBasedMetrics(
+        event_label_list=['event A'],
+        bipartite_matcher='unknown'
+    )
+
+
+def test_class_wise_matching():
+    reference_event_list = [
+        {'event_label': 'a', 'onset': 0.0, 'offset': 1.0},
+        {'event_label': 'a', 'onset': 0.1, 'offset': 1.1},
+        {'event_label': 'b', 'onset': 0.0, 'offset': 1.0},
+        {'event_label': 'c', 'onset': 5.0, 'offset': 6.0},
+    ]
+    estimated_event_list = [
+        {'event_label': 'a', 'onset': 0.05, 'offset': 1.0},
+        {'event_label': 'b', 'onset': 0.05, 'offset': 1.05},
+        {'event_label': 'b', 'onset': 0.1, 'offset': 1.0},
+        {'event_label': 'c', 'onset': 5.1, 'offset': 6.0},
+    ]
+
+    for event_matching_type in ['optimal', 'greedy']:
+        event_based_metrics = sed_eval.sound_event.EventBasedMetrics(
+            event_label_list=['a', 'b'],
+            event_matching_type=event_matching_type
+        )
+        event_based_metrics.evaluate(reference_event_list, estimated_event_list)
+
+        # Events with labels outside event_label_list are included in the overall counts
+        nose.tools.eq_(event_based_metrics.overall['Ntp'], 3)
+        nose.tools.eq_(event_based_metrics.class_wise['a']['Ntp'], 1)
+        nose.tools.eq_(event_based_metrics.class_wise['a']['Nfn'], 1)
+        nose.tools.eq_(event_based_metrics.class_wise['b']['Ntp'], 1)
+        nose.tools.eq_(event_based_metrics.class_wise['b']['Nfp'], 1)
+
+
+def test_substitution_matching_type():
+    reference_event_list = [
+        {'event_label': 'a', 'onset': 1.1, 'offset': 2.0},
+        {'event_label': 'a', 'onset': 0.9, 'offset': 2.0},
+    ]
+    estimated_event_list = [
+        {'event_label': 'b', 'onset': 1.0, 'offset': 2.0},
+        {'event_label': 'b', 'onset': 1.25, 'offset': 2.0},
+    ]
+
+    substitutions = {}
+    for substitution_matching_type in ['greedy', 'optimal']:
+        event_based_metrics = sed_eval.sound_event.EventBasedMetrics(
+            event_label_list=['a', 'b'],
+            evaluate_offset=False,
+            substitution_matching_type=substitution_matching_type
+        )
+        event_based_metrics.evaluate(reference_event_list, estimated_event_list)
+
+        substitutions[substitution_matching_type] = event_based_metrics.overall['Nsubs']
+
+    nose.tools.eq_(substitutions['greedy'], 1)
+    nose.tools.eq_(substitutions['optimal'], 2)
+
+
+@nose.tools.raises(ValueError)
+def test_substitution_matching_type_parameter():
+    sed_eval.sound_event.EventBasedMetrics(
+        event_label_list=['event A'],
+        substitution_matching_type='unknown'
+    )
+
+
 def test_empty_system_output_handling():
     reference = [
         {
@@ -4,6 +4,8 @@ Unit tests for utils
 
 from __future__ import print_function, absolute_import
 import numpy
+import shutil
+import tempfile
 import nose.tools
 import sed_eval
 
@@ -168,3 +170,315 @@ def test_match_event_roll_lengths():
     nose.tools.assert_equal(a_.shape[1], a.shape[1])
     nose.tools.assert_equal(b_.shape[1], b.shape[1])
 
+
+def test_hit_matrices():
+    reference_event_list = [
+        {'event_label': 'A', 'event_onset': 0.0, 'event_offset': 1.0, },
+        {'event_label': 'B', 'event_onset': 2.0, 'event_offset': 6.0, },
+        {'event_label': 'A', 'event_onset': 5.0, 'event_offset': 8.0, },
+    ]
+    estimated_event_list = [
+        {'event_label': 'A', 'event_onset': 0.1, 'event_offset': 1.5, },
+        {'event_label': 'A', 'event_onset': 2.1, 'event_offset': 7.5, },
+        {'event_label': 'B', 'event_onset': 5.3, 'event_offset': 8.1, },
+    ]
+
+    label_vocabulary = sed_eval.util.LabelVocabulary()
+    reference_table = sed_eval.util.EventTable.from_event_list(reference_event_list, label_vocabulary=label_vocabulary)
+    estimated_table = sed_eval.util.EventTable.from_event_list(estimated_event_list, label_vocabulary=label_vocabulary)
+
+    reference_onsets, reference_offsets = reference_table.onset, reference_table.offset
+    estimated_onsets, estimated_offsets = estimated_table.onset, estimated_table.offset
+
+    label_hit_matrix = sed_eval.util.label_hit_matrix(reference_table.label, estimated_table.label)
+    onset_hit_matrix = sed_eval.util.onset_hit_matrix(reference_onsets, estimated_onsets, t_collar=0.2)
+    offset_hit_matrix = sed_eval.util.offset_hit_matrix(
+        reference_onsets, reference_offsets, estimated_offsets, t_collar=0.2, percentage_of_length=0.5
+    )
+
+    numpy.testing.assert_array_equal(label_hit_matrix, [[1, 1, 0], [0, 0, 1], [1, 1, 0]])
+    numpy.testing.assert_array_equal(onset_hit_matrix, [[1, 0, 0], [0, 1, 0], [0, 0, 0]])
+    numpy.testing.assert_array_equal(offset_hit_matrix, [[1, 0, 0], [0, 1, 0], [0, 1, 1]])
+
+    # Vectorized conditions agree with the pair-wise validation
+    for j, reference_event in enumerate(reference_event_list):
+        for i, estimated_event in enumerate(estimated_event_list):
+            nose.tools.eq_(
+                onset_hit_matrix[j, i],
+                sed_eval.sound_event.EventBasedMetrics.validate_onset(reference_event, estimated_event, t_collar=0.2)
+            )
+            nose.tools.eq_(
+                offset_hit_matrix[j, i],
+                sed_eval.sound_event.EventBasedMetrics.validate_offset(
+                    reference_event, estimated_event, t_collar=0.2, percentage_of_length=0.5
+                )
+            )
+
+
+def test_event_hit_pairs():
+    reference_onsets = numpy.array([0.0, 2.0, 5.0])
+    reference_offsets = numpy.array([1.0, 6.0, 8.0])
+    estimated_onsets = numpy.array([5.3, 0.1, 2.1, 4.9])
+    estimated_offsets = numpy.array([8.1, 1.5, 7.5, 7.0])
+
+    for evaluate_onset, evaluate_offset in [(True, True), (True, False), (False, True)]:
+        hit_matrix = numpy.ones((3, 4), dtype=bool)
+        if evaluate_onset:
+            hit_matrix &= sed_eval.util.onset_hit_matrix(reference_onsets, estimated_onsets, t_collar=0.2)
+
+        if evaluate_offset:
+            hit_matrix &= sed_eval.util.offset_hit_matrix(
+                reference_onsets, reference_offsets, estimated_offsets, t_collar=0.2, percentage_of_length=0.5
+            )
+
+        reference_index, estimated_index = sed_eval.util.event_hit_pairs(
+            reference_onsets, reference_offsets, estimated_onsets, estimated_offsets,
+            evaluate_onset=evaluate_onset, evaluate_offset=evaluate_offset,
+            t_collar=0.2, percentage_of_length=0.5
+        )
+
+        target_reference_index, target_estimated_index = numpy.nonzero(hit_matrix)
+        numpy.testing.assert_array_equal(reference_index, target_reference_index)
+        numpy.testing.assert_array_equal(estimated_index, target_estimated_index)
+
+
+def test_bipartite_match_csr():
+    left = numpy.array([2, 0, 0, 1, 1, 3])
+    right = numpy.array([0, 0, 1, 1, 2, 2])
+
+    left_vertices, indptr, indices = sed_eval.util.bipartite_graph_csr(left, right)
+    numpy.testing.assert_array_equal(left_vertices, [2, 0, 1, 3])
+    numpy.testing.assert_array_equal(indptr, [0, 1, 3, 5, 6])
+    numpy.testing.assert_array_equal(indices, [0, 0, 1, 1, 2, 2])
+
+    matching = sed_eval.util.bipartite_match_csr(indptr, indices, right_vertex_count=4)
+
+    graph = {}
+    for u, v in zip(left, right):
+        graph.setdefault(u, []).append(v)
+
+    target = sed_eval.util.bipartite_match(graph)
+    nose.tools.eq_(
+        dict((v, left_vertices[u]) for v, u in enumerate(matching) if u >= 0),
+        target
+    )
+    nose.tools.eq_(matching[3], -1)
+
+    # Long augmenting path
+    n = 5000
+    indices = numpy.repeat(numpy.arange(n), 2)[1:-1]
+    indptr = numpy.append(numpy.arange(0, 2 * n - 2, 2), 2 * n - 2)
+    nose.tools.eq_(numpy.sum(sed_eval.util.bipartite_match_csr(indptr, indices, right_vertex_count=n) >= 0), n - 1)
+
+
+def test_convex_bipartite_match():
+    reference_onsets = numpy.array([0.0, 0.1, 0.2, 3.0])
+    estimated_onsets = numpy.array([0.15, 3.1, 0.05, 9.0])
+
+    reference_index, estimated_index = numpy.nonzero(
+        sed_eval.util.onset_hit_matrix(reference_onsets, estimated_onsets, t_collar=0.2)
+    )
+    estimated_rank = numpy.argsort(numpy.argsort(estimated_onsets))
+
+    reference_vertices, interval_start, interval_stop = sed_eval.util.convex_bipartite_graph(
+        reference_index, estimated_index, estimated_rank
+    )
+    numpy.testing.assert_array_equal(reference_vertices, [0, 1, 2, 3])
+    numpy.testing.assert_array_equal(interval_start, [0, 0, 0, 2])
+    numpy.testing.assert_array_equal(interval_stop, [2, 2, 2, 3])
+
+    matching = sed_eval.util.convex_bipartite_match(interval_start, interval_stop, right_vertex_count=4)
+    numpy.testing.assert_array_equal(matching, [0, 1, 3, -1])
+
+    # Not convex with reversed ordering of the middle events
+    nose.tools.eq_(
+        sed_eval.util.convex_bipartite_graph([0, 0], [0, 1], [0, 2, 1, 3]),
+        None
+    )
+
+
+def test_packed_event_roll():
+    event_roll = sed_eval.util.event_list_to_event_roll(event_list, event_label_list=event_labels, time_resolution=0.5)
+    boolean_event_roll = sed_eval.util.event_list_to_event_roll(
+        event_list, event_label_list=event_labels, time_resolution=0.5, dtype=bool
+    )
+    packed_event_roll = sed_eval.util.event_list_to_packed_event_roll(
+        event_list, event_label_list=event_labels, time_resolution=0.5
+    )
+
+    nose.tools.eq_(boolean_event_roll.dtype, numpy.dtype(bool))
+    nose.tools.eq_(packed_event_roll.dtype, numpy.dtype(numpy.uint8))
+    nose.tools.eq_(packed_event_roll.shape, (event_roll.shape[0], 2))
+
+    numpy.testing.assert_array_equal(boolean_event_roll, event_roll)
+    numpy.testing.assert_array_equal(packed_event_roll, sed_eval.util.pack_event_roll(event_roll))
+    numpy.testing.assert_array_equal(
+        sed_eval.util.unpack_event_roll(packed_event_roll, len(event_labels)),
+        boolean_event_roll
+    )
+
+    numpy.testing.assert_array_equal(
+        sed_eval.util.packed_event_roll_sum(packed_event_roll, axis=0, event_label_count=len(event_labels)),
+        numpy.sum(event_roll, axis=0)
+    )
+    numpy.testing.assert_array_equal(
+        sed_eval.util.packed_event_roll_sum(packed_event_roll, axis=1),
+        numpy.sum(event_roll, axis=1)
+    )
+
+    padded_event_roll = sed_eval.util.pad_event_roll(packed_event_roll, packed_event_roll.shape[0] + 10)
+    nose.tools.eq_(padded_event_roll.dtype, numpy.dtype(numpy.uint8))
+    numpy.testing.assert_array_equal(padded_event_roll[0:packed_event_roll.shape[0], :], packed_event_roll)
+    nose.tools.eq_(numpy.sum(padded_event_roll[packed_event_roll.shape[0]:, :]), 0)
+
+
+def test_segment_intervals():
+    minimal_event_list = [
+        {'event_label': 'A', 'event_onset': 0, 'event_offset': 1, },
+        {'event_label': 'A', 'event_onset': 5, 'event_offset': 15, },
+        {'event_label': 'A', 'event_onset': 0.5, 'event_offset': 2.5, },
+        {'event_label': 'B', 'event_onset': 1, 'event_offset': 2, },
+        {'event_label': 'B', 'event_onset': 4, 'event_offset': 5, },
+        {'event_label': 'C', 'event_onset': 7, 'event_offset': 12, }
+    ]
+
+    label, onset, offset = sed_eval.util.event_list_to_segment_intervals(
+        minimal_event_list,
+        event_label_list=['A', 'B', 'C'],
+        time_resolution=1.0,
+        length=10
+    )
+
+    numpy.testing.assert_array_equal(label, [0, 0, 1, 1, 2])
+    numpy.testing.assert_array_equal(onset, [0, 5, 1, 4, 7])
+    numpy.testing.assert_array_equal(offset, [3, 10, 2, 5, 10])
+
+    estimated_event_list = [
+        {'event_label': 'A', 'event_onset': 1, 'event_offset': 6, },
+        {'event_label': 'C', 'event_onset': 2, 'event_offset': 8, },
+    ]
+
+    reference_event_roll, estimated_event_roll = sed_eval.util.match_event_roll_lengths(
+        sed_eval.util.event_list_to_event_roll(minimal_event_list, ['A', 'B', 'C'], time_resolution=1.0),
+        sed_eval.util.event_list_to_event_roll(estimated_event_list, ['A', 'B', 'C'], time_resolution=1.0),
+        length=10
+    )
+
+    statistics = sed_eval.util.segment_interval_statistics(
+        reference_intervals=(label, onset, offset),
+        estimated_intervals=sed_eval.util.event_list_to_segment_intervals(
+            estimated_event_list,
+            event_label_list=['A', 'B', 'C'],
+            time_resolution=1.0,
+            length=10
+        ),
+        event_label_count=3
+    )
+
+    segment_Nref = numpy.sum(reference_event_roll, axis=1)
+    segment_Nsys = numpy.sum(estimated_event_roll, axis=1)
+    segment_Ntp = numpy.sum(numpy.logical_and(reference_event_roll, estimated_event_roll), axis=1)
+
+    numpy.testing.assert_array_equal(statistics['Nref'], numpy.sum(reference_event_roll, axis=0))
+    numpy.testing.assert_array_equal(statistics['Nsys'], numpy.sum(estimated_event_roll, axis=0))
+    numpy.testing.assert_array_equal(
+        statistics['Ntp'],
+        numpy.sum(numpy.logical_and(reference_event_roll, estimated_event_roll), axis=0)
+    )
+    nose.tools.eq_(statistics['S'], numpy.sum(numpy.minimum(segment_Nref, segment_Nsys) - segment_Ntp))
+    nose.tools.eq_(statistics['D'], numpy.sum(numpy.maximum(0, segment_Nref - segment_Nsys)))
+    nose.tools.eq_(statistics['I'], numpy.sum(numpy.maximum(0, segment_Nsys - segment_Nref)))
+
+
+def test_label_vocabulary():
+    vocabulary = sed_eval.util.LabelVocabulary(['b', 'a'])
+
+    nose.tools.assert_equal(len(vocabulary), 2)
+    numpy.testing.assert_array_equal(vocabulary.encode(['a', 'b', 'a']), [1, 0, 1])
+    numpy.testing.assert_array_equal(vocabulary.encode(['a', 'c'], default=-1), [1, -1])
+    nose.tools.assert_raises(ValueError, vocabulary.encode, ['c'])
+
+    numpy.testing.assert_array_equal(vocabulary.intern(['c', 'a']), [2, 1])
+    nose.tools.assert_list_equal(vocabulary.decode([2, 0]), ['c', 'b'])
+
+    numpy.testing.assert_array_equal(
+        vocabulary.recode(sed_eval.util.LabelVocabulary(['a', 'b']), default=-1),
+        [1, 0, -1]
+    )
+
+
+def test_event_table():
+    events = [
+        {'event_label': 'b', 'event_onset': 1.0, 'event_offset': 2.0, 'filename': 'x.wav'},
+        {'event_label': 'a', 'onset': 0.5, 'offset': 3.5, 'filename': 'x.wav'},
+        {'event_label': 'b', 'filename': 'y.wav'},
+        {'event_label': 'a', 'event_onset': 4.0, 'event_offset': 5.0, 'filename': 'y.wav'},
+    ]
+
+    table = sed_eval.util.EventTable.from_event_list(events)
+
+    nose.tools.assert_equal(len(table), 3)
+    numpy.testing.assert_array_equal(table.onset, [1.0, 0.5, 4.0])
+    numpy.testing.assert_array_equal(table.offset, [2.0, 3.5, 5.0])
+    nose.tools.assert_list_equal(table.event_labels, ['b', 'a', 'a'])
+    nose.tools.assert_list_equal(table.unique_event_labels, ['a', 'b'])
+    nose.tools.assert_list_equal(table.unique_files, ['x.wav', 'y.wav'])
+    nose.tools.assert_equal(table.max_offset, 5.0)
+
+    nose.tools.assert_equal(len(table.filter(filename='x.wav')), 2)
+    nose.tools.assert_equal(len(table.filter(filename='z.wav')), 0)
+
+    # Events without label are not included in the unique labels
+    unlabeled_table = sed_eval.util.EventTable(
+        onset=[0.0, 1.0, 2.0], offset=[1.0, 2.0, 3.0], label=[1, 0, 2], label_vocabulary=['b', None, 'a']
+    )
+    nose.tools.assert_list_equal(unlabeled_table.unique_event_labels, ['a', 'b'])
+
+    numpy.testing.assert_array_equal(table.label_positions(['a', 'b']), [1, 0, 0])
+    nose.tools.assert_raises(ValueError, table.label_positions, ['a'])
+
+    recoded = table.with_vocabularies(label_vocabulary=sed_eval.util.LabelVocabulary(['a', 'b']))
+    numpy.testing.assert_array_equal(recoded.label, [1, 0, 0])
+    nose.tools.assert_list_equal(recoded.event_labels, table.event_labels)
+
+    numpy.testing.assert_array_equal(
+        sed_eval.util.event_list_to_event_roll(table, ['a', 'b'], time_resolution=1.0),
+        sed_eval.util.event_list_to_event_roll(
+            table.to_event_list(), ['a', 'b'], time_resolution=1.0
+        )
+    )
+
+
+def test_event_store():
+    events = [
+        {'event_label': 'b', 'onset': 1.0, 'offset': 2.0, 'filename': 'y.wav'},
+        {'event_label': 'a', 'onset': 0.5, 'offset': 3.5, 'filename': 'x.wav'},
+        {'event_label': 'a', 'onset': 4.0, 'offset': 5.0, 'filename': 'y.wav'},
+    ]
+    empty = sed_eval.util.EventTable([], [], [], [], label_vocabulary=[], file_vocabulary=['z.wav'])
+
+    path = tempfile.mkdtemp()
+    try:
+        store = sed_eval.util.EventStore.create(path, [events, empty])
+
+        nose.tools.assert_equal(len(store), 3)
+        nose.tools.assert_list_equal(store.unique_files, ['x.wav', 'y.wav', 'z.wav'])
+        nose.tools.assert_list_equal(store.unique_event_labels, ['a', 'b'])
+        nose.tools.assert_true(isinstance(store.onset, numpy.memmap))
+
+        table = store['y.wav']
+        numpy.testing.assert_array_equal(table.onset, [1.0, 4.0])
+        nose.tools.assert_list_equal(table.event_labels, ['b', 'a'])
+        nose.tools.assert_list_equal(table.unique_files, ['y.wav'])
+        nose.tools.assert_true(numpy.shares_memory(table.onset, store.onset))
+
+        nose.tools.assert_equal(len(store['z.wav']), 0)
+        nose.tools.assert_equal(len(store.filter(filename='w.wav')), 0)
+        nose.tools.assert_raises(KeyError, store.__getitem__, 'w.wav')
+
+        nose.tools.assert_raises(
+            ValueError, sed_eval.util.EventStore.create, path, [[{'event_label': 'a', 'onset': 0.0, 'offset': 1.0}]]
+        )
+
+    finally:
+        shutil.rmtree(path)